@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class MonitoringConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.monitoring'
+
+    def ready(self):
+        # Tous les processus (web, run_rapport_worker, rescore_reclamations) : profil sur signal
+        from .profiler import install_signal_handler
+        install_signal_handler()
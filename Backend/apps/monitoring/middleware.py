@@ -0,0 +1,158 @@
+# apps/monitoring/middleware.py
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from .metrics import HTTP_REQUEST_SECONDS
+
+logger = logging.getLogger('apps.monitoring.queries')
+
+
+def _view_label(request):
+    # Nom de route (ex. rapport-list) ou chemin de la vue ; un label par vue, pas par URL
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    return match.view_name or match._func_path
+
+
+class RequestMetricsMiddleware:
+    """
+    Mesure la durée de chaque requête (jusqu'à la réponse, pas la fin d'un flux SSE)
+    dans artgallery_http_request_duration_seconds{view, method, status}.
+    Compatible sync et async : les vues async (SSE, listes async) restent async sous ASGI.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _observe(self, request, response, start):
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            view=_view_label(request), method=request.method, status=response.status_code,
+        )
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self._observe(request, response, start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self._observe(request, response, start)
+        return response
+
+
+# --- Profilage des requêtes SQL (opt-in : QUERY_PROFILING=True) ---
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+_SPACES = re.compile(r'\s+')
+
+
+def query_signature(sql):
+    """SQL paramétré normalisé : IN (%s, %s, ...) -> IN (...), pour grouper les requêtes identiques"""
+    return _SPACES.sub(' ', _IN_LIST.sub('IN (...)', sql)).strip()
+
+
+class _QueryRecorder:
+    """execute_wrapper : compte et chronomètre les requêtes, regroupées par signature"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.signatures = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.signatures[query_signature(sql)] += 1
+
+    def duplicates(self):
+        # Même requête répétée : signature typique d'un N+1 (ex. UserMinimalSerializer par ligne)
+        return {sql: n for sql, n in self.signatures.items() if n > 1}
+
+
+class QueryProfilingMiddleware:
+    """
+    Par requête : nombre de requêtes SQL, temps SQL, requêtes dupliquées et temps CPU Python,
+    renvoyés dans l'en-tête Server-Timing (visible dans l'onglet Réseau du navigateur).
+    Une fraction des requêtes (QUERY_PROFILING_SAMPLE_RATE), plus les lentes et celles
+    avec doublons, est journalisée sur le logger apps.monitoring.queries.
+
+    Les vues async (SSE, listes async) ne sont pas profilées : les requêtes ORM y tournent
+    dans d'autres threads que celui du middleware.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_PROFILING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = settings.QUERY_PROFILING_SAMPLE_RATE
+        self.slow_ms = settings.QUERY_PROFILING_SLOW_MS
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        recorders = [_QueryRecorder() for _ in connections]
+        start, cpu_start = time.perf_counter(), time.thread_time()
+        with ExitStack() as stack:
+            for alias, recorder in zip(connections, recorders):
+                stack.enter_context(connections[alias].execute_wrapper(recorder))
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+        cpu = time.thread_time() - cpu_start
+
+        count = sum(r.count for r in recorders)
+        sql_time = sum(r.duration for r in recorders)
+        duplicates = {}
+        for recorder in recorders:
+            duplicates.update(recorder.duplicates())
+
+        timings = [
+            f'db;dur={sql_time * 1000:.1f};desc="{count} queries"',
+            f'cpu;dur={cpu * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ]
+        if duplicates:
+            timings.insert(1, f'dup;desc="{sum(duplicates.values())} in {len(duplicates)} repeated queries"')
+        response['Server-Timing'] = ', '.join(filter(None, [response.get('Server-Timing'), *timings]))
+
+        if duplicates or total * 1000 >= self.slow_ms or random.random() < self.sample_rate:
+            self._log(request, response, count, sql_time, cpu, total, duplicates)
+        return response
+
+    async def __acall__(self, request):
+        return await self.get_response(request)
+
+    def _log(self, request, response, count, sql_time, cpu, total, duplicates):
+        logger.info(
+            "%s %s -> %s : %d requêtes SQL (%.1f ms), CPU %.1f ms, total %.1f ms",
+            request.method, request.path, response.status_code,
+            count, sql_time * 1000, cpu * 1000, total * 1000,
+        )
+        for sql, n in sorted(duplicates.items(), key=lambda item: -item[1])[:5]:
+            logger.info("  %d× %s", n, sql[:300])
@@ -0,0 +1,127 @@
+# apps/monitoring/profiler.py
+# Profileur par échantillonnage, déclenché à la demande dans un processus en cours
+# (signal PROFILER_SIGNAL ou POST /api/monitoring/profile/), sans redémarrer sous cProfile.
+#
+# Un thread lit les piles de tous les threads (sys._current_frames) toutes les
+# PROFILER_INTERVAL secondes pendant la durée demandée, puis écrit un fichier
+# « collapsed stacks » (une pile par ligne : frame;frame;frame <échantillons>) dans
+# PROFILER_DIR, lisible par flamegraph.pl, speedscope ou inferno :
+#
+#     kill -USR2 <pid du worker>          # run_rapport_worker, rescore_reclamations, serveur web
+#     flamegraph.pl profiles/run_rapport_worker-1234-20261018-101500.folded > flame.svg
+#
+# Hors profilage : aucun coût (pas de hook, pas de thread).
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+
+from django.conf import settings
+
+_lock = threading.Lock()
+_active = None
+
+
+@lru_cache(maxsize=4096)
+def _frame_label(code):
+    path = code.co_filename
+    base = str(settings.BASE_DIR)
+    if path.startswith(base):
+        path = os.path.relpath(path, base)
+    else:
+        path = os.path.basename(path)
+    # Numéro de la première ligne : une case par fonction, pas par ligne exécutée
+    return f"{code.co_name} ({path}:{code.co_firstlineno})".replace(';', ',')
+
+
+def _process_name():
+    argv = sys.argv[1:2] if os.path.basename(sys.argv[0]) == 'manage.py' else sys.argv[:1]
+    return (os.path.basename(argv[0]).lstrip('-') if argv else '') or 'python'
+
+
+class SamplingProfiler:
+    """
+    Échantillonne les piles de tous les threads du processus (sauf le sien).
+    focus : noms de fonctions ; seules les piles qui en contiennent une sont gardées
+    (ex. analyze_feelings, analyze_image), vide = toutes les piles.
+    """
+
+    def __init__(self, duration, interval=0.01, focus=(), directory=None):
+        self.duration = duration
+        self.interval = interval
+        self.focus = frozenset(focus)
+        self.directory = directory or settings.PROFILER_DIR
+        self.samples = Counter()
+        self.path = os.path.join(
+            self.directory,
+            f"{_process_name()}-{os.getpid()}-{time.strftime('%Y%m%d-%H%M%S')}.folded",
+        )
+        self.thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self.path
+
+    def sample(self):
+        own = threading.get_ident()
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            codes = []
+            while frame is not None:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            if self.focus and not any(code.co_name in self.focus for code in codes):
+                continue
+            self.samples[';'.join(_frame_label(code) for code in reversed(codes))] += 1
+
+    def write(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        os.replace(tmp_path, self.path)
+
+    def _run(self):
+        global _active
+        try:
+            deadline = time.monotonic() + self.duration
+            while time.monotonic() < deadline:
+                self.sample()
+                time.sleep(self.interval)
+            self.write()
+            print(f"🔥 Profil écrit : {self.path} ({sum(self.samples.values())} échantillons)")
+        finally:
+            with _lock:
+                _active = None
+
+
+def start_profile(duration=None, focus=None):
+    """Lance un profil dans ce processus ; retourne le fichier à venir, None si un profil tourne déjà"""
+    global _active
+    with _lock:
+        if _active is not None:
+            return None
+        _active = SamplingProfiler(
+            duration or settings.PROFILER_DURATION,
+            interval=settings.PROFILER_INTERVAL,
+            focus=settings.PROFILER_FOCUS if focus is None else focus,
+        )
+        return _active.start()
+
+
+def install_signal_handler():
+    """PROFILER_SIGNAL (ex. SIGUSR2) lance un profil ; seul le thread principal peut l'installer"""
+    name = settings.PROFILER_SIGNAL
+    if not name or threading.current_thread() is not threading.main_thread():
+        return False
+    # Démarrage hors du gestionnaire : il interrompt le thread principal, qui peut tenir _lock
+    signal.signal(
+        getattr(signal, name),
+        lambda signum, frame: threading.Thread(target=start_profile, daemon=True).start(),
+    )
+    return True
@@ -0,0 +1,150 @@
+import importlib.util
+import os
+import tempfile
+import threading
+import types
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from .metrics import HTTP_REQUEST_SECONDS, Counter, Histogram, _registry
+from .middleware import query_signature
+from .profiler import SamplingProfiler
+
+User = get_user_model()
+
+
+class MetricsFormatTests(TestCase):
+    def tearDown(self):
+        del _registry[-1]
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram('test_seconds', "test", ['stage'], buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value, stage='decode')
+        text = histogram.render()
+        self.assertIn('test_seconds_bucket{stage="decode",le="0.1"} 1', text)
+        self.assertIn('test_seconds_bucket{stage="decode",le="1.0"} 2', text)
+        self.assertIn('test_seconds_bucket{stage="decode",le="+Inf"} 3', text)
+        self.assertIn('test_seconds_count{stage="decode"} 3', text)
+
+    def test_counter_rejects_unknown_labels(self):
+        counter = Counter('test_total', "test", ['outcome'])
+        counter.inc(outcome='done')
+        self.assertEqual(counter.value(outcome='done'), 1)
+        with self.assertRaises(ValueError):
+            counter.inc(exception='KeyError')
+
+
+class MetricsEndpointTests(TestCase):
+    def test_request_latency_is_recorded_per_view(self):
+        user = User.objects.create_user('alice', password='secret-pass-123')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+        before = HTTP_REQUEST_SECONDS.count(view='reclamation-received', method='GET', status=200)
+        self.assertEqual(client.get('/api/reclamation/received/').status_code, 200)
+        after = HTTP_REQUEST_SECONDS.count(view='reclamation-received', method='GET', status=200)
+        self.assertEqual(after, before + 1)
+
+        response = self.client.get('/metrics', REMOTE_ADDR='127.0.0.1')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'artgallery_http_request_duration_seconds_bucket{view="reclamation-received"',
+                      response.content)
+
+    @override_settings(METRICS_ALLOWED_IPS=['10.0.0.5'])
+    def test_metrics_hidden_from_other_addresses(self):
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='127.0.0.1').status_code, 404)
+
+    @override_settings(METRICS_WEB_WORKERS=4)
+    def test_metrics_refused_with_several_web_workers(self):
+        response = self.client.get('/metrics', REMOTE_ADDR='127.0.0.1')
+        self.assertEqual(response.status_code, 503)
+        self.assertNotIn(b'artgallery_', response.content)
+
+
+class QueryProfilingTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user('alice', password='secret-pass-123')
+        self.key = Token.objects.create(user=user).key
+
+    def get(self):
+        client = APIClient()  # middleware chargés au premier appel : après override_settings
+        client.credentials(HTTP_AUTHORIZATION=f'Token {self.key}')
+        return client.get('/api/reclamation/received/')
+
+    def test_disabled_by_default(self):
+        self.assertNotIn('Server-Timing', self.get())
+
+    @override_settings(QUERY_PROFILING=True, QUERY_PROFILING_SAMPLE_RATE=0)
+    def test_server_timing_header(self):
+        header = self.get()['Server-Timing']
+        self.assertRegex(header, r'db;dur=[0-9.]+;desc="[1-9][0-9]* queries"')
+        self.assertIn('cpu;dur=', header)
+        self.assertNotIn('dup;', header)
+
+    def test_signature_groups_in_lists(self):
+        self.assertEqual(
+            query_signature('SELECT * FROM t WHERE id IN (%s, %s, %s)'),
+            query_signature('SELECT *  FROM t WHERE id IN (%s)'),
+        )
+
+
+class SamplingProfilerTests(TestCase):
+    def test_keeps_only_focused_stacks(self):
+        from apps.reclamation.feelings import analyze_feelings
+
+        stop = threading.Event()
+
+        def busy():
+            while not stop.is_set():
+                analyze_feelings("Je suis très en colère, ce tableau est inacceptable. " * 20)
+
+        worker = threading.Thread(target=busy)
+        worker.start()
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                profiler = SamplingProfiler(0.3, interval=0.005, focus=['analyze_feelings'], directory=directory)
+                profiler.start()
+                profiler.thread.join()
+                with open(profiler.path, encoding='utf-8') as f:
+                    lines = f.read().splitlines()
+        finally:
+            stop.set()
+            worker.join()
+
+        self.assertTrue(lines)
+        for line in lines:
+            stack, count = line.rsplit(' ', 1)
+            self.assertIn('analyze_feelings (apps/reclamation/feelings.py:', stack)
+            self.assertGreater(int(count), 0)
+
+
+class GunicornConfigTests(TestCase):
+    """gunicorn.conf.py refuse un nombre de workers qui ne vient pas de WEB_CONCURRENCY"""
+
+    def load_config(self):
+        path = os.path.join(settings.BASE_DIR, 'gunicorn.conf.py')
+        spec = importlib.util.spec_from_file_location('gunicorn_conf', path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def server(self, workers):
+        return types.SimpleNamespace(cfg=types.SimpleNamespace(workers=workers))
+
+    def test_workers_default_to_web_concurrency(self):
+        with mock.patch.dict(os.environ, {'WEB_CONCURRENCY': '3'}):
+            config = self.load_config()
+            self.assertEqual(config.workers, 3)
+            config.on_starting(self.server(3))
+
+    def test_cli_worker_count_must_match(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop('WEB_CONCURRENCY', None)
+            config = self.load_config()
+            with self.assertRaisesRegex(SystemExit, 'WEB_CONCURRENCY=1'):
+                config.on_starting(self.server(4))
@@ -0,0 +1,6 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('profile/', views.ProfileView.as_view(), name='monitoring-profile'),
+]
@@ -0,0 +1,68 @@
+import os
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.users.authentication import CachedTokenAuthentication
+from . import metrics as metrics_registry
+from .profiler import start_profile
+
+MAX_PROFILE_SECONDS = 300
+
+
+@require_GET
+def metrics(request):
+    """
+    GET /metrics : métriques Prometheus du processus web.
+    Réservé aux adresses de METRICS_ALLOWED_IPS (le scraper local), 404 pour les autres.
+    Avec plusieurs workers web, chaque requête tomberait sur les compteurs d'un autre
+    processus (valeurs qui reculent) : 503 plutôt que des séries fausses.
+    """
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        raise Http404
+    if settings.METRICS_WEB_WORKERS > 1:
+        return HttpResponse(
+            f"Métriques propres à chaque processus : {settings.METRICS_WEB_WORKERS} workers web, "
+            "lancer le serveur avec un seul worker pour exposer /metrics.\n",
+            status=503, content_type='text/plain; charset=utf-8',
+        )
+    return HttpResponse(metrics_registry.render(), content_type=metrics_registry.CONTENT_TYPE)
+
+
+class ProfileView(APIView):
+    """
+    GET  : profils déjà écrits dans PROFILER_DIR
+    POST : {seconds?, all_stacks?} profile le processus web qui reçoit la requête
+           (pour les workers : kill -USR2 <pid>, voir apps/monitoring/profiler.py)
+    """
+    permission_classes = [permissions.IsAdminUser]
+    authentication_classes = [CachedTokenAuthentication]
+
+    def get(self, request):
+        directory = settings.PROFILER_DIR
+        names = sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+        return Response([
+            {'file': name, 'size': os.path.getsize(os.path.join(directory, name))}
+            for name in names if name.endswith('.folded')
+        ])
+
+    def post(self, request):
+        try:
+            seconds = int(request.data.get('seconds', settings.PROFILER_DURATION))
+        except (TypeError, ValueError):
+            return Response({'error': "seconds doit être un entier"}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 < seconds <= MAX_PROFILE_SECONDS:
+            return Response({'error': f"seconds doit être entre 1 et {MAX_PROFILE_SECONDS}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        focus = () if request.data.get('all_stacks') else None
+        path = start_profile(seconds, focus=focus)
+        if path is None:
+            return Response({'error': "Un profil est déjà en cours dans ce processus"},
+                            status=status.HTTP_409_CONFLICT)
+        return Response({'file': os.path.basename(path), 'pid': os.getpid(), 'seconds': seconds},
+                        status=status.HTTP_202_ACCEPTED)
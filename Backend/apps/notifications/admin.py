@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import UserEvent
+
+
+@admin.register(UserEvent)
+class UserEventAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'kind', 'created_at')
+    list_filter = ('kind',)
+    search_fields = ('user__username',)
+    raw_id_fields = ('user',)
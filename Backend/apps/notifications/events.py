@@ -0,0 +1,27 @@
+# Publication des événements temps réel. Appelé depuis le worker rapports
+# et les signaux : la table UserEvent fait le lien entre processus.
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import UserEvent
+
+
+def publish(user_id, kind, payload):
+    return UserEvent.objects.create(user_id=user_id, kind=kind, payload=payload)
+
+
+def publish_rapport_status(rapport):
+    return publish(rapport.user_id, 'rapport', {
+        'id': rapport.pk,
+        'name': rapport.name,
+        'status': rapport.status,
+    })
+
+
+def prune_events():
+    """Supprime les événements plus vieux que NOTIFICATIONS_RETENTION secondes"""
+    limit = timezone.now() - timedelta(seconds=settings.NOTIFICATIONS_RETENTION)
+    deleted, _ = UserEvent.objects.filter(created_at__lt=limit).delete()
+    return deleted
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.db import models
+
+
+class UserEvent(models.Model):
+    """
+    Événement à pousser à un utilisateur (flux SSE, voir views.py).
+    L'id croissant sert d'identifiant d'événement pour la reprise (Last-Event-ID).
+    """
+    KIND_CHOICES = [
+        ('rapport', 'Statut de rapport'),
+        ('reclamation', 'Réclamation reçue'),
+    ]
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='events')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # Lecture du flux : événements d'un utilisateur après un id donné
+            models.Index(fields=['user', 'id'], name='userevent_user_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} → {self.user_id} (#{self.pk})"
+
+
+class StreamTicket(models.Model):
+    """
+    Ticket à usage unique et de courte durée pour ouvrir le flux SSE.
+    EventSource ne peut pas envoyer d'en-tête : le ticket passe dans l'URL
+    (et donc dans les journaux d'accès) à la place du jeton d'API.
+    Seul le SHA-256 du ticket est stocké.
+    """
+    key = models.CharField(max_length=64, unique=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='stream_tickets')
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"ticket → {self.user_id} (expire {self.expires_at:%H:%M:%S})"
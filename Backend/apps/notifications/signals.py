@@ -0,0 +1,19 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.reclamation.models import Reclamation
+from .events import publish
+
+
+@receiver(post_save, sender=Reclamation)
+def reclamation_created(sender, instance, created, **kwargs):
+    # Nouvelle réclamation visant un utilisateur : prévenir la cible
+    if not created or instance.cible_id is None:
+        return
+    publish(instance.cible_id, 'reclamation', {
+        'id': instance.pk,
+        'auteur': instance.auteur.username,
+        'sujet': instance.sujet,
+        'sentiment_local': instance.sentiment_local,
+        'date_creation': instance.date_creation.isoformat(),
+    })
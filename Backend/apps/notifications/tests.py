@@ -0,0 +1,108 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.reclamation.models import Reclamation
+from .models import StreamTicket, UserEvent
+
+User = get_user_model()
+
+STREAM_URL = '/api/notifications/stream/'
+TICKET_URL = '/api/notifications/stream/ticket/'
+
+
+async def read_stream(response):
+    return ''.join([
+        chunk.decode() if isinstance(chunk, bytes) else chunk
+        async for chunk in response.streaming_content
+    ])
+
+
+@override_settings(NOTIFICATIONS_STREAM_TIMEOUT=0.2, NOTIFICATIONS_POLL_INTERVAL=0.05)
+class EventStreamTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('alice', password='secret-pass-123')
+        self.token = Token.objects.create(user=self.user).key
+
+    async def aticket(self):
+        # AsyncClient : requêtes ASGI, comme sous uvicorn
+        response = await AsyncClient().post(TICKET_URL, headers={'Authorization': f'Token {self.token}'})
+        self.assertEqual(response.status_code, 201)
+        return response.json()['ticket']
+
+    async def test_ticket_requires_authentication(self):
+        self.assertEqual((await AsyncClient().post(TICKET_URL)).status_code, 401)
+
+    async def test_only_the_ticket_hash_is_stored(self):
+        ticket = await self.aticket()
+        self.assertFalse(await StreamTicket.objects.filter(key=ticket).aexists())
+        stored = await StreamTicket.objects.select_related('user').aget()
+        self.assertEqual(stored.user, self.user)
+
+    def test_refused_under_wsgi(self):
+        # Sous WSGI le générateur serait lu jusqu'au bout avant l'envoi : pas de flux, pas de ticket
+        api = APIClient()
+        api.credentials(HTTP_AUTHORIZATION=f'Token {self.token}')
+        self.assertEqual(api.post(TICKET_URL).status_code, 503)
+        self.assertEqual(api.get(STREAM_URL).status_code, 503)
+        self.assertFalse(StreamTicket.objects.exists())
+
+    async def test_ticket_is_single_use(self):
+        ticket = await self.aticket()
+        client = AsyncClient()
+        first = await client.get(STREAM_URL, {'ticket': ticket})
+        self.assertEqual(first.status_code, 200)
+        await read_stream(first)
+        second = await client.get(STREAM_URL, {'ticket': ticket})
+        self.assertEqual(second.status_code, 401)
+
+    async def test_expired_ticket_is_rejected(self):
+        ticket = await self.aticket()
+        await StreamTicket.objects.aupdate(expires_at=timezone.now() - timedelta(seconds=1))
+        response = await AsyncClient().get(STREAM_URL, {'ticket': ticket})
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(await StreamTicket.objects.aexists())
+
+    async def test_api_token_in_query_string_is_rejected(self):
+        response = await AsyncClient().get(STREAM_URL, {'token': self.token})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_delivers_events_after_last_event_id(self):
+        old = await UserEvent.objects.acreate(user=self.user, kind='rapport', payload={'id': 1, 'status': 'pending'})
+        new = await UserEvent.objects.acreate(user=self.user, kind='rapport', payload={'id': 1, 'status': 'done'})
+        response = await AsyncClient().get(STREAM_URL, {'ticket': await self.aticket(), 'last_event_id': old.pk})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = await read_stream(response)
+        self.assertTrue(body.startswith('retry: 50\n\n'))
+        self.assertIn(f'id: {new.pk}\nevent: rapport\ndata: {{"id": 1, "status": "done"}}\n\n', body)
+        self.assertNotIn(f'id: {old.pk}\n', body)
+
+    async def test_header_authentication_and_other_users_events(self):
+        other = await User.objects.acreate(username='bob')
+        await UserEvent.objects.acreate(user=other, kind='rapport', payload={'id': 2})
+        mine = await UserEvent.objects.acreate(user=self.user, kind='rapport', payload={'id': 3})
+        response = await AsyncClient().get(
+            STREAM_URL, {'last_event_id': 0}, headers={'Authorization': f'Token {self.token}'},
+        )
+        body = await read_stream(response)
+        self.assertEqual(body.count('event: rapport'), 1)
+        self.assertIn(f'id: {mine.pk}\n', body)
+
+
+class ReclamationEventTests(TestCase):
+    def test_new_reclamation_notifies_the_target(self):
+        auteur = User.objects.create_user('alice')
+        cible = User.objects.create_user('bob')
+        reclamation = Reclamation.objects.create(auteur=auteur, cible=cible, sujet='user', contenu='Merci beaucoup')
+        event = UserEvent.objects.get(user=cible)
+        self.assertEqual(event.kind, 'reclamation')
+        self.assertEqual(event.payload['id'], reclamation.pk)
+        self.assertEqual(event.payload['auteur'], 'alice')
+
+        reclamation.save()
+        Reclamation.objects.create(auteur=auteur, sujet='system', contenu='Bug')
+        self.assertEqual(UserEvent.objects.count(), 1)
@@ -0,0 +1,44 @@
+# Tickets du flux SSE : délivrés par POST stream/ticket/ (authentifié par jeton),
+# consommés une seule fois par GET stream/?ticket=...
+import hashlib
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import StreamTicket
+
+
+def _hash(ticket):
+    return hashlib.sha256(ticket.encode('utf-8')).hexdigest()
+
+
+def issue_ticket(user):
+    ticket = secrets.token_urlsafe(32)
+    StreamTicket.objects.create(
+        key=_hash(ticket),
+        user=user,
+        expires_at=timezone.now() + timedelta(seconds=settings.NOTIFICATIONS_TICKET_TTL),
+    )
+    return ticket
+
+
+async def aconsume_ticket(ticket):
+    """Utilisateur du ticket s'il est valide, None sinon ; le ticket est supprimé dans tous les cas"""
+    found = await (
+        StreamTicket.objects.select_related('user')
+        .filter(key=_hash(ticket)).afirst()
+    )
+    if found is None:
+        return None
+    # Le DELETE tranche entre deux connexions simultanées avec le même ticket
+    deleted, _ = await StreamTicket.objects.filter(pk=found.pk).adelete()
+    if not deleted or found.expires_at <= timezone.now() or not found.user.is_active:
+        return None
+    return found.user
+
+
+def prune_tickets():
+    deleted, _ = StreamTicket.objects.filter(expires_at__lt=timezone.now()).delete()
+    return deleted
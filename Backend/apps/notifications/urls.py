@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('stream/', views.event_stream, name='notifications-stream'),
+    path('stream/ticket/', views.StreamTicketView.as_view(), name='notifications-stream-ticket'),
+]
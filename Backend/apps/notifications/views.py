@@ -0,0 +1,105 @@
+# Flux Server-Sent Events par utilisateur : statut des rapports et réclamations reçues.
+# Remplace l'interrogation répétée de /api/rapport/rapports/<id>/ par le client.
+# Vue async : sous ASGI (uvicorn), une connexion ouverte ne bloque aucun thread.
+# Sous WSGI (runserver, gunicorn sync), Django lit un générateur async jusqu'au bout
+# avant d'envoyer quoi que ce soit : le flux y est refusé (503), le client interroge l'API.
+import asyncio
+import json
+import time
+
+from django.conf import settings
+from django.db.models import Max
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework import permissions, status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.users.async_api import aauthenticate
+from apps.users.authentication import CachedTokenAuthentication
+from .models import UserEvent
+from .tickets import aconsume_ticket, issue_ticket
+
+STREAM_UNAVAILABLE = "Flux d'événements disponible uniquement sous ASGI (uvicorn artGallery.asgi:application)."
+HEARTBEAT_INTERVAL = 15  # commentaire SSE pour garder la connexion ouverte (proxies)
+BATCH_SIZE = 100
+
+
+def _format(event):
+    data = json.dumps(event.payload, ensure_ascii=False)
+    return f"id: {event.pk}\nevent: {event.kind}\ndata: {data}\n\n"
+
+
+async def _stream(user_id, last_id):
+    # Le client se reconnecte (avec Last-Event-ID) après NOTIFICATIONS_STREAM_TIMEOUT
+    deadline = time.monotonic() + settings.NOTIFICATIONS_STREAM_TIMEOUT
+    last_write = time.monotonic()
+    yield f"retry: {int(settings.NOTIFICATIONS_POLL_INTERVAL * 1000)}\n\n"
+
+    while time.monotonic() < deadline:
+        events = [
+            event async for event in
+            UserEvent.objects.filter(user_id=user_id, pk__gt=last_id).order_by('pk')[:BATCH_SIZE]
+        ]
+        for event in events:
+            last_id = event.pk
+            yield _format(event)
+        if events:
+            last_write = time.monotonic()
+        elif time.monotonic() - last_write > HEARTBEAT_INTERVAL:
+            last_write = time.monotonic()
+            yield ": ping\n\n"
+        if len(events) < BATCH_SIZE:
+            await asyncio.sleep(settings.NOTIFICATIONS_POLL_INTERVAL)
+
+
+@require_GET
+async def event_stream(request):
+    """
+    GET /api/notifications/stream/?ticket=<ticket>[&last_event_id=<id>]
+    EventSource ne peut pas envoyer d'en-tête Authorization : le navigateur obtient
+    d'abord un ticket (POST stream/ticket/) ; le jeton d'API n'apparaît jamais dans l'URL.
+    Les autres clients peuvent envoyer l'en-tête Authorization: Token <clé>.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'detail': STREAM_UNAVAILABLE}, status=503)
+    if request.GET.get('ticket'):
+        user = await aconsume_ticket(request.GET['ticket'])
+        if user is None:
+            return JsonResponse({'detail': "Ticket invalide, expiré ou déjà utilisé."}, status=401)
+    else:
+        try:
+            user = await aauthenticate(request)
+        except AuthenticationFailed as e:
+            return JsonResponse({'detail': str(e.detail)}, status=401)
+        if user is None:
+            return JsonResponse({'detail': "Informations d'authentification non fournies."}, status=401)
+
+    last_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    try:
+        last_id = int(last_id)
+    except (TypeError, ValueError):
+        # Première connexion : seulement les événements à venir
+        last_id = (await UserEvent.objects.filter(user=user).aaggregate(last=Max('pk')))['last'] or 0
+
+    response = StreamingHttpResponse(_stream(user.pk, last_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # pas de mise en tampon par nginx
+    return response
+
+
+class StreamTicketView(APIView):
+    """POST : ticket à usage unique (NOTIFICATIONS_TICKET_TTL secondes) pour ouvrir le flux"""
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [CachedTokenAuthentication]
+
+    def post(self, request):
+        # Inutile de délivrer un ticket pour un flux que ce serveur ne peut pas servir
+        if not isinstance(request._request, ASGIRequest):
+            return Response({'detail': STREAM_UNAVAILABLE}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return Response(
+            {'ticket': issue_ticket(request.user), 'expires_in': settings.NOTIFICATIONS_TICKET_TTL},
+            status=status.HTTP_201_CREATED,
+        )
@@ -3,6 +3,4 @@ from django.apps import AppConfig
 
 class RapportConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.rapport'
-    def ready(self):
-        import apps.rapport.signals
\ No newline at end of file
+    name = 'apps.rapport'
\ No newline at end of file
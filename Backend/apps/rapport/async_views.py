@@ -0,0 +1,37 @@
+# Variantes async (ASGI) de la liste et du détail des rapports (voir RapportViewSet).
+# La génération (BLIP, palette, PDF) reste dans manage.py run_rapport_worker ;
+# ces vues ne font que lire la base avec l'ORM async.
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from apps.users.async_api import apaginate, token_required
+from .models import Rapport
+from .pagination import RapportCursorPagination
+from .serializers import RapportListSerializer, RapportSerializer
+
+
+def _visible_rapports(user):
+    queryset = Rapport.objects.select_related('user')
+    if user.is_superuser or user.is_staff:
+        return queryset
+    return queryset.filter(user=user)
+
+
+@require_GET
+@token_required
+async def rapport_list(request):
+    queryset = _visible_rapports(request.user).defer('result', 'error')
+    return await apaginate(
+        request, queryset, RapportCursorPagination,
+        lambda rows: RapportListSerializer(rows, many=True, context={'request': request}).data,
+    )
+
+
+@require_GET
+@token_required
+async def rapport_detail(request, pk):
+    try:
+        rapport = await _visible_rapports(request.user).aget(pk=pk)
+    except Rapport.DoesNotExist:
+        return JsonResponse({'detail': "Pas trouvé."}, status=404)
+    return JsonResponse(RapportSerializer(rapport, context={'request': request}).data)
@@ -0,0 +1,155 @@
+# apps/rapport/dedup.py
+# Déduplication des images de rapports :
+#  - même contenu (SHA-256)      -> un seul fichier en stockage, analyse réutilisée telle quelle
+#  - même image ré-encodée        -> (hash perceptuel identique et couleurs proches) description et
+#                                    palette réutilisées
+import hashlib
+
+from django.db.models import F, Sum
+from PIL import Image
+
+from .models import ImageAnalysis, Rapport
+
+PHASH_SIZE = 8  # dHash 8x8 -> 64 bits
+COLOR_GRID = 2  # couleur moyenne par case d'une grille 2x2 -> 12 octets
+COLOR_TOLERANCE = 24  # écart maximal par canal (0-255) entre deux images "identiques"
+
+
+def file_sha256(field_file):
+    hasher = hashlib.sha256()
+    with field_file.storage.open(field_file.name, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def perceptual_hash(image):
+    """
+    dHash : compare chaque pixel à son voisin de droite sur une miniature 9x8
+    en niveaux de gris. Insensible au redimensionnement et à la recompression.
+    """
+    small = image.convert('L').resize((PHASH_SIZE + 1, PHASH_SIZE), Image.LANCZOS)
+    pixels = list(small.getdata())
+    bits = 0
+    for row in range(PHASH_SIZE):
+        for col in range(PHASH_SIZE):
+            left = pixels[row * (PHASH_SIZE + 1) + col]
+            right = pixels[row * (PHASH_SIZE + 1) + col + 1]
+            bits = (bits << 1) | (left > right)
+    return f"{bits:016x}"
+
+
+def color_signature(image):
+    """
+    Couleur moyenne de chaque case d'une grille 2x2, en hexadécimal.
+    Le dHash ne voit que la luminance : un aplat rouge et un aplat bleu ont le même hash.
+    """
+    small = image.convert('RGB').resize((COLOR_GRID, COLOR_GRID), Image.BOX)
+    return bytes(channel for pixel in small.getdata() for channel in pixel).hex()
+
+
+def colors_match(signature, other):
+    if not signature or not other or len(signature) != len(other):
+        return False
+    a, b = bytes.fromhex(signature), bytes.fromhex(other)
+    return max(abs(x - y) for x, y in zip(a, b)) <= COLOR_TOLERANCE
+
+
+def share_picture(rapport):
+    """
+    Calcule le SHA-256 de rapport.picture si besoin. Si un rapport plus ancien a
+    déjà la même image, pointe vers son fichier et supprime le doublon.
+    Retourne le SHA-256.
+    """
+    if not rapport.picture_sha256:
+        rapport.picture_sha256 = file_sha256(rapport.picture)
+
+    # Toujours vers le plus ancien : deux workers ne peuvent pas se pointer mutuellement
+    original = (
+        Rapport.objects
+        .filter(picture_sha256=rapport.picture_sha256, pk__lt=rapport.pk)
+        .exclude(picture=rapport.picture.name)
+        .order_by('pk')
+        .only('picture', 'picture_variants')
+        .first()
+    )
+    if original is not None and original.picture.storage.exists(original.picture.name):
+        duplicate = rapport.picture.name
+        rapport.picture.name = original.picture.name
+        rapport.picture_variants = original.picture_variants
+        if not Rapport.objects.filter(picture=duplicate).exclude(pk=rapport.pk).exists():
+            rapport.picture.storage.delete(duplicate)
+
+    # update() plutôt que save(update_fields) : le rapport a pu être supprimé entre-temps
+    updated = Rapport.objects.filter(pk=rapport.pk).update(
+        picture=rapport.picture.name,
+        picture_sha256=rapport.picture_sha256,
+        picture_variants=rapport.picture_variants,
+    )
+    if not updated:
+        raise Rapport.DoesNotExist(f"Rapport #{rapport.pk} supprimé")
+    return rapport.picture_sha256
+
+
+def find_exact_analysis(sha256):
+    """Analyse déjà calculée pour exactement ce fichier, ou None"""
+    analysis = ImageAnalysis.objects.filter(sha256=sha256).first()
+    if analysis is not None:
+        ImageAnalysis.objects.filter(pk=analysis.pk).update(exact_hits=F('exact_hits') + 1)
+    return analysis
+
+
+def find_similar_analysis(phash, signature):
+    """
+    Analyse d'une image visuellement identique (même hash perceptuel et mêmes
+    couleurs à COLOR_TOLERANCE près), ou None
+    """
+    candidates = ImageAnalysis.objects.filter(phash=phash).exclude(color_signature='').order_by('pk')
+    for analysis in candidates.only('pk', 'color_signature', 'description', 'colors'):
+        if colors_match(signature, analysis.color_signature):
+            ImageAnalysis.objects.filter(pk=analysis.pk).update(perceptual_hits=F('perceptual_hits') + 1)
+            return analysis
+    return None
+
+
+def remember_analysis(sha256, phash, signature, result):
+    analysis, _ = ImageAnalysis.objects.get_or_create(
+        sha256=sha256,
+        defaults={
+            'phash': phash,
+            'color_signature': signature,
+            'description': result['description'],
+            'colors': result['colors'],
+            'report_text': result['report_text'],
+        },
+    )
+    return analysis
+
+
+def analysis_colors(sha256):
+    """Palette enregistrée pour ce fichier (sans compter de hit), ou None"""
+    if not sha256:
+        return None
+    return ImageAnalysis.objects.filter(sha256=sha256).values_list('colors', flat=True).first()
+
+
+def analysis_stats():
+    """Taux de réutilisation : une analyse calculée = un miss, chaque réutilisation = un hit"""
+    totals = ImageAnalysis.objects.aggregate(
+        exact_hits=Sum('exact_hits'),
+        perceptual_hits=Sum('perceptual_hits'),
+    )
+    exact = totals['exact_hits'] or 0
+    perceptual = totals['perceptual_hits'] or 0
+    misses = ImageAnalysis.objects.count()
+    lookups = exact + perceptual + misses
+    return {
+        'exact_hits': exact,
+        'perceptual_hits': perceptual,
+        'misses': misses,
+        'hit_rate': round((exact + perceptual) / lookups, 3) if lookups else 0.0,
+        'shared_pictures': (
+            Rapport.objects.exclude(picture_sha256='').count()
+            - Rapport.objects.exclude(picture_sha256='').values('picture').distinct().count()
+        ),
+    }
@@ -0,0 +1,193 @@
+# apps/rapport/jobs.py
+# File de génération des rapports : la table Rapport sert de file (champ status),
+# traitée hors requête par manage.py run_rapport_worker.
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.monitoring.metrics import RAPPORT_JOB_ERRORS, RAPPORT_JOBS, THUMBNAIL_ERRORS
+from apps.notifications.events import publish_rapport_status
+from apps.users.authentication import invalidate_user
+from . import dedup
+from .models import Rapport
+from .utils.thumbnails import generate_variants
+
+
+def generate_report(rapport):
+    """
+    Lance l'analyse de l'image et enregistre le rapport.
+    Une image déjà analysée (même contenu ou même hash perceptuel) réutilise
+    la description et la palette ; BLIP et KMeans ne tournent pas.
+    Lève Rapport.DoesNotExist si le rapport a été supprimé pendant l'analyse.
+    """
+    # Import ici pour ne pas charger la pile ML au démarrage
+    # Le PDF n'est plus écrit ici : il est construit à la demande (GET rapports/<id>/pdf/)
+    from .utils.image_analysis import ImageContext, analyze_image
+
+    sha256 = dedup.share_picture(rapport)
+    exact = dedup.find_exact_analysis(sha256)
+    if exact is not None:
+        # Même fichier : le rapport texte est réutilisé tel quel
+        report_text = exact.report_text
+    else:
+        context = ImageContext(rapport.picture.path)
+        phash = dedup.perceptual_hash(context.image)
+        signature = dedup.color_signature(context.image)
+        similar = dedup.find_similar_analysis(phash, signature)
+        if similar is not None:
+            # Image ré-encodée : description et palette réutilisées, texte régénéré
+            cached = {'description': similar.description, 'colors': similar.colors}
+            report_text = analyze_image(context, cached=cached)["report_text"]
+        else:
+            analysis_result = analyze_image(context)
+            dedup.remember_analysis(sha256, phash, signature, analysis_result)
+            report_text = analysis_result["report_text"]
+
+    rapport.result = report_text
+    rapport.status = 'done'
+    rapport.error = ''
+    if not Rapport.objects.filter(pk=rapport.pk).update(result=report_text, status='done', error=''):
+        raise Rapport.DoesNotExist(f"Rapport #{rapport.pk} supprimé")
+    publish_rapport_status(rapport)
+
+
+def pending_candidates(now, limit=10):
+    """Rapports en attente dont le délai de nouvel essai est écoulé, les plus anciens d'abord"""
+    return list(
+        Rapport.objects
+        .filter(status='pending')
+        .filter(Q(retry_after__isnull=True) | Q(retry_after__lte=now))
+        .order_by('created_at')
+        .values_list('pk', flat=True)[:limit]
+    )
+
+
+def retry_delay(attempts):
+    """Délai avant l'essai suivant : RAPPORT_JOB_RETRY_DELAY, doublé à chaque échec (plafonné)"""
+    base = getattr(settings, 'RAPPORT_JOB_RETRY_DELAY', 30)
+    cap = getattr(settings, 'RAPPORT_JOB_RETRY_MAX_DELAY', 3600)
+    return timedelta(seconds=min(cap, base * 2 ** max(0, attempts - 1)))
+
+
+def claim_next_job():
+    """
+    Réserve le plus ancien rapport en attente et le passe en 'running'.
+    L'UPDATE conditionnel garantit qu'un seul worker obtient chaque rapport.
+    """
+    now = timezone.now()
+    for pk in pending_candidates(now):
+        claimed = Rapport.objects.filter(pk=pk, status='pending').update(
+            status='running',
+            started_at=now,
+            retry_after=None,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            rapport = Rapport.objects.get(pk=pk)
+            publish_rapport_status(rapport)
+            return rapport
+    return None
+
+
+def fail_job(rapport, error):
+    """
+    Remet le rapport en file avec un délai croissant (une erreur passagère a le temps
+    de disparaître), ou le marque 'failed' après le dernier essai.
+    """
+    max_attempts = getattr(settings, 'RAPPORT_JOB_MAX_ATTEMPTS', 3)
+    if rapport.attempts < max_attempts:
+        rapport.status = 'pending'
+        rapport.retry_after = timezone.now() + retry_delay(rapport.attempts)
+    else:
+        rapport.status = 'failed'
+        rapport.retry_after = None
+    rapport.error = str(error)
+    updated = Rapport.objects.filter(pk=rapport.pk).update(
+        status=rapport.status, error=rapport.error, retry_after=rapport.retry_after,
+    )
+    # Rapport supprimé pendant la génération : plus rien à signaler
+    if updated:
+        publish_rapport_status(rapport)
+
+
+def requeue_stale_jobs():
+    """Rapports restés 'running' trop longtemps (worker arrêté en cours de route)"""
+    timeout = getattr(settings, 'RAPPORT_JOB_TIMEOUT', 600)
+    stale = Rapport.objects.filter(
+        status='running',
+        started_at__lt=timezone.now() - timedelta(seconds=timeout),
+    )
+    max_attempts = getattr(settings, 'RAPPORT_JOB_MAX_ATTEMPTS', 3)
+    exhausted = list(stale.filter(attempts__gte=max_attempts).only('pk', 'user', 'name'))
+    failed = stale.filter(pk__in=[r.pk for r in exhausted]).update(status='failed', error='Timeout')
+    requeued = stale.update(status='pending')
+    for rapport in exhausted:
+        rapport.status = 'failed'
+        publish_rapport_status(rapport)
+    return requeued + failed
+
+
+def run_next_job():
+    """Traite un rapport en attente. Retourne False si la file est vide."""
+    rapport = claim_next_job()
+    if rapport is None:
+        return False
+
+    try:
+        generate_report(rapport)
+    except Rapport.DoesNotExist:
+        print(f"🗑️ Rapport #{rapport.pk} supprimé pendant la génération : ignoré")
+        RAPPORT_JOBS.inc(outcome='deleted')
+    except Exception as e:
+        print(f"⚠️ Erreur lors de la génération du rapport #{rapport.pk} : {e}")
+        RAPPORT_JOB_ERRORS.inc(exception=type(e).__name__)
+        RAPPORT_JOBS.inc(outcome='failed')
+        fail_job(rapport, e)
+    else:
+        RAPPORT_JOBS.inc(outcome='done')
+    return True
+
+
+def generate_missing_thumbnails(limit=50):
+    """
+    Génère les variantes WebP/AVIF des images qui n'en ont pas encore
+    (Rapport.picture et User.profile_picture). Retourne le nombre d'images traitées.
+    """
+    targets = [
+        (Rapport, 'picture', 'picture_variants'),
+        (get_user_model(), 'profile_picture', 'profile_picture_variants'),
+    ]
+    done = 0
+    for model, field, variants_field in targets:
+        pending = (
+            model.objects
+            .filter(**{f'{variants_field}__isnull': True})
+            .exclude(**{field: ''})
+            .exclude(**{f'{field}__isnull': True})
+            .only('pk', field)[:limit - done]
+        )
+        for obj in pending:
+            field_file = getattr(obj, field)
+            try:
+                variants = generate_variants(field_file)
+            except Exception as e:
+                # Ne pas réessayer en boucle une image illisible
+                print(f"⚠️ Miniatures impossibles pour {model.__name__} #{obj.pk} : {e}")
+                THUMBNAIL_ERRORS.inc(model=model.__name__)
+                variants = {'source': field_file.name, 'error': str(e)}
+            changes = {variants_field: variants}
+            # update() ne touche pas auto_now : sans updated_at, l'ETag de /api/users/ ne change pas
+            if any(f.name == 'updated_at' for f in model._meta.concrete_fields):
+                changes['updated_at'] = timezone.now()
+            # Filtre sur le nom : l'image a pu être remplacée pendant la génération
+            updated = model.objects.filter(pk=obj.pk, **{field: field_file.name}).update(**changes)
+            if updated and model is get_user_model():
+                # Pas de post_save : l'utilisateur en cache (authentification) serait périmé
+                invalidate_user(obj.pk)
+            done += 1
+        if done >= limit:
+            break
+    return done
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.rapport.utils.blip_server import BlipServer, blip_server_address
+
+
+class Command(BaseCommand):
+    help = "Charge BLIP une seule fois et sert les descriptions d'images aux workers (socket Unix)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--socket', default='',
+                            help="Chemin du socket (par défaut settings.BLIP_SERVER_SOCKET)")
+
+    def handle(self, *args, **options):
+        address = options['socket'] or blip_server_address()
+        if not address:
+            raise CommandError("Définir BLIP_SERVER_SOCKET ou passer --socket.")
+        BlipServer(address).serve_forever()
@@ -0,0 +1,64 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.monitoring.metrics import start_http_server
+from apps.notifications.events import prune_events
+from apps.notifications.tickets import prune_tickets
+from apps.rapport.dedup import analysis_stats
+from apps.rapport.jobs import generate_missing_thumbnails, requeue_stale_jobs, run_next_job
+from apps.rapport.uploads import purge_stale_uploads
+from apps.rapport.utils.blip_server import blip_server_enabled
+from apps.rapport.utils.image_analysis import warmup
+
+
+class Command(BaseCommand):
+    help = ("Traite la file des rapports en attente (BLIP + palette + PDF) "
+            "et génère les miniatures des images. "
+            "Lancer plusieurs instances pour avoir plusieurs workers.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                            help="Secondes d'attente quand la file est vide")
+        parser.add_argument('--once', action='store_true',
+                            help="Vider la file puis s'arrêter")
+        parser.add_argument('--metrics-port', type=int, default=settings.METRICS_WORKER_PORT,
+                            help="Port de /metrics pour ce worker (0 = désactivé, un port par instance)")
+
+    def handle(self, *args, **options):
+        # Charger la pile ML avant le premier rapport (BLIP seulement sans serveur BLIP)
+        warmup(load_model=not blip_server_enabled())
+        self.stdout.write("🛠️ Worker rapports démarré")
+        if options['metrics_port']:
+            start_http_server(options['metrics_port'])
+            self.stdout.write(f"📈 Métriques sur http://127.0.0.1:{options['metrics_port']}/metrics")
+        while True:
+            requeued = requeue_stale_jobs()
+            if requeued:
+                self.stdout.write(f"↩️ {requeued} rapport(s) bloqué(s) remis en file")
+
+            prune_events()
+            prune_tickets()
+            purged = purge_stale_uploads()
+            if purged:
+                self.stdout.write(f"🧹 {purged} envoi(s) abandonné(s) supprimé(s)")
+
+            processed = 0
+            while run_next_job():
+                processed += 1
+            if processed:
+                self.stdout.write(self.style.SUCCESS(f"✅ {processed} rapport(s) traité(s)"))
+                stats = analysis_stats()
+                self.stdout.write(f"♻️ Analyses réutilisées : {stats['hit_rate']:.0%} "
+                                  f"({stats['exact_hits']} identiques, {stats['perceptual_hits']} similaires)")
+
+            # Miniatures / variantes responsive, hors du chemin des requêtes
+            thumbnails = generate_missing_thumbnails()
+            while thumbnails:
+                self.stdout.write(f"🖼️ {thumbnails} image(s) déclinée(s) en miniatures")
+                thumbnails = generate_missing_thumbnails()
+
+            if options['once']:
+                return
+            time.sleep(options['poll_interval'])
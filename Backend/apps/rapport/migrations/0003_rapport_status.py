@@ -0,0 +1,40 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:44
+
+from django.db import migrations, models
+
+
+def mark_existing_reports_done(apps, schema_editor):
+    # Les rapports déjà générés ne doivent pas repasser dans la file
+    Rapport = apps.get_model('rapport', 'Rapport')
+    Rapport.objects.exclude(result='').update(status='done')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rapport', '0002_alter_rapport_result'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rapport',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='rapport',
+            name='error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='rapport',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='rapport',
+            name='status',
+            field=models.CharField(choices=[('pending', 'En attente'), ('running', 'En cours'), ('done', 'Terminé'), ('failed', 'Échec')], db_index=True, default='pending', max_length=10),
+        ),
+        migrations.RunPython(mark_existing_reports_done, migrations.RunPython.noop),
+    ]
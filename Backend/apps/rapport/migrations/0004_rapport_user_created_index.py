@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rapport', '0003_rapport_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rapport',
+            index=models.Index(fields=['user', 'created_at'], name='rapport_user_created_idx'),
+        ),
+    ]
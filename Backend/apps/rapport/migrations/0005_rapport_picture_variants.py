@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rapport', '0004_rapport_user_created_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rapport',
+            name='picture_variants',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
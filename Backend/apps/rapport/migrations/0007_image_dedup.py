@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rapport', '0006_rapportupload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageAnalysis',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('phash', models.CharField(db_index=True, max_length=16)),
+                ('description', models.TextField()),
+                ('colors', models.JSONField()),
+                ('report_text', models.TextField()),
+                ('exact_hits', models.PositiveIntegerField(default=0)),
+                ('perceptual_hits', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='rapport',
+            name='picture_sha256',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rapport', '0007_image_dedup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rapport',
+            name='retry_after',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rapport', '0008_rapport_retry_after'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imageanalysis',
+            name='color_signature',
+            field=models.CharField(blank=True, max_length=24),
+        ),
+    ]
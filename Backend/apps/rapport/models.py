@@ -1,4 +1,6 @@
 # apps/rapport/models.py
+import uuid
+
 from django.db import models
 from django.conf import settings
 
@@ -8,6 +10,12 @@ class Rapport(models.Model):
         ('analyse', 'Analyse'),
         ('evaluation', 'Évaluation'),
     ]
+    STATUS_CHOICES = [
+        ('pending', 'En attente'),
+        ('running', 'En cours'),
+        ('done', 'Terminé'),
+        ('failed', 'Échec'),
+    ]
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='rapports')
     name = models.CharField(max_length=255)
     type = models.CharField(max_length=20, choices=TYPE_CHOICES)
@@ -15,5 +23,60 @@ class Rapport(models.Model):
     result = models.TextField(blank=True)  # <- facultatif à la création
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # File de génération (traitée par manage.py run_rapport_worker)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', db_index=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    started_at = models.DateTimeField(blank=True, null=True)
+    error = models.TextField(blank=True)
+    # Après un échec : pas de nouvel essai avant cette date (délai croissant, voir jobs.fail_job)
+    retry_after = models.DateTimeField(blank=True, null=True)
+
+    # Variantes WebP/AVIF de picture (générées par le worker, voir utils/thumbnails.py)
+    picture_variants = models.JSONField(blank=True, null=True)
+    # SHA-256 du fichier : deux rapports de la même image partagent le fichier (voir dedup.py)
+    picture_sha256 = models.CharField(max_length=64, blank=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # Liste "mes rapports" triée par date
+            models.Index(fields=['user', 'created_at'], name='rapport_user_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.type})"
+
+
+class ImageAnalysis(models.Model):
+    """
+    Résultat d'analyse (BLIP + palette + texte) par contenu d'image.
+    Réutilisé quand la même image (SHA-256) ou une image visuellement identique
+    (hash perceptuel) est soumise à nouveau.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    phash = models.CharField(max_length=16, db_index=True)
+    # Couleur moyenne de chaque quart de l'image (voir dedup.color_signature) : le dHash ignore la couleur
+    color_signature = models.CharField(max_length=24, blank=True)
+    description = models.TextField()
+    colors = models.JSONField()
+    report_text = models.TextField()
+    # Compteurs du taux de réutilisation (voir dedup.analysis_stats)
+    exact_hits = models.PositiveIntegerField(default=0)
+    perceptual_hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.description[:40]})"
+
+
+class RapportUpload(models.Model):
+    """Envoi en plusieurs morceaux d'une image de rapport (voir uploads.py)"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='rapport_uploads')
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()  # taille totale annoncée par le client
+    offset = models.BigIntegerField(default=0)  # octets déjà reçus (contigus)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
@@ -0,0 +1,10 @@
+# apps/rapport/pagination.py
+from rest_framework.pagination import CursorPagination
+
+
+class RapportCursorPagination(CursorPagination):
+    """Pagination par curseur (keyset) sur created_at, id pour départager"""
+    page_size = 24
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
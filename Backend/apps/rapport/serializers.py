@@ -1,6 +1,11 @@
 # apps/rapport/serializers.py
+from django.conf import settings
+from django.core.files import File
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import validate_image_file_extension
 from rest_framework import serializers
-from .models import Rapport
+from .models import Rapport, RapportUpload
+from .utils.thumbnails import delete_variants, srcset_map
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -20,6 +25,7 @@ class RapportSerializer(serializers.ModelSerializer):
         write_only=True,
         required=False
     )
+    picture_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Rapport
@@ -30,7 +36,66 @@ class RapportSerializer(serializers.ModelSerializer):
             'name',
             'type',
             'picture',
+            'picture_srcset',
             'result',
+            'status',
             'created_at'
         ]
-        read_only_fields = ['id', 'created_at', 'user']
\ No newline at end of file
+        read_only_fields = ['id', 'created_at', 'user', 'status']
+
+    def get_picture_srcset(self, obj):
+        return srcset_map(obj.picture, obj.picture_variants, self.context.get('request'))
+
+    def update(self, instance, validated_data):
+        # Nouvelle image : les anciennes variantes seront régénérées par le worker
+        if 'picture' in validated_data:
+            shared = Rapport.objects.filter(picture=instance.picture.name).exclude(pk=instance.pk).exists()
+            if instance.picture_variants and not shared:
+                delete_variants(instance.picture.storage, instance.picture_variants)
+            instance.picture_variants = None
+            instance.picture_sha256 = ''
+        return super().update(instance, validated_data)
+
+class RapportListSerializer(RapportSerializer):
+    """Représentation liste : sans le texte complet du rapport (voir le détail)"""
+
+    class Meta(RapportSerializer.Meta):
+        fields = [field for field in RapportSerializer.Meta.fields if field != 'result']
+
+
+class RapportUploadSerializer(serializers.ModelSerializer):
+    """Envoi par morceaux : le client PUT des morceaux d'au plus chunk_size octets"""
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = RapportUpload
+        fields = ['id', 'filename', 'size', 'offset', 'chunk_size', 'created_at']
+        read_only_fields = ['id', 'offset', 'created_at']
+
+    def get_chunk_size(self, obj):
+        return settings.RAPPORT_UPLOAD_CHUNK_SIZE
+
+    def validate_filename(self, value):
+        # Même contrôle que Rapport.picture : refusé dès l'init plutôt qu'après l'envoi complet
+        try:
+            validate_image_file_extension(File(None, name=value))
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.messages)
+        return value
+
+    def validate_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("La taille doit être positive.")
+        if value > settings.RAPPORT_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"Fichier trop volumineux (max {settings.RAPPORT_UPLOAD_MAX_SIZE} octets)."
+            )
+        return value
+
+
+class RapportUploadCompleteSerializer(serializers.Serializer):
+    """Champs du rapport créé à la fin de l'envoi"""
+    name = serializers.CharField(max_length=255)
+    type = serializers.ChoiceField(choices=Rapport.TYPE_CHOICES)
+    # Facultatif : SHA-256 calculé par le client, vérifié avant de créer le rapport
+    sha256 = serializers.RegexField(r'^[0-9a-fA-F]{64}$', required=False)
@@ -1,3 +1,379 @@
-from django.test import TestCase
+import contextlib
+import hashlib
+import io
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from . import dedup, jobs
+from .models import ImageAnalysis, Rapport, RapportUpload
+from .utils.blip_server import CaptionBatcher
+
+User = get_user_model()
+
+
+def jpeg(size):
+    buffer = io.BytesIO()
+    Image.effect_noise(size, 64).convert('RGB').save(buffer, format='JPEG', quality=95)
+    return buffer.getvalue()
+
+
+class RapportPdfTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.override = override_settings(MEDIA_ROOT=self.media.name)
+        self.override.enable()
+        self.user = User.objects.create_user('alice', password='secret-pass-123')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+
+    def tearDown(self):
+        self.override.disable()
+        self.media.cleanup()
+
+    def create_rapport(self, status='done'):
+        upload = jpeg((3000, 2000))
+        rapport = Rapport.objects.create(
+            user=self.user, name='tableau', type='analyse', status=status, result='Rapport\ntexte',
+            picture=SimpleUploadedFile('tableau.jpg', upload, content_type='image/jpeg'),
+        )
+        return rapport, len(upload)
+
+    def test_pdf_embeds_a_downsampled_preview(self):
+        rapport, upload_size = self.create_rapport()
+        response = self.client.get(f'/api/rapport/rapports/{rapport.pk}/pdf/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertTrue(response.content.startswith(b'%PDF'))
+        self.assertLess(len(response.content), upload_size / 4)
+
+    def test_pdf_not_ready(self):
+        rapport, _ = self.create_rapport(status='pending')
+        response = self.client.get(f'/api/rapport/rapports/{rapport.pk}/pdf/')
+        self.assertEqual(response.status_code, 409)
+
+
+@override_settings(RAPPORT_JOB_MAX_ATTEMPTS=3, RAPPORT_JOB_RETRY_DELAY=30)
+class RapportJobQueueTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('alice')
+
+    def add(self, name):
+        return Rapport.objects.create(user=self.user, name=name, type='analyse', picture=f'rapports/images/{name}.jpg')
+
+    def test_claims_oldest_pending_job(self):
+        first, second = self.add('a'), self.add('b')
+        claimed = jobs.claim_next_job()
+        self.assertEqual(claimed.pk, first.pk)
+        self.assertEqual((claimed.status, claimed.attempts), ('running', 1))
+        self.assertEqual(jobs.claim_next_job().pk, second.pk)
+        self.assertIsNone(jobs.claim_next_job())
+
+    def test_failure_requeues_with_backoff(self):
+        self.add('a')
+        rapport = jobs.claim_next_job()
+        jobs.fail_job(rapport, RuntimeError('BLIP indisponible'))
+        rapport.refresh_from_db()
+        self.assertEqual(rapport.status, 'pending')
+        self.assertEqual(rapport.error, 'BLIP indisponible')
+        self.assertGreater(rapport.retry_after, timezone.now() + timedelta(seconds=25))
+
+        # Pas de nouvel essai immédiat
+        self.assertIsNone(jobs.claim_next_job())
+        later = timezone.now() + timedelta(seconds=31)
+        with mock.patch('apps.rapport.jobs.timezone.now', return_value=later):
+            self.assertEqual(jobs.claim_next_job().attempts, 2)
+
+    def test_backoff_doubles(self):
+        self.assertEqual(jobs.retry_delay(1), timedelta(seconds=30))
+        self.assertEqual(jobs.retry_delay(2), timedelta(seconds=60))
+        with override_settings(RAPPORT_JOB_RETRY_MAX_DELAY=45):
+            self.assertEqual(jobs.retry_delay(3), timedelta(seconds=45))
+
+    def test_marked_failed_after_max_attempts(self):
+        rapport = self.add('a')
+        Rapport.objects.filter(pk=rapport.pk).update(attempts=2)
+        rapport = jobs.claim_next_job()
+        self.assertEqual(rapport.attempts, 3)
+        jobs.fail_job(rapport, RuntimeError('toujours en panne'))
+        rapport.refresh_from_db()
+        self.assertEqual(rapport.status, 'failed')
+        self.assertIsNone(rapport.retry_after)
+        self.assertIsNone(jobs.claim_next_job())
+
+    def test_two_workers_never_claim_the_same_job(self):
+        rapport = self.add('a')
+        # Les deux workers lisent la même liste de candidats avant de réserver
+        candidates = jobs.pending_candidates(timezone.now())
+        with mock.patch('apps.rapport.jobs.pending_candidates', return_value=candidates):
+            first = jobs.claim_next_job()
+            second = jobs.claim_next_job()
+        self.assertEqual(first.pk, rapport.pk)
+        self.assertIsNone(second)
+        rapport.refresh_from_db()
+        self.assertEqual(rapport.attempts, 1)
+
+
+class PerceptualReuseTests(TestCase):
+    """Une image de même structure mais d'autres couleurs ne réutilise pas l'analyse"""
+
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.override = override_settings(MEDIA_ROOT=self.media.name)
+        self.override.enable()
+        self.user = User.objects.create_user('alice')
+
+    def tearDown(self):
+        self.override.disable()
+        self.media.cleanup()
+
+    def image(self, color, quality=90):
+        buffer = io.BytesIO()
+        Image.new('RGB', (400, 300), color).save(buffer, format='JPEG', quality=quality)
+        return buffer.getvalue()
+
+    def process(self, name, content):
+        rapport = Rapport.objects.create(
+            user=self.user, name=name, type='analyse',
+            picture=SimpleUploadedFile(f'{name}.jpg', content, content_type='image/jpeg'),
+        )
+        with mock.patch('apps.rapport.utils.image_analysis.describe_image', return_value=f'a {name} canvas') as describe, \
+                contextlib.redirect_stdout(io.StringIO()):
+            jobs.generate_report(rapport)
+        return rapport, describe.called
+
+    def test_same_hash_different_colors_is_not_reused(self):
+        red, blue = self.image((220, 30, 30)), self.image((30, 30, 220))
+        self.assertEqual(dedup.perceptual_hash(Image.open(io.BytesIO(red))),
+                         dedup.perceptual_hash(Image.open(io.BytesIO(blue))))
+
+        self.process('red', red)
+        rapport, described = self.process('blue', blue)
+        self.assertTrue(described)
+        self.assertIn('a blue canvas', rapport.result)
+        self.assertEqual(ImageAnalysis.objects.count(), 2)
+        self.assertEqual(dedup.analysis_stats()['perceptual_hits'], 0)
+        blue_colors = ImageAnalysis.objects.get(sha256=rapport.picture_sha256).colors
+        self.assertGreater(max(c[2] for c in blue_colors), 150)
+
+    def test_reencoded_image_is_reused(self):
+        self.process('red', self.image((220, 30, 30), quality=95))
+        rapport, described = self.process('copy', self.image((220, 30, 30), quality=60))
+        self.assertFalse(described)
+        self.assertIn('a red canvas', rapport.result)
+        self.assertEqual(dedup.analysis_stats()['perceptual_hits'], 1)
+
+
+class RapportDeletedDuringJobTests(TestCase):
+    """Un rapport supprimé pendant sa génération ne doit pas arrêter le worker"""
+
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.override = override_settings(MEDIA_ROOT=self.media.name)
+        self.override.enable()
+        self.user = User.objects.create_user('alice')
+        self.rapport = Rapport.objects.create(
+            user=self.user, name='tableau', type='analyse',
+            picture=SimpleUploadedFile('tableau.jpg', jpeg((64, 48)), content_type='image/jpeg'),
+        )
+
+    def tearDown(self):
+        self.override.disable()
+        self.media.cleanup()
+
+    def run_job(self, describe):
+        with mock.patch('apps.rapport.utils.image_analysis.describe_image', side_effect=describe), \
+                contextlib.redirect_stdout(io.StringIO()) as output:
+            self.assertTrue(jobs.run_next_job())
+        return output.getvalue()
+
+    def delete_rapport(self):
+        Rapport.objects.filter(pk=self.rapport.pk).delete()
+
+    def test_deleted_before_result_is_saved(self):
+        def describe(*args, **kwargs):
+            self.delete_rapport()
+            return 'a painting'
+        self.assertIn('supprimé', self.run_job(describe))
+        self.assertFalse(Rapport.objects.exists())
+        self.assertFalse(jobs.run_next_job())
+
+    def test_deleted_then_failing(self):
+        def describe(*args, **kwargs):
+            self.delete_rapport()
+            raise RuntimeError('BLIP indisponible')
+        self.assertIn('BLIP indisponible', self.run_job(describe))
+        self.assertFalse(Rapport.objects.exists())
+
+
+class RapportChunkedUploadTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.override = override_settings(
+            MEDIA_ROOT=self.media.name, RAPPORT_UPLOAD_DIR=f'{self.media.name}/uploads', RAPPORT_UPLOAD_CHUNK_SIZE=4096,
+        )
+        self.override.enable()
+        self.user = User.objects.create_user('alice', password='secret-pass-123')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        self.content = jpeg((120, 90))
+
+    def tearDown(self):
+        self.override.disable()
+        self.media.cleanup()
+
+    def init(self, filename='tableau.jpg', size=None):
+        return self.client.post('/api/rapport/uploads/', {'filename': filename, 'size': size or len(self.content)},
+                                format='json')
+
+    def put(self, upload_id, start, chunk):
+        return self.client.put(
+            f'/api/rapport/uploads/{upload_id}/', chunk, content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes {start}-{start + len(chunk) - 1}/{len(self.content)}',
+        )
+
+    def send(self, upload_id, content):
+        for start in range(0, len(content), 4096):
+            self.assertEqual(self.put(upload_id, start, content[start:start + 4096]).status_code, 200)
+
+    def complete(self, upload_id, **extra):
+        return self.client.post(f'/api/rapport/uploads/{upload_id}/complete/',
+                                {'name': 'tableau', 'type': 'analyse', **extra}, format='json')
+
+    def test_init_returns_offset_and_chunk_size(self):
+        response = self.init()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['offset'], response.data['chunk_size']), (0, 4096))
+
+    def test_init_rejects_non_image_extension(self):
+        response = self.init(filename='evil.html')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('filename', response.data)
+
+    def test_put_at_wrong_offset_conflicts(self):
+        upload_id = self.init().data['id']
+        self.assertEqual(self.put(upload_id, 0, self.content[:4096]).status_code, 200)
+        response = self.put(upload_id, 8192, self.content[8192:12288])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['offset'], 4096)
+        # Reprise au bon offset
+        self.assertEqual(self.put(upload_id, 4096, self.content[4096:8192]).data['offset'], 8192)
+
+    def test_complete_creates_rapport(self):
+        upload_id = self.init().data['id']
+        self.assertEqual(self.complete(upload_id).status_code, 409)  # rien reçu
+        self.send(upload_id, self.content)
+        response = self.complete(upload_id, sha256=hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(response.status_code, 202)
+        rapport = Rapport.objects.get(pk=response.data['id'])
+        self.assertEqual(rapport.status, 'pending')
+        self.assertTrue(rapport.picture.name.endswith('.jpg'))
+        with rapport.picture.open('rb') as f:
+            self.assertEqual(f.read(), self.content)
+        self.assertFalse(RapportUpload.objects.exists())
+
+    def test_stored_extension_follows_detected_format(self):
+        upload_id = self.init(filename='tableau.png').data['id']
+        self.send(upload_id, self.content)
+        response = self.complete(upload_id)
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(Rapport.objects.get(pk=response.data['id']).picture.name.endswith('.jpeg'))
+
+    def test_complete_rejects_non_image_content(self):
+        self.content = b'<html><script>alert(1)</script></html>'
+        upload_id = self.init(filename='tableau.png').data['id']
+        self.send(upload_id, self.content)
+        self.assertEqual(self.complete(upload_id).status_code, 400)
+        self.assertFalse(Rapport.objects.exists())
+
+
+class CaptionBatcherTests(TestCase):
+    def setUp(self):
+        self.batches = []
+        self.release = threading.Event()
+
+    def caption_batch(self, images):
+        self.batches.append(list(images))
+        # Le premier lot bloque : les demandes suivantes s'accumulent dans la file
+        self.release.wait(5)
+        if 'panne' in images:
+            raise RuntimeError('CUDA out of memory')
+        return [f'caption {image}' for image in images]
+
+    def test_queued_requests_are_flushed_by_max_batch_size(self):
+        batcher = CaptionBatcher(self.caption_batch, max_batch_size=2)
+        first = batcher.submit('a')
+        while not self.batches:
+            time.sleep(0.001)
+        futures = [batcher.submit(image) for image in 'bcdef']
+        self.release.set()
+        self.assertEqual(first.result(5), 'caption a')
+        self.assertEqual([f.result(5) for f in futures], [f'caption {image}' for image in 'bcdef'])
+        self.assertEqual(self.batches, [['a'], ['b', 'c'], ['d', 'e'], ['f']])
+
+    def test_max_wait_groups_requests_arriving_later(self):
+        self.release.set()
+        batcher = CaptionBatcher(self.caption_batch, max_batch_size=8, max_wait=0.5)
+        first = batcher.submit('a')
+        time.sleep(0.05)
+        second = batcher.submit('b')
+        self.assertEqual((first.result(5), second.result(5)), ('caption a', 'caption b'))
+        self.assertEqual(self.batches, [['a', 'b']])
+
+    def test_lone_request_is_not_delayed_by_default(self):
+        self.release.set()
+        batcher = CaptionBatcher(self.caption_batch)
+        start = time.monotonic()
+        self.assertEqual(batcher.caption('a'), 'caption a')
+        self.assertLess(time.monotonic() - start, 0.25)
+
+    def test_batch_error_reaches_every_waiter(self):
+        batcher = CaptionBatcher(self.caption_batch, max_batch_size=8)
+        first = batcher.submit('a')
+        while not self.batches:
+            time.sleep(0.001)
+        failing = [batcher.submit(image) for image in ('b', 'panne', 'c')]
+        self.release.set()
+        self.assertEqual(first.result(5), 'caption a')
+        for future in failing:
+            with self.assertRaisesRegex(RuntimeError, 'CUDA out of memory'):
+                future.result(5)
+        # Le thread du batcher survit à l'erreur
+        self.assertEqual(batcher.caption('d'), 'caption d')
+
+
+@override_settings(BLIP_SERVER_SOCKET='/nonexistent/blip.sock')
+class BlipServerFallbackTests(TestCase):
+    """Serveur BLIP injoignable : pas de modèle chargé dans le processus sans BLIP_LOCAL_FALLBACK"""
+
+    def setUp(self):
+        from .utils import image_analysis
+
+        self.image_analysis = image_analysis
+        patcher = mock.patch.object(image_analysis, 'caption_image', return_value='local caption')
+        self.local = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.image = io.BytesIO(jpeg((64, 48)))
+
+    @override_settings(BLIP_LOCAL_FALLBACK=False)
+    def test_unreachable_server_raises_by_default(self):
+        with self.assertLogs('apps.rapport', level='WARNING') as logs, self.assertRaises(OSError):
+            self.image_analysis.describe_image(self.image)
+        self.assertFalse(self.local.called)
+        self.assertIn('BLIP_LOCAL_FALLBACK', logs.output[0])
+
+    @override_settings(BLIP_LOCAL_FALLBACK=True)
+    def test_local_fallback_is_opt_in(self):
+        with self.assertLogs('apps.rapport', level='WARNING'):
+            self.assertEqual(self.image_analysis.describe_image(self.image), 'local caption')
+        self.assertTrue(self.local.called)
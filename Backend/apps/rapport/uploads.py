@@ -0,0 +1,137 @@
+# apps/rapport/uploads.py
+# Envoi d'images par morceaux (init / PUT chunk / complete) :
+# chaque morceau est écrit directement dans un fichier partiel, sans passer
+# par les upload handlers de Django, et le SHA-256 est calculé au fil de l'eau.
+import hashlib
+import os
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+from PIL import Image
+
+from .models import RapportUpload
+
+STREAM_BLOCK_SIZE = 64 * 1024
+
+# Hash en cours par envoi : {upload_id: (offset, hasher)}. Propre au processus ;
+# si un morceau arrive sur un autre worker, le hash est recalculé depuis le disque.
+_hashers = {}
+_lock = threading.Lock()
+
+
+class ChunkOffsetError(Exception):
+    """Le morceau ne commence pas là où l'envoi s'est arrêté"""
+
+
+class AssembledFile(File):
+    """
+    Fichier partiel terminé. `temporary_file_path` permet à FileSystemStorage
+    de le déplacer au lieu de le recopier.
+    """
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def part_path(upload):
+    return os.path.join(settings.RAPPORT_UPLOAD_DIR, f"{upload.pk}.part")
+
+
+def write_chunk(upload, start, stream, length):
+    """
+    Écrit `length` octets lus depuis `stream` à la position `start`.
+    `upload` doit être verrouillé (select_for_update) par l'appelant.
+    Retourne le nouvel offset (inférieur à start + length si le client a coupé).
+    """
+    if start != upload.offset:
+        raise ChunkOffsetError(f"offset attendu {upload.offset}, reçu {start}")
+
+    os.makedirs(settings.RAPPORT_UPLOAD_DIR, exist_ok=True)
+    path = part_path(upload)
+    with _lock:
+        offset, hasher = _hashers.pop(upload.pk, (None, None))
+    if offset != start:
+        # Premier morceau : nouveau hash ; sinon, recalcul dans content_hash()
+        hasher = hashlib.sha256() if start == 0 else None
+
+    written = 0
+    with open(path, 'r+b' if os.path.exists(path) else 'wb') as f:
+        # Un morceau précédent interrompu a pu laisser des octets en trop
+        f.truncate(start)
+        f.seek(start)
+        while written < length:
+            block = stream.read(min(STREAM_BLOCK_SIZE, length - written))
+            if not block:
+                break
+            f.write(block)
+            if hasher is not None:
+                hasher.update(block)
+            written += len(block)
+
+    if hasher is not None:
+        with _lock:
+            _hashers[upload.pk] = (start + written, hasher)
+
+    upload.offset = start + written
+    upload.save(update_fields=['offset', 'updated_at'])
+    return upload.offset
+
+
+def content_hash(upload):
+    """SHA-256 du fichier complet (recalculé depuis le disque si le hash courant est perdu)"""
+    with _lock:
+        offset, hasher = _hashers.get(upload.pk, (None, None))
+    if offset == upload.offset and hasher is not None:
+        return hasher.hexdigest()
+
+    hasher = hashlib.sha256()
+    with open(part_path(upload), 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def discard(upload):
+    """Supprime le fichier partiel et l'envoi"""
+    with _lock:
+        _hashers.pop(upload.pk, None)
+    try:
+        os.remove(part_path(upload))
+    except FileNotFoundError:
+        pass
+    upload.delete()
+
+
+def picture_name(filename, image_format):
+    """
+    Nom du fichier stocké : extension du client si elle correspond au format détecté
+    par Pillow, sinon celle du format (evil.html -> evil.png). Le fichier est servi
+    tel quel depuis MEDIA_URL : son extension décide du Content-Type.
+    """
+    stem, extension = os.path.splitext(os.path.basename(filename))
+    if Image.registered_extensions().get(extension.lower()) != image_format:
+        extension = f".{image_format.lower()}"
+    return f"{stem or 'image'}{extension}"
+
+
+def attach_to_rapport(upload, rapport, image_format, sha256=''):
+    """Déplace le fichier assemblé (image au format `image_format`) dans rapport.picture puis supprime l'envoi"""
+    # Hash déjà calculé pendant l'envoi : le worker n'a pas à relire le fichier
+    rapport.picture_sha256 = sha256
+    with open(part_path(upload), 'rb') as f:
+        rapport.picture.save(picture_name(upload.filename, image_format), AssembledFile(f), save=False)
+    rapport.save()
+    discard(upload)
+    return rapport
+
+
+def purge_stale_uploads():
+    """Envois non terminés depuis RAPPORT_UPLOAD_EXPIRY secondes"""
+    limit = timezone.now() - timedelta(seconds=settings.RAPPORT_UPLOAD_EXPIRY)
+    stale = list(RapportUpload.objects.filter(updated_at__lt=limit))
+    for upload in stale:
+        discard(upload)
+    return len(stale)
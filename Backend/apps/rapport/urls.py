@@ -1,11 +1,25 @@
 # apps/rapport/urls.py
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import RapportViewSet
+from . import async_views
+from .views import (
+    AnalysisCacheStatsView,
+    RapportUploadCompleteView,
+    RapportUploadCreateView,
+    RapportUploadDetailView,
+    RapportViewSet,
+)
 
 router = DefaultRouter()
 router.register(r'rapports', RapportViewSet, basename='rapport')
 
 urlpatterns = [
     path('', include(router.urls)),
+    # Variantes async (ASGI) de la liste / du détail
+    path('async/rapports/', async_views.rapport_list, name='rapport-list-async'),
+    path('async/rapports/<int:pk>/', async_views.rapport_detail, name='rapport-detail-async'),
+    path('analysis-cache/', AnalysisCacheStatsView.as_view(), name='rapport-analysis-cache'),
+    path('uploads/', RapportUploadCreateView.as_view(), name='rapport-upload-create'),
+    path('uploads/<uuid:pk>/', RapportUploadDetailView.as_view(), name='rapport-upload-detail'),
+    path('uploads/<uuid:pk>/complete/', RapportUploadCompleteView.as_view(), name='rapport-upload-complete'),
 ]
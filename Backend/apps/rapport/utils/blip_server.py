@@ -0,0 +1,151 @@
+import io
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import Listener, Client
+
+from django.conf import settings
+
+
+# === Shared BLIP inference server ===
+# One long-lived process (manage.py run_blip_server) loads BLIP once and
+# serves captions to every web worker over a local Unix socket.
+
+def blip_server_address():
+    return getattr(settings, 'BLIP_SERVER_SOCKET', '')
+
+
+def blip_server_enabled():
+    return bool(blip_server_address())
+
+
+def _authkey():
+    return settings.SECRET_KEY.encode("utf-8")
+
+
+# --- Client side (web workers) ---
+def describe_image_remote(image):
+    """
+    Same contract as image_analysis.describe_image, served by the BLIP server.
+    `image` is a file path or encoded image bytes (e.g. ImageContext.preview_jpeg).
+    Raises OSError if the server is not reachable, RuntimeError if it failed.
+    """
+    with Client(blip_server_address(), family="AF_UNIX", authkey=_authkey()) as conn:
+        if isinstance(image, bytes):
+            conn.send(("describe_bytes", image))
+        else:
+            conn.send(("describe", str(image)))
+        status, payload = conn.recv()
+    if status != "ok":
+        raise RuntimeError(f"BLIP server error: {payload}")
+    return payload
+
+
+# --- Micro-batching ---
+class CaptionBatcher:
+    """
+    Collects caption requests from concurrent callers for up to `max_wait`
+    seconds (or `max_batch_size` images), captions them with a single
+    `caption_batch(images)` call and hands each caller its own result.
+    With max_wait=0 (default) nothing waits: only requests already queued
+    while the previous batch ran are grouped. A single rapport worker sends
+    one caption at a time, so batching pays off only with several clients.
+    """
+
+    def __init__(self, caption_batch, max_batch_size=8, max_wait=0.0):
+        self.caption_batch = caption_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.pending = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, image):
+        future = Future()
+        self.pending.put((image, future))
+        return future
+
+    def caption(self, image):
+        return self.submit(image).result()
+
+    def _next_batch(self):
+        batch = [self.pending.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self.pending.get(timeout=remaining))
+                else:
+                    batch.append(self.pending.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                captions = self.caption_batch([image for image, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), caption in zip(batch, captions):
+                future.set_result(caption)
+
+
+# --- Server side ---
+class BlipServer:
+    def __init__(self, address=None):
+        self.address = address or blip_server_address()
+        self.batcher = None
+
+    def describe(self, image):
+        from PIL import Image
+
+        # Decoding runs in the client thread, generate() in the batcher thread
+        if isinstance(image, bytes):
+            image = io.BytesIO(image)
+        return self.batcher.caption(Image.open(image).convert("RGB"))
+
+    def handle(self, conn):
+        with conn:
+            while True:
+                try:
+                    command, argument = conn.recv()
+                except EOFError:
+                    return
+                try:
+                    if command not in ("describe", "describe_bytes"):
+                        raise ValueError(f"unknown command {command!r}")
+                    conn.send(("ok", self.describe(argument)))
+                except Exception as e:
+                    conn.send(("error", str(e)))
+
+    def serve_forever(self):
+        from .image_analysis import caption_images, warmup
+
+        print("🔄 Loading BLIP model...")
+        warmup()
+        self.batcher = CaptionBatcher(
+            caption_images,
+            max_batch_size=getattr(settings, 'BLIP_BATCH_SIZE', 8),
+            max_wait=getattr(settings, 'BLIP_BATCH_WAIT_MS', 0) / 1000,
+        )
+
+        # Remove a stale socket left by a previous run
+        if os.path.exists(self.address):
+            os.unlink(self.address)
+
+        with Listener(self.address, family="AF_UNIX", authkey=_authkey()) as listener:
+            print(f"✅ BLIP server listening on {self.address}")
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    print(f"⚠️ Rejected BLIP client: {e}")
+                    continue
+                threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
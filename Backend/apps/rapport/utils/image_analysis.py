@@ -1,33 +1,138 @@
-from transformers import BlipProcessor, BlipForConditionalGeneration
 from PIL import Image
 import numpy as np
-from sklearn.cluster import KMeans
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image as RLImage, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors as pdf_colors
 import os
 import io
+import logging
+
+# transformers/torch, sklearn and reportlab are imported inside the functions that
+# use them: importing this module stays cheap (manage.py, migrations, tests).
+# Long-lived processes call warmup() to pay the cost up front.
+
+from django.conf import settings
+
+from apps.monitoring.metrics import ANALYSIS_STAGE_SECONDS
+from .blip_server import blip_server_enabled, describe_image_remote
+
+BLIP_MODEL_NAME = "Salesforce/blip-image-captioning-base"
+_blip = None
+logger = logging.getLogger(__name__)
+
+# === Decoded image shared by every analysis stage ===
+ANALYSIS_MAX_SIZE = 1024   # working copy used for captioning and palette
+PREVIEW_MAX_SIZE = 800     # JPEG preview sent to the BLIP server
+
+class ImageContext:
+    """
+    Opens and decodes the uploaded file once. Keeps a bounded RGB copy
+    (`image`, `pixels`) and a compressed JPEG preview (`preview_jpeg`).
+    """
+
+    def __init__(self, image_path, max_size=ANALYSIS_MAX_SIZE):
+        self.path = image_path
+        with Image.open(image_path) as image:
+            self.original_size = image.size
+            # JPEG: decode directly at reduced scale
+            image.draft("RGB", (max_size, max_size))
+            image = image.convert("RGB")
+        image.thumbnail((max_size, max_size))
+        self.image = image
+        self._preview_jpeg = None
+
+    @property
+    def pixels(self):
+        return np.asarray(self.image)
+
+    def thumbnail(self, max_size):
+        image = self.image.copy()
+        image.thumbnail((max_size, max_size))
+        return image
+
+    @property
+    def preview_jpeg(self):
+        if self._preview_jpeg is None:
+            buffer = io.BytesIO()
+            self.thumbnail(PREVIEW_MAX_SIZE).save(buffer, format="JPEG", quality=80, optimize=True)
+            self._preview_jpeg = buffer.getvalue()
+        return self._preview_jpeg
+
+def load_image_context(image):
+    """Accept either an image path or an already decoded ImageContext"""
+    if isinstance(image, ImageContext):
+        return image
+    return ImageContext(image)
 
 # === Load BLIP model (first time online, then offline) ===
-processor = BlipProcessor.from_pretrained("Salesforce/blip-image-captioning-base")
-model = BlipForConditionalGeneration.from_pretrained("Salesforce/blip-image-captioning-base")
+# Loaded on first use only: with a BLIP server running, web workers never load it
+def load_blip_model():
+    global _blip
+    if _blip is None:
+        from transformers import BlipProcessor, BlipForConditionalGeneration
+        processor = BlipProcessor.from_pretrained(BLIP_MODEL_NAME)
+        model = BlipForConditionalGeneration.from_pretrained(BLIP_MODEL_NAME)
+        _blip = (processor, model)
+    return _blip
 
-# --- Describe the image ---
-def describe_image(image_path):
-    image = Image.open(image_path).convert("RGB")
-    inputs = processor(images=image, return_tensors="pt")
+# --- Caption a batch of decoded RGB images with one generate() call ---
+def caption_images(images):
+    processor, model = load_blip_model()
+    # The processor resizes every image to the model input size, so they stack into one tensor
+    inputs = processor(images=list(images), return_tensors="pt")
     out = model.generate(**inputs, max_new_tokens=60)
-    description = processor.decode(out[0], skip_special_tokens=True)
-    return description
+    return processor.batch_decode(out, skip_special_tokens=True)
+
+# --- Caption a decoded RGB image with the local model ---
+def caption_image(image):
+    return caption_images([image])[0]
+
+# --- Describe the image (path or ImageContext) ---
+def describe_image(image_path):
+    if blip_server_enabled():
+        # Send the small preview rather than making the server decode the original
+        remote_image = image_path.preview_jpeg if isinstance(image_path, ImageContext) else image_path
+        try:
+            return describe_image_remote(remote_image)
+        except OSError as e:
+            # Loading BLIP here is what the server avoids: only when explicitly allowed
+            if not getattr(settings, 'BLIP_LOCAL_FALLBACK', False):
+                logger.warning("BLIP server unreachable (%s); set BLIP_LOCAL_FALLBACK to caption locally", e)
+                raise
+            logger.warning("BLIP server unreachable (%s), loading the local model (BLIP_LOCAL_FALLBACK)", e)
+    context = load_image_context(image_path)
+    return caption_image(context.image)
 
 # --- Extract main colors using KMeans ---
-def extract_colors(image_path, num_colors=5):
-    image = Image.open(image_path).convert("RGB")
-    img_np = np.array(image)
-    img_np = img_np.reshape(-1, 3)
-    kmeans = KMeans(n_clusters=num_colors, random_state=0).fit(img_np)
+# fast=True (default): bounded thumbnail + seeded pixel sample + MiniBatchKMeans,
+# fast=False: full-resolution KMeans (reference, seconds on large scans)
+PALETTE_THUMBNAIL_SIZE = 256
+PALETTE_SAMPLE_SIZE = 20000
+
+def extract_colors(image_path, num_colors=5, fast=True):
+    from sklearn.cluster import KMeans, MiniBatchKMeans
+
+    if isinstance(image_path, ImageContext):
+        image = image_path.image
+    else:
+        image = Image.open(image_path)
+    if not fast:
+        img_np = np.array(image.convert("RGB"))
+        img_np = img_np.reshape(-1, 3)
+        kmeans = KMeans(n_clusters=num_colors, random_state=0).fit(img_np)
+        return kmeans.cluster_centers_.astype(int)
+
+    if isinstance(image_path, ImageContext):
+        image = image_path.thumbnail(PALETTE_THUMBNAIL_SIZE)
+    else:
+        # JPEG: let the decoder downscale directly (much cheaper than a full decode)
+        image.draft("RGB", (PALETTE_THUMBNAIL_SIZE, PALETTE_THUMBNAIL_SIZE))
+        image = image.convert("RGB")
+        image.thumbnail((PALETTE_THUMBNAIL_SIZE, PALETTE_THUMBNAIL_SIZE))
+    img_np = np.asarray(image).reshape(-1, 3)
+
+    rng = np.random.default_rng(0)
+    if len(img_np) > PALETTE_SAMPLE_SIZE:
+        img_np = img_np[rng.choice(len(img_np), PALETTE_SAMPLE_SIZE, replace=False)]
+
+    kmeans = MiniBatchKMeans(n_clusters=num_colors, random_state=0, n_init=3, batch_size=2048).fit(img_np)
     colors = kmeans.cluster_centers_.astype(int)
     return colors
 
@@ -71,6 +176,10 @@ def save_txt_report(report, image_path):
 
 # --- Generate color boxes for the PDF ---
 def make_color_table(colors):
+    from reportlab.lib.units import cm
+    from reportlab.platypus import Table, TableStyle
+    from reportlab.lib import colors as pdf_colors
+
     data = []
     for c in colors:
         hex_color = f"#{c[0]:02x}{c[1]:02x}{c[2]:02x}"
@@ -92,11 +201,36 @@ def make_color_table(colors):
     table.setStyle(style)
     return table
 
-# --- Save PDF report with image and colors ---
-def save_pdf_report(image_path, report_text, colors):
-    base = os.path.splitext(image_path)[0]
-    pdf_path = base + "_report.pdf"
-    doc = SimpleDocTemplate(pdf_path, pagesize=A4)
+# --- Preview embedded in the PDF ---
+# Fitted in the print box at PDF_IMAGE_DPI: a multi-MB scan becomes a ~100 KB JPEG
+PDF_IMAGE_BOX_CM = (10, 7)
+PDF_IMAGE_DPI = 150
+
+def pdf_preview(image, box, dpi=PDF_IMAGE_DPI):
+    """
+    JPEG bytes of `image` (path or ImageContext) fitted in `box` (width, height in points),
+    and the (width, height) in points to draw it at, keeping the aspect ratio.
+    """
+    context = load_image_context(image)
+    width, height = context.original_size
+    scale = min(box[0] / width, box[1] / height)
+    draw_size = (width * scale, height * scale)
+
+    preview = context.image.copy()
+    preview.thumbnail((round(draw_size[0] / 72 * dpi), round(draw_size[1] / 72 * dpi)))
+    buffer = io.BytesIO()
+    preview.save(buffer, format="JPEG", quality=80, optimize=True)
+    return buffer.getvalue(), draw_size
+
+# --- Build the PDF report with image and colors ---
+# output: file path or binary file-like object (HTTP response, storage file, BytesIO)
+def write_pdf_report(output, report_text, colors, image):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image as RLImage
+    from reportlab.lib.styles import getSampleStyleSheet
+
+    doc = SimpleDocTemplate(output, pagesize=A4)
     styles = getSampleStyleSheet()
     story = []
 
@@ -105,8 +239,9 @@ def save_pdf_report(image_path, report_text, colors):
     story.append(Spacer(1, 12))
 
     # Insert image preview
-    img = RLImage(image_path, width=10*cm, height=7*cm)
-    story.append(img)
+    box = (PDF_IMAGE_BOX_CM[0] * cm, PDF_IMAGE_BOX_CM[1] * cm)
+    preview, (width, height) = pdf_preview(image, box)
+    story.append(RLImage(io.BytesIO(preview), width=width, height=height))
     story.append(Spacer(1, 12))
 
     # Report text
@@ -118,17 +253,42 @@ def save_pdf_report(image_path, report_text, colors):
     story.append(make_color_table(colors))
 
     doc.build(story)
-    print(f"✅ PDF report saved as: {pdf_path}")
+
+# --- Preload the heavy stack (worker / server start-up) ---
+def warmup(load_model=True):
+    """
+    Import sklearn and reportlab, and load BLIP unless load_model is False
+    (e.g. web workers that send captions to the BLIP server).
+    """
+    import sklearn.cluster  # noqa: F401
+    import reportlab.platypus  # noqa: F401
+    if load_model:
+        load_blip_model()
 
 # --- Main function ---
-def analyze_image(image_path, save_as_pdf=True):
+# cached: {"description", "colors"} of an identical image analyzed before (skips BLIP and KMeans)
+# pdf_output: where to write the PDF report (path or file-like), None = no PDF
+# Each stage is timed in artgallery_analysis_stage_duration_seconds{stage}
+def analyze_image(image_path, pdf_output=None, cached=None):
+    stage = ANALYSIS_STAGE_SECONDS.time
     print("🔍 Analyzing image...")
-    desc = describe_image(image_path)
-    colors = extract_colors(image_path)
-    report = generate_text_report(desc, colors)
-    save_txt_report(report, image_path)
-    if save_as_pdf:
-        save_pdf_report(image_path, report, colors)
+    with stage(stage="decode"):
+        context = load_image_context(image_path)
+    if cached:
+        desc = cached["description"]
+        colors = np.array(cached["colors"], dtype=int)
+    else:
+        with stage(stage="caption"):
+            desc = describe_image(context)
+        with stage(stage="palette"):
+            colors = extract_colors(context)
+    with stage(stage="text_report"):
+        report = generate_text_report(desc, colors)
+    with stage(stage="txt_write"):
+        save_txt_report(report, context.path)
+    if pdf_output is not None:
+        with stage(stage="pdf_build"):
+            write_pdf_report(pdf_output, report, colors, context)
     print("\n🧾 Analysis Complete!\n")
     print(report)
     return {
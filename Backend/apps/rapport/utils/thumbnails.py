@@ -0,0 +1,85 @@
+import io
+import os
+
+from django.core.files.base import ContentFile
+from PIL import Image, features
+
+# === Responsive image variants (Rapport.picture, User.profile_picture) ===
+# Generated by the background worker and stored next to the original upload:
+#   rapports/images/tableau.jpg -> rapports/images/tableau_w320.webp, ..._w640.avif
+# The list of generated files is kept on the model (JSON), so serializers build
+# srcset strings without touching the storage.
+
+THUMBNAIL_WIDTHS = (320, 640, 1280)
+THUMBNAIL_QUALITY = 80
+
+
+def thumbnail_formats():
+    # AVIF only if this Pillow build has the encoder; listed best first
+    formats = ['webp']
+    if features.check('avif'):
+        formats.insert(0, 'avif')
+    return formats
+
+
+def variant_name(name, width, fmt):
+    return f"{os.path.splitext(name)[0]}_w{width}.{fmt}"
+
+
+def generate_variants(field_file):
+    """
+    Decode the upload once and write one file per (format, width).
+    Returns {'source': name, '<fmt>': {'<width>': name, ...}, ...}.
+    """
+    storage = field_file.storage
+    largest = max(THUMBNAIL_WIDTHS)
+    with storage.open(field_file.name, 'rb') as f:
+        image = Image.open(f)
+        image.draft('RGB', (largest, largest))
+        image = image.convert('RGB')
+
+    # Never upscale: an image smaller than the first width gets a single variant
+    widths = [w for w in THUMBNAIL_WIDTHS if w < image.width] or [image.width]
+
+    variants = {'source': field_file.name}
+    for fmt in thumbnail_formats():
+        variants[fmt] = {}
+        for width in widths:
+            height = max(1, round(image.height * width / image.width))
+            resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+            buffer = io.BytesIO()
+            resized.save(buffer, format=fmt.upper(), quality=THUMBNAIL_QUALITY)
+
+            name = variant_name(field_file.name, width, fmt)
+            if storage.exists(name):
+                storage.delete(name)
+            variants[fmt][str(width)] = storage.save(name, ContentFile(buffer.getvalue()))
+    return variants
+
+
+def delete_variants(storage, variants):
+    for fmt in thumbnail_formats():
+        for name in (variants or {}).get(fmt, {}).values():
+            storage.delete(name)
+
+
+def srcset_map(field_file, variants, request=None):
+    """
+    {'avif': 'url 320w, url 640w', 'webp': '...'} for the current file,
+    {} while the variants are not generated yet (or belong to a replaced file).
+    """
+    if not field_file or not variants or variants.get('source') != field_file.name:
+        return {}
+
+    storage = field_file.storage
+    srcsets = {}
+    for fmt in thumbnail_formats():
+        entries = []
+        for width, name in sorted(variants.get(fmt, {}).items(), key=lambda item: int(item[0])):
+            url = storage.url(name)
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            entries.append(f"{url} {width}w")
+        if entries:
+            srcsets[fmt] = ", ".join(entries)
+    return srcsets
@@ -1,15 +1,42 @@
 # apps/rapport/views.py
-from rest_framework import viewsets, permissions, parsers
-from rest_framework.authentication import TokenAuthentication
-from .models import Rapport
-from .serializers import RapportSerializer
+import re
+
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from PIL import Image
+from rest_framework import generics, viewsets, permissions, parsers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from apps.monitoring.metrics import ANALYSIS_STAGE_SECONDS
+from apps.users.authentication import CachedTokenAuthentication
+from . import dedup, uploads
+from .models import Rapport, RapportUpload
+from .pagination import RapportCursorPagination
+from .serializers import (
+    RapportListSerializer,
+    RapportSerializer,
+    RapportUploadCompleteSerializer,
+    RapportUploadSerializer,
+)
+
+CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+|\*)$')
 
 
 class RapportViewSet(viewsets.ModelViewSet):
     serializer_class = RapportSerializer
     permission_classes = [permissions.IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
+    pagination_class = RapportCursorPagination
+
+    def get_serializer_class(self):
+        # La liste n'envoie pas le texte complet du rapport
+        if self.action == 'list':
+            return RapportListSerializer
+        return RapportSerializer
 
     def get_queryset(self):
         """
@@ -17,14 +44,166 @@ class RapportViewSet(viewsets.ModelViewSet):
         Si l'utilisateur est admin/superuser, retourne tous les rapports.
         """
         user = self.request.user
+        queryset = Rapport.objects.select_related('user')
+        if self.action == 'list':
+            queryset = queryset.defer('result', 'error')
         
         # Vérifier si l'utilisateur est admin/superuser
         if user.is_superuser or user.is_staff:
-            return Rapport.objects.all().order_by('-created_at')
+            return queryset.order_by('-created_at')
         
         # Sinon, retourner uniquement les rapports de l'utilisateur
-        return Rapport.objects.filter(user=user).order_by('-created_at')
+        return queryset.filter(user=user).order_by('-created_at')
+
+    def create(self, request, *args, **kwargs):
+        """
+        Le rapport est généré en arrière-plan (status 'pending' -> 'done'/'failed') :
+        on répond 202 immédiatement, le client interroge ensuite le détail.
+        """
+        response = super().create(request, *args, **kwargs)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return response
 
     def perform_create(self, serializer):
         """Définir automatiquement l'utilisateur lors de la création"""
-        serializer.save(user=self.request.user)
\ No newline at end of file
+        serializer.save(user=self.request.user)
+
+    @action(detail=True, methods=['get'])
+    def pdf(self, request, pk=None):
+        """
+        PDF du rapport, construit à la demande et écrit directement dans la réponse :
+        rien n'est stocké à côté de l'image, l'aperçu embarqué est réduit au cadre imprimé.
+        """
+        # Import ici pour ne pas charger reportlab / sklearn au démarrage
+        from .utils.image_analysis import ImageContext, extract_colors, write_pdf_report
+
+        rapport = self.get_object()
+        if rapport.status != 'done':
+            return Response({'error': "Le rapport n'est pas encore généré"}, status=status.HTTP_409_CONFLICT)
+
+        with rapport.picture.open('rb') as f:
+            context = ImageContext(f)
+        colors = dedup.analysis_colors(rapport.picture_sha256)
+        if colors is None:
+            # Analyse réutilisée d'une image similaire : palette non enregistrée pour ce fichier
+            colors = extract_colors(context).tolist()
+
+        response = HttpResponse(content_type='application/pdf')
+        response['Content-Disposition'] = f'attachment; filename="rapport_{rapport.pk}.pdf"'
+        with ANALYSIS_STAGE_SECONDS.time(stage='pdf_build'):
+            write_pdf_report(response, rapport.result, colors, context)
+        return response
+
+
+class AnalysisCacheStatsView(APIView):
+    """Taux de réutilisation des analyses d'images (doublons exacts et perceptuels)"""
+    permission_classes = [permissions.IsAdminUser]
+    authentication_classes = [CachedTokenAuthentication]
+
+    def get(self, request):
+        return Response(dedup.analysis_stats())
+
+
+# --- Envoi par morceaux (images volumineuses) ---
+# 1. POST uploads/                 {filename, size}      -> {id, offset, chunk_size}
+# 2. PUT  uploads/<id>/            corps brut + Content-Range: bytes <début>-<fin>/<taille>
+#    GET  uploads/<id>/            -> offset à partir duquel reprendre
+# 3. POST uploads/<id>/complete/   {name, type, sha256?} -> rapport créé (202)
+
+class RapportUploadCreateView(generics.CreateAPIView):
+    serializer_class = RapportUploadSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [CachedTokenAuthentication]
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+
+class RapportUploadDetailView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [CachedTokenAuthentication]
+
+    def get(self, request, pk):
+        upload = get_object_or_404(RapportUpload, pk=pk, user=request.user)
+        return Response(RapportUploadSerializer(upload).data)
+
+    def put(self, request, pk):
+        """Écrit un morceau ; le corps n'est jamais chargé entièrement en mémoire"""
+        match = CONTENT_RANGE_RE.match(request.META.get('HTTP_CONTENT_RANGE', ''))
+        if not match:
+            return Response({'error': "En-tête Content-Range manquant ou invalide"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        start, end, total = match.groups()
+        start, end = int(start), int(end)
+        length = end - start + 1
+        if length <= 0 or length != int(request.META.get('CONTENT_LENGTH') or 0):
+            return Response({'error': "Content-Range ne correspond pas à la taille du corps"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if length > settings.RAPPORT_UPLOAD_CHUNK_SIZE:
+            return Response({'error': f"Morceau trop gros (max {settings.RAPPORT_UPLOAD_CHUNK_SIZE} octets)"},
+                            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+        with transaction.atomic():
+            # Verrou : deux PUT simultanés sur le même envoi sont traités l'un après l'autre
+            upload = get_object_or_404(
+                RapportUpload.objects.select_for_update(), pk=pk, user=request.user
+            )
+            if (total != '*' and int(total) != upload.size) or end >= upload.size:
+                return Response({'error': "Content-Range dépasse la taille annoncée"},
+                                status=status.HTTP_400_BAD_REQUEST)
+            try:
+                offset = uploads.write_chunk(upload, start, request.stream, length)
+            except uploads.ChunkOffsetError as e:
+                return Response({'error': str(e), 'offset': upload.offset}, status=status.HTTP_409_CONFLICT)
+
+        if offset != start + length:
+            return Response({'error': "Morceau incomplet", 'offset': offset},
+                            status=status.HTTP_400_BAD_REQUEST)
+        return Response(RapportUploadSerializer(upload).data)
+
+    def delete(self, request, pk):
+        upload = get_object_or_404(RapportUpload, pk=pk, user=request.user)
+        uploads.discard(upload)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class RapportUploadCompleteView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [CachedTokenAuthentication]
+
+    def post(self, request, pk):
+        serializer = RapportUploadCompleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            upload = get_object_or_404(
+                RapportUpload.objects.select_for_update(), pk=pk, user=request.user
+            )
+            if upload.offset != upload.size:
+                return Response({'error': "Envoi incomplet", 'offset': upload.offset},
+                                status=status.HTTP_409_CONFLICT)
+
+            digest = uploads.content_hash(upload)
+            expected = serializer.validated_data.get('sha256')
+            if expected and expected.lower() != digest:
+                return Response({'error': "SHA-256 différent du fichier reçu", 'sha256': digest},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+            try:
+                with Image.open(uploads.part_path(upload)) as image:
+                    image.verify()
+                    image_format = image.format
+            except Exception:
+                uploads.discard(upload)
+                return Response({'error': "Le fichier envoyé n'est pas une image valide"},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+            rapport = Rapport(
+                user=request.user,
+                name=serializer.validated_data['name'],
+                type=serializer.validated_data['type'],
+            )
+            uploads.attach_to_rapport(upload, rapport, image_format, sha256=digest)
+
+        data = RapportSerializer(rapport, context={'request': request}).data
+        return Response(data, status=status.HTTP_202_ACCEPTED)
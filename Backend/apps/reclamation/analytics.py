@@ -0,0 +1,190 @@
+# Statistiques de sentiments pour les tableaux de bord admin.
+# ReclamationDailyStat est tenue à jour à chaque création / modification /
+# suppression (signaux ci-dessous) ; les requêtes par période ne lisent que
+# cette table : GROUP BY en base, sommes d'émotions vectorisées avec NumPy.
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .feelings import EMOTIONS
+from .models import Reclamation, ReclamationDailyStat
+
+EMOTION_NAMES = list(EMOTIONS)
+NEGATIVE_SENTIMENTS = ('Negative', 'Neutral/Negative')
+
+
+def snapshot(reclamation):
+    """Ce qui compte pour l'agrégat : (jour, cible, sentiment, émotions détectées)"""
+    return (
+        timezone.localdate(reclamation.date_creation),
+        reclamation.cible_id,
+        reclamation.sentiment_local or '',
+        tuple(sorted(reclamation.emotions_local or {})),
+    )
+
+
+def apply_changes(changes):
+    """
+    changes : paires (ancien, nouveau) de snapshots, None pour une création /
+    suppression. Chaque ligne d'agrégat touchée est verrouillée puis mise à jour.
+    """
+    deltas = defaultdict(lambda: [0, defaultdict(int)])
+    for old, new in changes:
+        for state, sign in ((old, -1), (new, 1)):
+            if state is None:
+                continue
+            day, cible_id, sentiment, emotions = state
+            delta = deltas[(day, cible_id, sentiment)]
+            delta[0] += sign
+            for emotion in emotions:
+                delta[1][emotion] += sign
+    _apply_deltas(deltas)
+
+
+def _apply_deltas(deltas):
+    """deltas : {(jour, cible, sentiment): [nombre, {émotion: nombre}]}"""
+    with transaction.atomic():
+        for (day, cible_id, sentiment), (count, emotions) in deltas.items():
+            if not count and not any(emotions.values()):
+                continue
+            stat, _ = ReclamationDailyStat.objects.select_for_update().get_or_create(
+                day=day, cible_id=cible_id, sentiment=sentiment,
+            )
+            stat.count += count
+            for emotion, value in emotions.items():
+                stat.emotions[emotion] = stat.emotions.get(emotion, 0) + value
+            stat.save(update_fields=['count', 'emotions'])
+
+
+def rebuild():
+    """Recalcule toute la table depuis les réclamations (initialisation / contrôle)"""
+    with transaction.atomic():
+        ReclamationDailyStat.objects.all().delete()
+        rows = (
+            Reclamation.objects
+            .only('date_creation', 'cible_id', 'sentiment_local', 'emotions_local')
+            .iterator(chunk_size=2000)
+        )
+        apply_changes((None, snapshot(reclamation)) for reclamation in rows)
+    return ReclamationDailyStat.objects.count()
+
+
+# --- Maintenance incrémentale ---
+@receiver(pre_save, sender=Reclamation)
+def _remember_previous(sender, instance, **kwargs):
+    instance._stat_snapshot = None
+    if instance.pk:
+        previous = (
+            Reclamation.objects
+            .filter(pk=instance.pk)
+            .only('date_creation', 'cible_id', 'sentiment_local', 'emotions_local')
+            .first()
+        )
+        if previous is not None:
+            instance._stat_snapshot = snapshot(previous)
+
+
+@receiver(post_save, sender=Reclamation)
+def _record_save(sender, instance, **kwargs):
+    old, new = getattr(instance, '_stat_snapshot', None), snapshot(instance)
+    if old != new:
+        apply_changes([(old, new)])
+
+
+@receiver(post_delete, sender=Reclamation)
+def _record_delete(sender, instance, **kwargs):
+    apply_changes([(snapshot(instance), None)])
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def _fold_deleted_cible(sender, instance, **kwargs):
+    """
+    Les réclamations d'une cible supprimée passent à cible=NULL (SET_NULL, sans signaux) :
+    ses lignes d'agrégat sont reportées sur les lignes "sans cible" du même
+    (jour, sentiment) au lieu d'en créer des doublons.
+    """
+    rows = list(ReclamationDailyStat.objects.filter(cible=instance))
+    if not rows:
+        return
+    deltas = {(row.day, None, row.sentiment): [row.count, row.emotions] for row in rows}
+    with transaction.atomic():
+        ReclamationDailyStat.objects.filter(pk__in=[row.pk for row in rows]).delete()
+        _apply_deltas(deltas)
+
+
+# --- Requêtes par période ---
+def _emotion_matrix(emotion_dicts):
+    """Lignes d'agrégat -> matrice (n, len(EMOTION_NAMES)) pour les réductions NumPy"""
+    index = {name: i for i, name in enumerate(EMOTION_NAMES)}
+    matrix = np.zeros((len(emotion_dicts), len(EMOTION_NAMES)), dtype=np.int64)
+    for row, emotions in enumerate(emotion_dicts):
+        for emotion, value in emotions.items():
+            if emotion in index:
+                matrix[row, index[emotion]] = value
+    return matrix
+
+
+def sentiment_summary(start, end, top=10):
+    """Distribution des sentiments, émotions par jour et cibles les plus visées sur [start, end]"""
+    stats = ReclamationDailyStat.objects.filter(day__gte=start, day__lte=end)
+
+    sentiments = {
+        row['sentiment'] or 'Non analysé': row['total']
+        for row in stats.values('sentiment').annotate(total=Sum('count')).order_by('-total')
+    }
+
+    # Émotions : une ligne par (jour, cible, sentiment) -> sommes par jour et totales
+    rows = list(stats.order_by('day').values_list('day', 'emotions'))
+    days = sorted({day for day, _ in rows})
+    day_index = {day: i for i, day in enumerate(days)}
+    matrix = _emotion_matrix([emotions for _, emotions in rows])
+    per_day = np.zeros((len(days), len(EMOTION_NAMES)), dtype=np.int64)
+    np.add.at(per_day, [day_index[day] for day, _ in rows], matrix)
+
+    counts_per_day = {
+        row['day']: row['total']
+        for row in stats.values('day').annotate(total=Sum('count'))
+    }
+    timeline = [
+        {
+            'day': day.isoformat(),
+            'count': counts_per_day.get(day, 0),
+            'emotions': {name: int(v) for name, v in zip(EMOTION_NAMES, per_day[i]) if v},
+        }
+        for i, day in enumerate(days)
+    ]
+
+    top_cibles = [
+        {
+            'id': row['cible'],
+            'username': row['cible__username'],
+            'count': row['total'],
+            'negative': row['negative'] or 0,
+        }
+        for row in (
+            stats.filter(cible__isnull=False)
+            .values('cible', 'cible__username')
+            .annotate(
+                total=Sum('count'),
+                negative=Sum('count', filter=Q(sentiment__in=NEGATIVE_SENTIMENTS)),
+            )
+            .order_by('-total', 'cible')[:top]
+        )
+    ]
+
+    totals = per_day.sum(axis=0)
+    return {
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'total': sum(sentiments.values()),
+        'sentiments': sentiments,
+        'emotions': {name: int(v) for name, v in zip(EMOTION_NAMES, totals) if v},
+        'timeline': timeline,
+        'top_cibles': top_cibles,
+    }
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ReclamationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.reclamation'
+
+    def ready(self):
+        # Signaux de maintenance de ReclamationDailyStat
+        import apps.reclamation.analytics  # noqa: F401
@@ -0,0 +1,66 @@
+# Variantes async (ASGI) des listes de réclamations les plus sollicitées.
+# Même contenu et même forme de réponse que ReclamationReceivedView / ReclamationSentView,
+# mais l'ORM async libère la boucle d'événements pendant les requêtes SQL :
+# un seul processus uvicorn sert de nombreux clients lents en parallèle.
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_http_methods
+
+from apps.users.async_api import apaginate, token_required
+from .feelings_cache import analyze_feelings_cached
+from .models import Reclamation
+from .pagination import ReclamationCursorPagination
+from .serializers import ReclamationSerializer
+
+
+def _serialize(rows):
+    return ReclamationSerializer(rows, many=True).data
+
+
+def _base_queryset():
+    return Reclamation.objects.select_related('auteur', 'cible')
+
+
+@require_GET
+@token_required
+async def reclamation_received(request):
+    queryset = _base_queryset().filter(cible=request.user)
+    return await apaginate(request, queryset, ReclamationCursorPagination, _serialize)
+
+
+@csrf_exempt  # authentification par jeton, pas de cookie de session
+@require_http_methods(['GET', 'POST'])
+@token_required
+async def reclamation_sent(request):
+    """GET : réclamations envoyées ; POST : nouvelle réclamation (comme ReclamationListCreateView)"""
+    if request.method == 'GET':
+        queryset = _base_queryset().filter(auteur=request.user)
+        return await apaginate(request, queryset, ReclamationCursorPagination, _serialize)
+
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({'detail': "JSON invalide."}, status=400)
+
+    serializer = ReclamationSerializer(data=data)
+    # La validation lit la base (cible_id) : hors de la boucle d'événements
+    if not await sync_to_async(serializer.is_valid)():
+        return JsonResponse(serializer.errors, status=400)
+
+    # Analyse des sentiments (CPU) dans un thread pour ne pas bloquer les autres clients
+    text = serializer.validated_data.get('contenu', '')
+    analysis = await asyncio.get_running_loop().run_in_executor(None, analyze_feelings_cached, text)
+
+    reclamation = await Reclamation.objects.acreate(
+        auteur=request.user,
+        cible=serializer.validated_data.get('cible'),
+        sujet=serializer.validated_data['sujet'],
+        contenu=text,
+        sentiment_local=analysis['sentiment'],
+        emotions_local=analysis['emotions'],
+    )
+    return JsonResponse(ReclamationSerializer(reclamation).data, status=201)
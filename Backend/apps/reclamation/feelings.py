@@ -1,233 +1,390 @@
+import hashlib
+import os
 import re
+import time
 from collections import Counter
+from itertools import islice
+from multiprocessing import Pool
+
+# === Lexicon (built once at import, shared by every call) ===
+
+# Expanded emotions with more negative keywords (English + French)
+EMOTIONS = {
+    'happy': ['happy', 'joy', 'excited', 'great', 'wonderful', 'amazing', 
+              'good', 'pleased', 'delighted', 'fantastic', 'excellent', 'cheerful',
+              'heureux', 'joie', 'excité', 'formidable', 'merveilleux', 
+              'content', 'ravie', 'fantastique', 'excellent', 'joyeux', 'satisfait'],
+
+    'calm': ['calm', 'peaceful', 'relaxed', 'serene', 'tranquil', 'comfortable',
+             'calme', 'paisible', 'détendu', 'serein', 'tranquille', 'confortable'],
+
+    'sad': ['sad', 'depressed', 'unhappy', 'miserable', 'down', 'heartbroken', 
+            'upset', 'disappointed', 'hurt', 'cry', 'crying', 'tears', 'sorrow',
+            'grief', 'mourning', 'devastated', 'hopeless', 'despair',
+            'triste', 'déprimé', 'malheureux', 'miserable', 'découragé', 'coeur brisé',
+            'attristé', 'déçu', 'blessé', 'pleurer', 'larmes', 'chagrin', 'désespéré'],
+
+    'angry': ['angry', 'mad', 'furious', 'annoyed', 'frustrated', 'irritated', 
+              'rage', 'hate', 'outraged', 'disgusted', 'hostile', 'aggressive',
+              'violent', 'enraged', 'livid', 'infuriated', 'resentful', 'bitter',
+              'pissed', 'damn', 'hell', 'shit', 'fuck', 'bloody', 'stupid', 'idiot',
+              'en colère', 'furieux', 'agacé', 'frustré', 'irrité', 'haine', 
+              'outré', 'dégoûté', 'hostile', 'agressif', 'violent', 'enragé',
+              'merde', 'putain', 'con', 'connard', 'imbécile', 'stupide'],
+
+    'anxious': ['anxious', 'worried', 'nervous', 'stressed', 'scared', 'fear', 
+                'afraid', 'panic', 'tense', 'terrified', 'frightened', 'alarmed',
+                'dread', 'paranoid', 'threatened', 'insecure', 'vulnerable',
+                'anxieux', 'inquiet', 'nerveux', 'stressé', 'effrayé', 'peur', 
+                'paniqué', 'tendu', 'terrifié', 'menacé', 'vulnérable'],
+
+    'uncomfortable': ['uncomfortable', 'uneasy', 'disturbed', 'bothered', 'troubled', 
+                      'awkward', 'inappropriate', 'offensive', 'violated', 'concern',
+                      'disturbing', 'unsettling', 'concerning', 'worrying', 'alarming',
+                      'creepy', 'weird', 'strange', 'suspicious', 'wrong',
+                      'mal à l\'aise', 'gêné', 'perturbé', 'ennuyé', 'inquiet', 
+                      'inapproprié', 'offensant', 'violé', 'dérangeant', 'bizarre', 'suspect'],
+
+    'disgusted': ['disgusted', 'revolted', 'repulsed', 'sickened', 'nauseated',
+                  'appalled', 'horrified', 'gross', 'vile', 'repugnant', 'abhorrent',
+                  'dégoûté', 'révolté', 'répugné', 'écœuré', 'horrible', 'ignoble'],
+
+    'threatened': ['threatened', 'danger', 'unsafe', 'risk', 'harm', 'abuse',
+                   'harassment', 'bully', 'attack', 'assault', 'violence',
+                   'menacé', 'danger', 'dangereux', 'risque', 'préjudice', 
+                   'harcèlement', 'violence', 'agression'],
+
+    'confused': ['confused', 'lost', 'unsure', 'uncertain', 'puzzled', 'perplexed',
+                 'bewildered', 'disoriented',
+                 'confus', 'perdu', 'incertain', 'dérouté', 'perplexe', 'hésitant'],
+
+    'surprised': ['surprised', 'shocked', 'amazed', 'astonished', 'stunned',
+                  'étonné', 'surpris', 'choqué', 'stupéfait'],
+    'guilty': ['guilty', 'remorse', 'repentant', 'ashamed',
+               'coupable', 'remords', 'repenti', 'honteux'],
+    'proud': ['proud', 'accomplished', 'fier', 'fière', 'accompli'],
+    'love': ['love', 'affection', 'adore', 'cherish',
+             'amour', 'affection', 'adorer', 'chérir'],
+    'gratitude': ['grateful', 'thankful', 'appreciate', 'thanks',
+                  'reconnaissant', 'merci', 'remerciements', 'gratitude'],
+    'shame': ['shame', 'embarrassed', 'humiliated', 'mortified',
+              'honte', 'gêné', 'humiliation', 'embarrassant']
+}
+
+# Problematic content patterns (heavily weighted)
+PROBLEMATIC_PATTERNS = {
+    'harassment': [
+        r'harass(ment|ing|ed)?',
+        r'bully(ing)?',
+        r'stalk(ing|er)?',
+        r'threaten(ing|ed)?',
+        r'intimidat(e|ing|ion)',
+        r'harcèlement',
+        r'harceler',
+        r'intimider',
+        r'menacer'
+    ],
+    'hate_speech': [
+        r'hate\s+(speech|crime)',
+        r'racial slur',
+        r'discriminat(e|ion|ory)',
+        r'racist',
+        r'sexist',
+        r'homophobic',
+        r'bigot(ry)?',
+        r'discours de haine',
+        r'discrimination',
+        r'raciste',
+        r'sexiste'
+    ],
+    'violence': [
+        r'violen(ce|t)',
+        r'abu(se|sive)',
+        r'assault',
+        r'attack(ing)?',
+        r'harm(ful|ing)?',
+        r'hurt(ing)?',
+        r'injur(e|y|ing)',
+        r'agression',
+        r'violence',
+        r'blesser'
+    ],
+    'sexual_content': [
+        r'sexual',
+        r'explicit',
+        r'pornograph(y|ic)',
+        r'nude',
+        r'nsfw',
+        r'sexuel',
+        r'explicite',
+        r'pornographique'
+    ],
+    'reporting': [
+        r'report(ing)?',
+        r'violat(e|es|ing|ion)',
+        r'guidelines?',
+        r'policy',
+        r'terms of service',
+        r'complaint',
+        r'flag(ging)?',
+        r'signaler',
+        r'violation',
+        r'règlement',
+        r'plainte'
+    ],
+    'offensive': [
+        r'offens(ive|e)',
+        r'inappropriat(e|ed?)',
+        r'unacceptable',
+        r'disgust(ing)?',
+        r'horrible',
+        r'terrible',
+        r'awful',
+        r'gross',
+        r'offensant',
+        r'inapproprié',
+        r'inacceptable',
+        r'horrible'
+    ]
+}
+
+# Strong negative sentiment indicators
+STRONG_NEGATIVE_PHRASES = [
+    r'makes? me (feel )?uncomfortable',
+    r'should (not|never) be',
+    r'need(s)? to be removed',
+    r'take (immediate )?action',
+    r'this is (completely )?(unacceptable|wrong|inappropriate)',
+    r'violates',
+    r'against (the )?rules',
+    r'not (ok|okay|acceptable)',
+    r'seriously concerned',
+    r'deeply (troubled|disturbed|concerned)',
+    r'me rend mal à l\'aise',
+    r'devrait être supprimé',
+    r'prendre des mesures',
+    r'c\'est inacceptable'
+]
+
+# Changes whenever the lexicon above is edited (used to invalidate cached results)
+LEXICON_VERSION = hashlib.sha1(
+    repr((EMOTIONS, PROBLEMATIC_PATTERNS, STRONG_NEGATIVE_PHRASES)).encode('utf-8')
+).hexdigest()[:12]
+
+# Map problematic categories to the emotion they feed
+EMOTION_MAP = {
+    'harassment': 'threatened',
+    'hate_speech': 'uncomfortable',
+    'violence': 'threatened',
+    'sexual_content': 'uncomfortable',
+    'reporting': 'uncomfortable',
+    'offensive': 'disgusted'
+}
+
+POSITIVE_EMOTIONS = ['happy', 'calm', 'proud', 'love', 'gratitude']
+NEGATIVE_EMOTIONS = ['sad', 'angry', 'anxious', 'uncomfortable', 'confused',
+                     'shame', 'guilty', 'disgusted', 'threatened']
+
+FRENCH_KEYWORDS = ['je', 'tu', 'il', 'elle', 'nous', 'vous', 'ils', 'elles', 'le', 'la', 'les']
+
+WORD_RE = re.compile(r'\b\w+\b')
+
+
+# === Compiled matcher engine ===
+
+REGEX_METACHARS = set('.^$*+?{}[]|()\\')
+QUANTIFIERS = set('*+?{')
+
+
+def literal_prefix(pattern):
+    """
+    Return (prefix, is_literal): the plain text every match of `pattern` starts
+    with, and whether the pattern is nothing but that text.
+    """
+    prefix = []
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == '\\' and i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+            ch = pattern[i + 1]
+            i += 2
+        elif ch in REGEX_METACHARS:
+            break
+        else:
+            i += 1
+        if i < len(pattern) and pattern[i] in QUANTIFIERS:
+            # The quantifier applies to this last char: it is not guaranteed
+            return ''.join(prefix), False
+        prefix.append(ch)
+    return ''.join(prefix), i == len(pattern)
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a list of keywords.
+    `find(text)` returns the set of keywords occurring anywhere in the text
+    (same semantics as `keyword in text`) in a single left-to-right scan.
+    """
+
+    def __init__(self, keywords):
+        goto = [{}]
+        output = [set()]
+        for keyword in keywords:
+            state = 0
+            for ch in keyword:
+                if ch not in goto[state]:
+                    goto.append({})
+                    output.append(set())
+                    goto[state][ch] = len(goto) - 1
+                state = goto[state][ch]
+            output[state].add(keyword)
+
+        # Breadth-first pass: failure links, then a full transition table
+        # restricted to the keyword alphabet (any other char goes back to 0)
+        fail = [0] * len(goto)
+        order = []
+        queue = list(goto[0].values())
+        while queue:
+            order.extend(queue)
+            next_queue = []
+            for state in queue:
+                for ch, child in goto[state].items():
+                    next_queue.append(child)
+                    if state == 0:
+                        continue
+                    fallback = fail[state]
+                    while fallback and ch not in goto[fallback]:
+                        fallback = fail[fallback]
+                    fail[child] = goto[fallback].get(ch, 0)
+                    output[child] |= output[fail[child]]
+            queue = next_queue
+
+        delta = [dict(goto[0])]
+        delta.extend(None for _ in range(len(goto) - 1))
+        for state in order:
+            transitions = dict(delta[fail[state]])
+            transitions.update(goto[state])
+            delta[state] = transitions
+
+        self._delta = delta
+        self._output = [frozenset(o) for o in output]
+
+    def find(self, text):
+        delta = self._delta
+        output = self._output
+        found = set()
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if output[state]:
+                found |= output[state]
+        return found
+
+
+class FeelingsEngine:
+    """
+    Precompiled lexicon matcher used by `analyze_feelings`.
+
+    Emotion keywords and the literal prefix of every problematic pattern /
+    strong negative phrase share one Aho-Corasick automaton, so the text is
+    scanned once. Fully literal patterns are decided by that scan alone; the
+    others only run their precompiled regex when their prefix was seen.
+    """
+
+    def __init__(self, emotions, problematic_patterns, strong_negative_phrases):
+        self.emotions = emotions
+
+        # Ordered entries: (kind, category, compiled, prefix, is_literal)
+        self.entries = []
+        for category, patterns in problematic_patterns.items():
+            for pattern in patterns:
+                self.entries.append(('pattern', category, re.compile(pattern)) + literal_prefix(pattern))
+        for pattern in strong_negative_phrases:
+            self.entries.append(('phrase', None, re.compile(pattern)) + literal_prefix(pattern))
+
+        needles = {keyword for keywords in emotions.values() for keyword in keywords}
+        needles.update(entry[3] for entry in self.entries if entry[3])
+        self.automaton = KeywordAutomaton(needles)
+
+    def scan(self, text_lower):
+        """
+        Return ({emotion: [keywords found, in lexicon order]},
+                [(kind, category) of every pattern found, in lexicon order])
+        """
+        found = self.automaton.find(text_lower)
+
+        keyword_matches = {}
+        if found:
+            for emotion, keywords in self.emotions.items():
+                hits = [word for word in keywords if word in found]
+                if hits:
+                    keyword_matches[emotion] = hits
+
+        pattern_matches = []
+        for kind, category, compiled, prefix, is_literal in self.entries:
+            if prefix and prefix not in found:
+                continue
+            if is_literal or compiled.search(text_lower):
+                pattern_matches.append((kind, category))
+
+        return keyword_matches, pattern_matches
+
+
+ENGINE = FeelingsEngine(EMOTIONS, PROBLEMATIC_PATTERNS, STRONG_NEGATIVE_PHRASES)
+
 
 def analyze_feelings(text):
     """
     Enhanced sentiment analyzer with stronger negative emotion detection
     Focuses on detecting problematic content, harmful language, and negative sentiments
     """
-    # Expanded emotions with more negative keywords (English + French)
-    emotions = {
-        'happy': ['happy', 'joy', 'excited', 'great', 'wonderful', 'amazing', 
-                  'good', 'pleased', 'delighted', 'fantastic', 'excellent', 'cheerful',
-                  'heureux', 'joie', 'excité', 'formidable', 'merveilleux', 
-                  'content', 'ravie', 'fantastique', 'excellent', 'joyeux', 'satisfait'],
-        
-        'calm': ['calm', 'peaceful', 'relaxed', 'serene', 'tranquil', 'comfortable',
-                 'calme', 'paisible', 'détendu', 'serein', 'tranquille', 'confortable'],
-        
-        'sad': ['sad', 'depressed', 'unhappy', 'miserable', 'down', 'heartbroken', 
-                'upset', 'disappointed', 'hurt', 'cry', 'crying', 'tears', 'sorrow',
-                'grief', 'mourning', 'devastated', 'hopeless', 'despair',
-                'triste', 'déprimé', 'malheureux', 'miserable', 'découragé', 'coeur brisé',
-                'attristé', 'déçu', 'blessé', 'pleurer', 'larmes', 'chagrin', 'désespéré'],
-        
-        'angry': ['angry', 'mad', 'furious', 'annoyed', 'frustrated', 'irritated', 
-                  'rage', 'hate', 'outraged', 'disgusted', 'hostile', 'aggressive',
-                  'violent', 'enraged', 'livid', 'infuriated', 'resentful', 'bitter',
-                  'pissed', 'damn', 'hell', 'shit', 'fuck', 'bloody', 'stupid', 'idiot',
-                  'en colère', 'furieux', 'agacé', 'frustré', 'irrité', 'haine', 
-                  'outré', 'dégoûté', 'hostile', 'agressif', 'violent', 'enragé',
-                  'merde', 'putain', 'con', 'connard', 'imbécile', 'stupide'],
-        
-        'anxious': ['anxious', 'worried', 'nervous', 'stressed', 'scared', 'fear', 
-                    'afraid', 'panic', 'tense', 'terrified', 'frightened', 'alarmed',
-                    'dread', 'paranoid', 'threatened', 'insecure', 'vulnerable',
-                    'anxieux', 'inquiet', 'nerveux', 'stressé', 'effrayé', 'peur', 
-                    'paniqué', 'tendu', 'terrifié', 'menacé', 'vulnérable'],
-        
-        'uncomfortable': ['uncomfortable', 'uneasy', 'disturbed', 'bothered', 'troubled', 
-                          'awkward', 'inappropriate', 'offensive', 'violated', 'concern',
-                          'disturbing', 'unsettling', 'concerning', 'worrying', 'alarming',
-                          'creepy', 'weird', 'strange', 'suspicious', 'wrong',
-                          'mal à l\'aise', 'gêné', 'perturbé', 'ennuyé', 'inquiet', 
-                          'inapproprié', 'offensant', 'violé', 'dérangeant', 'bizarre', 'suspect'],
-        
-        'disgusted': ['disgusted', 'revolted', 'repulsed', 'sickened', 'nauseated',
-                      'appalled', 'horrified', 'gross', 'vile', 'repugnant', 'abhorrent',
-                      'dégoûté', 'révolté', 'répugné', 'écœuré', 'horrible', 'ignoble'],
-        
-        'threatened': ['threatened', 'danger', 'unsafe', 'risk', 'harm', 'abuse',
-                       'harassment', 'bully', 'attack', 'assault', 'violence',
-                       'menacé', 'danger', 'dangereux', 'risque', 'préjudice', 
-                       'harcèlement', 'violence', 'agression'],
-        
-        'confused': ['confused', 'lost', 'unsure', 'uncertain', 'puzzled', 'perplexed',
-                     'bewildered', 'disoriented',
-                     'confus', 'perdu', 'incertain', 'dérouté', 'perplexe', 'hésitant'],
-        
-        'surprised': ['surprised', 'shocked', 'amazed', 'astonished', 'stunned',
-                      'étonné', 'surpris', 'choqué', 'stupéfait'],
-        'guilty': ['guilty', 'remorse', 'repentant', 'ashamed',
-                   'coupable', 'remords', 'repenti', 'honteux'],
-        'proud': ['proud', 'accomplished', 'fier', 'fière', 'accompli'],
-        'love': ['love', 'affection', 'adore', 'cherish',
-                 'amour', 'affection', 'adorer', 'chérir'],
-        'gratitude': ['grateful', 'thankful', 'appreciate', 'thanks',
-                      'reconnaissant', 'merci', 'remerciements', 'gratitude'],
-        'shame': ['shame', 'embarrassed', 'humiliated', 'mortified',
-                  'honte', 'gêné', 'humiliation', 'embarrassant']
-    }
-    
-    # Problematic content patterns (heavily weighted)
-    problematic_patterns = {
-        'harassment': [
-            r'harass(ment|ing|ed)?',
-            r'bully(ing)?',
-            r'stalk(ing|er)?',
-            r'threaten(ing|ed)?',
-            r'intimidat(e|ing|ion)',
-            r'harcèlement',
-            r'harceler',
-            r'intimider',
-            r'menacer'
-        ],
-        'hate_speech': [
-            r'hate\s+(speech|crime)',
-            r'racial slur',
-            r'discriminat(e|ion|ory)',
-            r'racist',
-            r'sexist',
-            r'homophobic',
-            r'bigot(ry)?',
-            r'discours de haine',
-            r'discrimination',
-            r'raciste',
-            r'sexiste'
-        ],
-        'violence': [
-            r'violen(ce|t)',
-            r'abu(se|sive)',
-            r'assault',
-            r'attack(ing)?',
-            r'harm(ful|ing)?',
-            r'hurt(ing)?',
-            r'injur(e|y|ing)',
-            r'agression',
-            r'violence',
-            r'blesser'
-        ],
-        'sexual_content': [
-            r'sexual',
-            r'explicit',
-            r'pornograph(y|ic)',
-            r'nude',
-            r'nsfw',
-            r'sexuel',
-            r'explicite',
-            r'pornographique'
-        ],
-        'reporting': [
-            r'report(ing)?',
-            r'violat(e|es|ing|ion)',
-            r'guidelines?',
-            r'policy',
-            r'terms of service',
-            r'complaint',
-            r'flag(ging)?',
-            r'signaler',
-            r'violation',
-            r'règlement',
-            r'plainte'
-        ],
-        'offensive': [
-            r'offens(ive|e)',
-            r'inappropriat(e|ed?)',
-            r'unacceptable',
-            r'disgust(ing)?',
-            r'horrible',
-            r'terrible',
-            r'awful',
-            r'gross',
-            r'offensant',
-            r'inapproprié',
-            r'inacceptable',
-            r'horrible'
-        ]
-    }
-    
-    # Strong negative sentiment indicators
-    strong_negative_phrases = [
-        r'makes? me (feel )?uncomfortable',
-        r'should (not|never) be',
-        r'need(s)? to be removed',
-        r'take (immediate )?action',
-        r'this is (completely )?(unacceptable|wrong|inappropriate)',
-        r'violates',
-        r'against (the )?rules',
-        r'not (ok|okay|acceptable)',
-        r'seriously concerned',
-        r'deeply (troubled|disturbed|concerned)',
-        r'me rend mal à l\'aise',
-        r'devrait être supprimé',
-        r'prendre des mesures',
-        r'c\'est inacceptable'
-    ]
-    
     text_lower = text.lower()
-    words = re.findall(r'\b\w+\b', text_lower)
-    
+    words = WORD_RE.findall(text_lower)
+
     detected_emotions = {}
     emotion_keywords_found = {}
     severity_multiplier = {}
-    
+
+    keyword_matches, pattern_matches = ENGINE.scan(text_lower)
+
     # Detect emotions from keywords (base weight: 1)
-    for emotion, keywords in emotions.items():
-        matches = [word for word in keywords if word in text_lower]
-        if matches:
-            detected_emotions[emotion] = len(matches)
-            emotion_keywords_found[emotion] = matches
-            severity_multiplier[emotion] = 1
-    
-    # Check problematic patterns (weight: 5x for negative content)
-    for category, patterns in problematic_patterns.items():
-        for pattern in patterns:
-            matches = re.findall(pattern, text_lower)
-            if matches:
-                # Map to appropriate emotion
-                emotion_map = {
-                    'harassment': 'threatened',
-                    'hate_speech': 'uncomfortable',
-                    'violence': 'threatened',
-                    'sexual_content': 'uncomfortable',
-                    'reporting': 'uncomfortable',
-                    'offensive': 'disgusted'
-                }
-                emotion = emotion_map.get(category, 'uncomfortable')
-                detected_emotions[emotion] = detected_emotions.get(emotion, 0) + 5
-                if emotion not in emotion_keywords_found:
-                    emotion_keywords_found[emotion] = []
-                emotion_keywords_found[emotion].append(f"[{category}]")
-                severity_multiplier[emotion] = 5
-    
-    # Check strong negative phrases (weight: 7x)
-    for pattern in strong_negative_phrases:
-        if re.search(pattern, text_lower):
+    for emotion, matches in keyword_matches.items():
+        detected_emotions[emotion] = len(matches)
+        emotion_keywords_found[emotion] = matches
+        severity_multiplier[emotion] = 1
+
+    for kind, category in pattern_matches:
+        if kind == 'pattern':
+            # Check problematic patterns (weight: 5x for negative content)
+            emotion = EMOTION_MAP.get(category, 'uncomfortable')
+            detected_emotions[emotion] = detected_emotions.get(emotion, 0) + 5
+            if emotion not in emotion_keywords_found:
+                emotion_keywords_found[emotion] = []
+            emotion_keywords_found[emotion].append(f"[{category}]")
+            severity_multiplier[emotion] = 5
+        else:
+            # Check strong negative phrases (weight: 7x)
             detected_emotions['uncomfortable'] = detected_emotions.get('uncomfortable', 0) + 7
             if 'uncomfortable' not in emotion_keywords_found:
                 emotion_keywords_found['uncomfortable'] = []
             emotion_keywords_found['uncomfortable'].append(f"[strong negative phrase]")
             severity_multiplier['uncomfortable'] = 7
-    
+
     # Determine sentiment polarity with BIAS toward negative
-    positive_emotions = ['happy', 'calm', 'proud', 'love', 'gratitude']
-    negative_emotions = ['sad', 'angry', 'anxious', 'uncomfortable', 'confused', 
-                         'shame', 'guilty', 'disgusted', 'threatened']
-    
     # Apply multipliers for weighted scoring
-    positive_score = sum(detected_emotions.get(e, 0) for e in positive_emotions)
-    negative_score = sum(detected_emotions.get(e, 0) for e in negative_emotions)
-    
+    positive_score = sum(detected_emotions.get(e, 0) for e in POSITIVE_EMOTIONS)
+    negative_score = sum(detected_emotions.get(e, 0) for e in NEGATIVE_EMOTIONS)
+
     # BIAS: Negative emotions need 2x less intensity to trigger negative sentiment
     negative_score = negative_score * 1.5
-    
+
     if negative_score > positive_score + 2:  # Threshold favors negative detection
         sentiment = 'Negative'
     elif positive_score > negative_score:
         sentiment = 'Positive'
     else:
         sentiment = 'Neutral/Negative'  # Changed from just 'Neutral'
-    
+
     # Calculate risk level
     risk_score = negative_score / max(len(words), 1) * 100
     if risk_score > 50:
@@ -238,7 +395,7 @@ def analyze_feelings(text):
         risk_level = 'LOW'
     else:
         risk_level = 'MINIMAL'
-    
+
     # Calculate intensities
     emotion_intensities = {}
     if detected_emotions:
@@ -250,11 +407,10 @@ def analyze_feelings(text):
                 'keywords': emotion_keywords_found[emotion],
                 'severity': severity_multiplier.get(emotion, 1)
             }
-    
+
     # Detect language
-    french_keywords = ['je', 'tu', 'il', 'elle', 'nous', 'vous', 'ils', 'elles', 'le', 'la', 'les']
-    lang = 'French' if any(k in text_lower for k in french_keywords) else 'English'
-    
+    lang = 'French' if any(k in text_lower for k in FRENCH_KEYWORDS) else 'English'
+
     analysis = {
         'text': text,
         'word_count': len(words),
@@ -267,10 +423,55 @@ def analyze_feelings(text):
         'negative_score': round(negative_score, 2),
         'language': lang
     }
-    
+
     return analysis
 
 
+def analyze_feelings_many(texts, workers=1, chunksize=64, stats=None):
+    """
+    Batch version of `analyze_feelings`: yields one analysis per text, in order,
+    while consuming `texts` lazily (any iterable, e.g. a queryset iterator).
+
+    workers=1 runs in-process; workers>1 (or None for every core) fans the texts
+    out to a process pool in chunks of `chunksize`. Each worker builds the
+    compiled ENGINE once when it imports this module.
+
+    If a `stats` dict is given it is kept up to date with
+    'count', 'seconds' and 'texts_per_second'.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    started = time.perf_counter()
+
+    def track(results):
+        for count, analysis in enumerate(results, 1):
+            if stats is not None:
+                seconds = time.perf_counter() - started
+                stats['count'] = count
+                stats['seconds'] = round(seconds, 3)
+                stats['texts_per_second'] = round(count / seconds, 1) if seconds else 0.0
+            yield analysis
+
+    if workers <= 1:
+        yield from track(analyze_feelings(text) for text in texts)
+        return
+
+    def fan_out(pool):
+        # Feed the pool a bounded window at a time so a huge iterable is
+        # never pulled into memory all at once
+        iterator = iter(texts)
+        window = workers * chunksize * 2
+        while True:
+            batch = list(islice(iterator, window))
+            if not batch:
+                return
+            yield from pool.imap(analyze_feelings, batch, chunksize=chunksize)
+
+    with Pool(processes=workers) as pool:
+        yield from track(fan_out(pool))
+
+
 def print_analysis(analysis):
     """
     Enhanced pretty print with risk assessment
@@ -353,4 +554,11 @@ if __name__ == "__main__":
         print(f"TEST CASE {i}")
         print(f"{'#'*70}")
         analysis = analyze_feelings(text)
-        print_analysis(analysis)
\ No newline at end of file
+        print_analysis(analysis)
+
+    # Batch throughput
+    stats = {}
+    for _ in analyze_feelings_many(test_texts * 2500, workers=None, stats=stats):
+        pass
+    print(f"Batch: {stats['count']} texts in {stats['seconds']}s "
+          f"({stats['texts_per_second']} texts/second)")
\ No newline at end of file
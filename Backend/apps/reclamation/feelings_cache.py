@@ -0,0 +1,101 @@
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import feelings
+
+# Compteurs exposés via cache_info()
+_stats = {'hits': 0, 'misses': 0, 'shared_hits': 0}
+_local = OrderedDict()
+_local_version = None
+_lock = threading.Lock()
+
+
+def _normalize(text):
+    # Le résultat ne dépend que du texte en minuscules ; les espaces en bord
+    # de texte ne changent aucune correspondance
+    return (text or '').strip().lower()
+
+
+def _cache_key(text):
+    digest = hashlib.sha256(_normalize(text).encode('utf-8')).hexdigest()
+    return f"feelings:{feelings.LEXICON_VERSION}:{digest}"
+
+
+def _shared_cache():
+    alias = getattr(settings, 'FEELINGS_CACHE_ALIAS', '')
+    return caches[alias] if alias else None
+
+
+def _remember(key, analysis):
+    global _local_version
+    maxsize = getattr(settings, 'FEELINGS_CACHE_SIZE', 2048)
+    with _lock:
+        if _local_version != feelings.LEXICON_VERSION:
+            # Nouveau lexique : les anciens résultats ne sont plus valides
+            _local.clear()
+            _local_version = feelings.LEXICON_VERSION
+        _local[key] = analysis
+        _local.move_to_end(key)
+        while len(_local) > maxsize:
+            _local.popitem(last=False)
+
+
+def analyze_feelings_cached(text):
+    """
+    `analyze_feelings` memoized on (lexicon version, hash of normalized text).
+    Local LRU per process, plus Django's cache FEELINGS_CACHE_ALIAS if set
+    (shared between gunicorn workers).
+    """
+    key = _cache_key(text)
+
+    with _lock:
+        cached = _local.get(key)
+        if cached is not None:
+            _local.move_to_end(key)
+            _stats['hits'] += 1
+
+    if cached is None:
+        shared = _shared_cache()
+        if shared is not None:
+            cached = shared.get(key)
+            if cached is not None:
+                with _lock:
+                    _stats['hits'] += 1
+                    _stats['shared_hits'] += 1
+                _remember(key, cached)
+
+    if cached is None:
+        with _lock:
+            _stats['misses'] += 1
+        cached = feelings.analyze_feelings(text)
+        cached.pop('text')
+        _remember(key, cached)
+        shared = _shared_cache()
+        if shared is not None:
+            shared.set(key, cached, getattr(settings, 'FEELINGS_CACHE_TIMEOUT', 86400))
+
+    return {'text': text, **copy.deepcopy(cached)}
+
+
+def cache_info():
+    with _lock:
+        lookups = _stats['hits'] + _stats['misses']
+        return {
+            **_stats,
+            'hit_rate': round(_stats['hits'] / lookups, 3) if lookups else 0.0,
+            'size': len(_local),
+            'maxsize': getattr(settings, 'FEELINGS_CACHE_SIZE', 2048),
+            'lexicon_version': feelings.LEXICON_VERSION,
+        }
+
+
+def cache_clear():
+    with _lock:
+        _local.clear()
+        for name in _stats:
+            _stats[name] = 0
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from apps.reclamation.analytics import rebuild
+
+
+class Command(BaseCommand):
+    help = ("Recalcule l'agrégat journalier des sentiments (ReclamationDailyStat) "
+            "à partir de toutes les réclamations. À lancer une fois après la migration.")
+
+    def handle(self, *args, **options):
+        rows = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"✅ {rows} ligne(s) d'agrégat recalculée(s)"))
@@ -0,0 +1,88 @@
+from collections import deque
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.reclamation.analytics import apply_changes, snapshot
+from apps.reclamation.feelings import analyze_feelings_many
+from apps.reclamation.models import Reclamation
+
+
+class Command(BaseCommand):
+    help = "Recalcule sentiment_local / emotions_local de toutes les réclamations (par lots, bulk_update)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help="Nombre de lignes lues par requête (.iterator)")
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help="Nombre de lignes écrites par transaction (bulk_update)")
+        parser.add_argument('--workers', type=int, default=1,
+                            help="Nombre de processus d'analyse (0 = tous les coeurs)")
+        parser.add_argument('--from-id', type=int, default=0,
+                            help="Reprendre à partir de cet id (inclus)")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Analyse sans rien écrire en base")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+
+        queryset = (
+            Reclamation.objects
+            .filter(id__gte=options['from_id'])
+            .order_by('id')
+            .only('id', 'contenu', 'sentiment_local', 'emotions_local', 'date_creation', 'cible_id')
+        )
+
+        # Rows waiting for their analysis (results come back in order)
+        pending = deque()
+
+        def texts():
+            for reclamation in queryset.iterator(chunk_size=options['chunk_size']):
+                pending.append(reclamation)
+                yield reclamation.contenu or ''
+
+        stats = {}
+        batch = []
+        # bulk_update ne déclenche pas les signaux : l'agrégat journalier est mis à jour ici
+        stat_changes = []
+        scanned = changed = 0
+        last_id = None
+
+        def flush():
+            if batch and not dry_run:
+                with transaction.atomic():
+                    Reclamation.objects.bulk_update(batch, ['sentiment_local', 'emotions_local'])
+                    apply_changes(stat_changes)
+            self.stdout.write(
+                f"… {scanned} analysées, {changed} modifiées, dernier id {last_id} "
+                f"({stats.get('texts_per_second', 0)} textes/s)"
+            )
+            batch.clear()
+            stat_changes.clear()
+
+        for analysis in analyze_feelings_many(texts(), workers=options['workers'] or None, stats=stats):
+            reclamation = pending.popleft()
+            scanned += 1
+            last_id = reclamation.id
+
+            # N'écrire que les lignes dont le résultat change
+            if (reclamation.sentiment_local != analysis['sentiment']
+                    or reclamation.emotions_local != analysis['emotions']):
+                previous = snapshot(reclamation)
+                reclamation.sentiment_local = analysis['sentiment']
+                reclamation.emotions_local = analysis['emotions']
+                batch.append(reclamation)
+                stat_changes.append((previous, snapshot(reclamation)))
+                changed += 1
+
+            if len(batch) >= batch_size:
+                flush()
+
+        flush()
+
+        prefix = "[dry-run] " if dry_run else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{scanned} réclamations analysées, {changed} mises à jour "
+            f"en {stats.get('seconds', 0)}s."
+        ))
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reclamation', '0007_alter_reclamation_auteur_alter_reclamation_cible_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reclamation',
+            index=models.Index(fields=['auteur', 'date_creation'], name='reclamation_auteur_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reclamation',
+            index=models.Index(fields=['cible', 'date_creation'], name='reclamation_cible_date_idx'),
+        ),
+    ]
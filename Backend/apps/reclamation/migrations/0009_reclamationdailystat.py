@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reclamation', '0008_reclamation_list_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReclamationDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('sentiment', models.CharField(blank=True, max_length=50)),
+                ('count', models.IntegerField(default=0)),
+                ('emotions', models.JSONField(default=dict)),
+                ('cible', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='reclamation_stat_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'cible', 'sentiment'), name='reclamation_stat_unique')],
+            },
+        ),
+    ]
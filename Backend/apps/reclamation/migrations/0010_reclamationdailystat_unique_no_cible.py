@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def merge_no_cible_duplicates(apps, schema_editor):
+    # Doublons (jour, NULL, sentiment) laissés par la suppression d'utilisateurs ciblés
+    ReclamationDailyStat = apps.get_model('reclamation', 'ReclamationDailyStat')
+    kept = {}
+    for stat in ReclamationDailyStat.objects.filter(cible__isnull=True).order_by('pk'):
+        key = (stat.day, stat.sentiment)
+        if key not in kept:
+            kept[key] = stat
+            continue
+        target = kept[key]
+        target.count += stat.count
+        for emotion, value in stat.emotions.items():
+            target.emotions[emotion] = target.emotions.get(emotion, 0) + value
+        target.save(update_fields=['count', 'emotions'])
+        stat.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reclamation', '0009_reclamationdailystat'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_no_cible_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='reclamationdailystat',
+            constraint=models.UniqueConstraint(condition=models.Q(('cible__isnull', True)), fields=('day', 'sentiment'), name='reclamation_stat_unique_no_cible'),
+        ),
+    ]
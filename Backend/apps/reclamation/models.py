@@ -29,5 +29,46 @@ class Reclamation(models.Model):
 
     date_creation = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Listes "envoyées" / "reçues" triées par date
+            models.Index(fields=['auteur', 'date_creation'], name='reclamation_auteur_date_idx'),
+            models.Index(fields=['cible', 'date_creation'], name='reclamation_cible_date_idx'),
+        ]
+
     def __str__(self):
         return f"Réclamation #{self.id} par {self.auteur}"
+
+
+class ReclamationDailyStat(models.Model):
+    """
+    Agrégat journalier maintenu au fil de l'eau (voir analytics.py) :
+    nombre de réclamations par (jour, cible, sentiment) et, pour chaque émotion,
+    nombre de ces réclamations où elle a été détectée.
+    """
+    day = models.DateField()
+    cible = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True, blank=True,
+        related_name='+'
+    )
+    sentiment = models.CharField(max_length=50, blank=True)
+    count = models.IntegerField(default=0)
+    emotions = models.JSONField(default=dict)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'cible', 'sentiment'], name='reclamation_stat_unique'),
+            # NULL ≠ NULL pour la contrainte ci-dessus : une seule ligne "sans cible" par (jour, sentiment)
+            models.UniqueConstraint(
+                fields=['day', 'sentiment'], condition=models.Q(cible__isnull=True),
+                name='reclamation_stat_unique_no_cible',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['day'], name='reclamation_stat_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.sentiment or '-'} → {self.cible_id}: {self.count}"
@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class ReclamationCursorPagination(CursorPagination):
+    """
+    Pagination par curseur sur (date_creation, id) : coût constant quelle que
+    soit la page, contrairement à OFFSET.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-date_creation', '-id')
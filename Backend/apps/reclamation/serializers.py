@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from .models import Reclamation
-from .feelings import analyze_feelings
+from .feelings_cache import analyze_feelings_cached
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -54,7 +54,7 @@ class ReclamationSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         # Calcul automatique des sentiments
         text = validated_data.get('contenu', '')
-        analysis = analyze_feelings(text)
+        analysis = analyze_feelings_cached(text)
         validated_data['sentiment_local'] = analysis['sentiment']
         validated_data['emotions_local'] = analysis['emotions']
         return super().create(validated_data)
@@ -63,7 +63,7 @@ class ReclamationSerializer(serializers.ModelSerializer):
         # Recalculer les sentiments si le contenu change
         if 'contenu' in validated_data:
             text = validated_data.get('contenu', '')
-            analysis = analyze_feelings(text)
+            analysis = analyze_feelings_cached(text)
             validated_data['sentiment_local'] = analysis['sentiment']
             validated_data['emotions_local'] = analysis['emotions']
         return super().update(instance, validated_data)
\ No newline at end of file
@@ -1,3 +1,211 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.users.authentication import cache_clear
+
+from . import analytics, feelings, feelings_cache
+from .feelings import analyze_feelings, analyze_feelings_many
+from .models import Reclamation, ReclamationDailyStat
+
+User = get_user_model()
+
+
+class ReclamationListQueryCountTests(TestCase):
+    """Les listes ne doivent pas faire une requête par réclamation (auteur / cible)"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('alice', password='secret-pass-123', is_staff=True)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+
+    def add_reclamations(self, count):
+        for i in range(count):
+            auteur = User.objects.create_user(f'auteur{User.objects.count()}')
+            Reclamation.objects.create(auteur=auteur, cible=self.user, sujet='user', contenu=f'plainte {i}')
+            Reclamation.objects.create(auteur=self.user, cible=auteur, sujet='user', contenu=f'plainte {i}')
+
+    def count_queries(self, url):
+        # Chaque mesure inclut la vérification du jeton
+        cache_clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.data
+
+    def test_query_count_does_not_grow_with_rows(self):
+        for url in ['/api/reclamation/', '/api/reclamation/received/', '/api/reclamation/sent/']:
+            with self.subTest(url=url):
+                Reclamation.objects.all().delete()
+                self.add_reclamations(2)
+                few, _ = self.count_queries(url)
+                self.add_reclamations(20)
+                many, data = self.count_queries(url)
+                self.assertEqual(few, many)
+                self.assertGreater(len(data['results']), 2)
+
+    def test_cursor_pagination_walks_every_row_once(self):
+        self.add_reclamations(5)
+        seen = []
+        url = '/api/reclamation/sent/?page_size=2'
+        while url:
+            response = self.client.get(url)
+            seen.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+        expected = list(
+            Reclamation.objects.filter(auteur=self.user)
+            .order_by('-date_creation', '-id')
+            .values_list('id', flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+
+class ReclamationDailyStatTests(TestCase):
+    """L'agrégat reste cohérent (une ligne par clé) quand une cible est supprimée"""
+
+    def setUp(self):
+        self.auteur = User.objects.create_user('alice', password='secret-pass-123', is_staff=True)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.auteur).key}')
+
+    def no_cible_rows(self):
+        return ReclamationDailyStat.objects.filter(cible__isnull=True)
+
+    def test_deleted_cible_is_folded_into_no_cible_row(self):
+        Reclamation.objects.create(auteur=self.auteur, sujet='user', contenu='Je suis très content')
+        for name in ('bob', 'carol'):
+            cible = User.objects.create_user(name)
+            Reclamation.objects.create(auteur=self.auteur, cible=cible, sujet='user', contenu='Je suis très content')
+            cible.delete()
+
+        self.assertEqual(self.no_cible_rows().count(), 1)
+        self.assertEqual(self.no_cible_rows().get().count, 3)
+
+        # Nouvelle réclamation sans cible le même jour : plus de MultipleObjectsReturned
+        Reclamation.objects.create(auteur=self.auteur, sujet='user', contenu='Je suis très content')
+        self.assertEqual(self.no_cible_rows().get().count, 4)
+        response = self.client.get('/api/reclamation/analytics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total'], 4)
+
+    def test_incremental_matches_rebuild_after_cible_deletion(self):
+        cible = User.objects.create_user('bob')
+        for contenu in ('Je suis très content', 'Je suis furieux et en colère', 'Merci'):
+            Reclamation.objects.create(auteur=self.auteur, cible=cible, sujet='user', contenu=contenu)
+            Reclamation.objects.create(auteur=self.auteur, sujet='system', contenu=contenu)
+        cible.delete()
+
+        def table():
+            return sorted(ReclamationDailyStat.objects.values_list('day', 'cible', 'sentiment', 'count', 'emotions'))
+        incremental = table()
+        analytics.rebuild()
+        self.assertEqual(incremental, table())
+
+
+# (texte, (sentiment, risque, score de risque, score positif, score négatif, langue,
+#          {émotion: (nombre, mots-clés)})) : sorties de l'analyseur d'origine (boucle
+# `keyword in text` + re.search), que le moteur Aho-Corasick doit reproduire à l'identique
+FEELINGS_CASES = [
+    ('',
+     ('Neutral/Negative', 'MINIMAL', 0.0, 0, 0.0, 'English', {})),
+    ("Thank you so much for your wonderful service! I'm really happy with everything.",
+     ('Positive', 'MINIMAL', 0.0, 2, 0.0, 'English', {'happy': (2, ['happy', 'wonderful'])})),
+    ('Je suis content, merci pour votre aide.',
+     ('Positive', 'MEDIUM', 21.43, 2, 1.5, 'French', {'happy': (1, ['content']), 'angry': (1, ['con']), 'gratitude': (1, ['merci'])})),
+    ('Hello, this is not ok and should never be allowed on the site.',
+     ('Negative', 'HIGH', 173.08, 0, 22.5, 'English', {'angry': (1, ['hell']), 'uncomfortable': (14, ['[strong negative phrase]', '[strong negative phrase]'])})),
+    ("J'ai le coeur brisé et je suis en colère, c'est inacceptable.",
+     ('Negative', 'HIGH', 161.54, 0, 21.0, 'French', {'sad': (1, ['coeur brisé']), 'angry': (1, ['en colère']), 'disgusted': (5, ['[offensive]']), 'uncomfortable': (7, ['[strong negative phrase]'])})),
+    ("Je me sens mal à l'aise : ce contenu est dérangeant et devrait être supprimé.",
+     ('Negative', 'HIGH', 100.0, 0, 15.0, 'French', {'angry': (1, ['con']), 'uncomfortable': (9, ["mal à l'aise", 'dérangeant', '[strong negative phrase]'])})),
+    ('I am disgusted and écœuré by this harassment, it violates the terms of service.',
+     ('Negative', 'HIGH', 332.14, 0, 46.5, 'French', {'angry': (1, ['disgusted']), 'disgusted': (7, ['disgusted', 'écœuré', '[offensive]']), 'threatened': (6, ['harassment', '[harassment]']), 'uncomfortable': (17, ['[reporting]', '[reporting]', '[strong negative phrase]'])})),
+    ('This is hate speech and a racial slur, deeply disturbed.',
+     ('Negative', 'HIGH', 285.0, 0, 28.5, 'French', {'angry': (1, ['hate']), 'uncomfortable': (18, ['disturbed', '[hate_speech]', '[hate_speech]', '[strong negative phrase]'])})),
+    ('Je ne suis pas déçu, au contraire je suis ravie et fière.',
+     ('Neutral/Negative', 'MEDIUM', 25.0, 2, 3.0, 'French', {'happy': (1, ['ravie']), 'sad': (1, ['déçu']), 'angry': (1, ['con']), 'proud': (1, ['fière'])})),
+    ("I'm not happy, not okay, and I want to report this abusive bully.",
+     ('Negative', 'HIGH', 246.43, 1, 34.5, 'English', {'happy': (1, ['happy']), 'threatened': (11, ['bully', '[harassment]', '[violence]']), 'uncomfortable': (12, ['[reporting]', '[strong negative phrase]'])})),
+    ('BULLYING and THREATENING messages, Harcèlement, MENACER.',
+     ('Negative', 'HIGH', 550.0, 0, 33.0, 'French', {'threatened': (22, ['bully', 'harcèlement', '[harassment]', '[harassment]', '[harassment]', '[harassment]'])})),
+]
+
+
+def feelings_summary(analysis):
+    return (
+        analysis['sentiment'], analysis['risk_level'], analysis['risk_score'],
+        analysis['positive_score'], analysis['negative_score'], analysis['language'],
+        {emotion: (data['count'], data['keywords']) for emotion, data in analysis['emotions'].items()},
+    )
+
+
+class AnalyzeFeelingsTests(TestCase):
+    """Expressions, mots-clés imbriqués (con/content, hell/hello), accents et négations"""
+
+    def test_pinned_outputs(self):
+        for text, expected in FEELINGS_CASES:
+            with self.subTest(text=text):
+                analysis = analyze_feelings(text)
+                self.assertEqual(analysis['text'], text)
+                self.assertEqual(feelings_summary(analysis), expected)
+
+    def test_many_matches_single_calls_in_order(self):
+        texts = [text for text, _ in FEELINGS_CASES] * 3
+        expected = [analyze_feelings(text) for text in texts]
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                stats = {}
+                results = list(analyze_feelings_many(iter(texts), workers=workers, chunksize=4, stats=stats))
+                self.assertEqual(results, expected)
+                self.assertEqual(stats['count'], len(texts))
+
+
+class FeelingsCacheTests(TestCase):
+    def setUp(self):
+        feelings_cache.cache_clear()
+        self.addCleanup(feelings_cache.cache_clear)
+        patcher = mock.patch.object(feelings, 'analyze_feelings', wraps=feelings.analyze_feelings)
+        self.analyze = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_key_ignores_case_and_surrounding_spaces(self):
+        first = feelings_cache.analyze_feelings_cached('Merci, je suis TRÈS content')
+        second = feelings_cache.analyze_feelings_cached('  merci, je suis très content\n')
+        self.assertEqual(self.analyze.call_count, 1)
+        self.assertEqual(second['text'], '  merci, je suis très content\n')
+        self.assertEqual({**first, 'text': ''}, {**second, 'text': ''})
+        self.assertEqual(feelings_cache.cache_info()['hits'], 1)
+
+        # Une autre ponctuation est un autre texte
+        feelings_cache.analyze_feelings_cached('Merci je suis très content')
+        self.assertEqual(self.analyze.call_count, 2)
+
+    def test_returned_result_is_a_copy(self):
+        feelings_cache.analyze_feelings_cached('Je suis en colère')['emotions'].clear()
+        self.assertTrue(feelings_cache.analyze_feelings_cached('Je suis en colère')['emotions'])
+
+    @override_settings(
+        CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'feelings': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'feelings-tests'},
+        },
+        FEELINGS_CACHE_ALIAS='feelings',
+    )
+    def test_lexicon_version_change_invalidates_entries(self):
+        feelings_cache.analyze_feelings_cached('Je suis en colère')
+        with mock.patch.object(feelings, 'LEXICON_VERSION', 'nouveau-lexique'):
+            feelings_cache.analyze_feelings_cached('Je suis en colère')
+            self.assertEqual(self.analyze.call_count, 2)
+            # Le cache local ne garde que les résultats du nouveau lexique
+            self.assertEqual(feelings_cache.cache_info()['size'], 1)
+
+        # Cache partagé : l'ancienne entrée reste servie pour l'ancienne version uniquement
+        feelings_cache.cache_clear()
+        feelings_cache.analyze_feelings_cached('Je suis en colère')
+        self.assertEqual(self.analyze.call_count, 2)
+        self.assertEqual(feelings_cache.cache_info()['shared_hits'], 1)
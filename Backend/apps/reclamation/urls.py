@@ -1,9 +1,14 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     path('', views.ReclamationListCreateView.as_view(), name='reclamation-list-create'),
     path('<int:pk>/', views.ReclamationDetailView.as_view(), name='reclamation-detail'),
     path('received/', views.ReclamationReceivedView.as_view(), name='reclamation-received'),
     path('sent/', views.ReclamationSentView.as_view(), name='reclamation-sent'),
+    # Variantes async (ASGI)
+    path('async/received/', async_views.reclamation_received, name='reclamation-received-async'),
+    path('async/sent/', async_views.reclamation_sent, name='reclamation-sent-async'),
+    path('analytics/', views.ReclamationAnalyticsView.as_view(), name='reclamation-analytics'),
+    path('feelings-cache/', views.FeelingsCacheStatsView.as_view(), name='reclamation-feelings-cache'),
 ]
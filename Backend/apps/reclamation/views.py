@@ -1,39 +1,96 @@
-from rest_framework import generics, permissions
-from rest_framework.authentication import TokenAuthentication
+from datetime import timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from apps.users.authentication import CachedTokenAuthentication
+from .analytics import sentiment_summary
+from .feelings_cache import cache_info
 from .models import Reclamation
+from .pagination import ReclamationCursorPagination
 from .serializers import ReclamationSerializer
 
 
 class ReclamationListCreateView(generics.ListCreateAPIView):
-    queryset = Reclamation.objects.all().order_by('-date_creation')
+    queryset = Reclamation.objects.select_related('auteur', 'cible').order_by('-date_creation')
     serializer_class = ReclamationSerializer
     permission_classes = [permissions.IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
+    pagination_class = ReclamationCursorPagination
 
     def perform_create(self, serializer):
         serializer.save(auteur=self.request.user)
 
 
 class ReclamationDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Reclamation.objects.all()
+    queryset = Reclamation.objects.select_related('auteur', 'cible')
     serializer_class = ReclamationSerializer
     permission_classes = [permissions.IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
 
 
 class ReclamationReceivedView(generics.ListAPIView):
     serializer_class = ReclamationSerializer
     permission_classes = [permissions.IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
+    pagination_class = ReclamationCursorPagination
 
     def get_queryset(self):
-        return Reclamation.objects.filter(cible=self.request.user).order_by('-date_creation')
+        return (
+            Reclamation.objects
+            .filter(cible=self.request.user)
+            .select_related('auteur', 'cible')
+            .order_by('-date_creation')
+        )
 
 
 class ReclamationSentView(generics.ListAPIView):
     serializer_class = ReclamationSerializer
     permission_classes = [permissions.IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
+    pagination_class = ReclamationCursorPagination
 
     def get_queryset(self):
-        return Reclamation.objects.filter(auteur=self.request.user).order_by('-date_creation')
+        return (
+            Reclamation.objects
+            .filter(auteur=self.request.user)
+            .select_related('auteur', 'cible')
+            .order_by('-date_creation')
+        )
+
+
+class FeelingsCacheStatsView(APIView):
+    """Compteurs hit/miss du cache d'analyse des sentiments (processus courant)"""
+    permission_classes = [permissions.IsAdminUser]
+    authentication_classes = [CachedTokenAuthentication]
+
+    def get(self, request):
+        return Response(cache_info())
+
+
+class ReclamationAnalyticsView(APIView):
+    """
+    Tableau de bord des sentiments sur une période (admin) :
+    GET ?start=AAAA-MM-JJ&end=AAAA-MM-JJ&top=10 (par défaut les 30 derniers jours).
+    Lu depuis l'agrégat journalier, pas depuis les réclamations.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    authentication_classes = [CachedTokenAuthentication]
+
+    def get(self, request):
+        end = timezone.localdate()
+        start = end - timedelta(days=29)
+        try:
+            if request.query_params.get('end'):
+                end = parse_date(request.query_params['end'])
+            if request.query_params.get('start'):
+                start = parse_date(request.query_params['start'])
+            top = min(max(int(request.query_params.get('top', 10)), 1), 50)
+        except ValueError:
+            start = None
+        if start is None or end is None or start > end:
+            return Response({'error': "Période invalide (start/end au format AAAA-MM-JJ, start <= end)"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        return Response(sentiment_summary(start, end, top=top))
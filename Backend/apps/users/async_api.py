@@ -0,0 +1,104 @@
+# Outils communs aux vues async (servies par artGallery/asgi.py, ex. uvicorn) :
+# authentification par jeton et pagination keyset sans bloquer la boucle d'événements.
+import base64
+import binascii
+import functools
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.db.models import Q
+from django.http import JsonResponse
+from rest_framework.authentication import get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+
+from .authentication import CachedTokenAuthentication
+
+
+async def aauthenticate(request):
+    """Utilisateur du jeton `Authorization: Token <clé>`, None sans jeton"""
+    auth = get_authorization_header(request).split()
+    if len(auth) != 2 or auth[0].lower() != b'token':
+        return None
+    try:
+        key = auth[1].decode()
+    except UnicodeError:
+        raise AuthenticationFailed("Jeton invalide.")
+    return await aauthenticate_key(key)
+
+
+async def aauthenticate_key(key):
+    """Utilisateur de la clé de jeton ; AuthenticationFailed si invalide"""
+    authenticator = CachedTokenAuthentication()
+    # Cas courant : jeton dans le LRU local, aucune E/S
+    credentials = authenticator.cached_credentials(key)
+    if credentials is None:
+        credentials = await sync_to_async(authenticator.authenticate_credentials)(key)
+    return credentials[0]
+
+
+def token_required(view):
+    """Équivalent async de CachedTokenAuthentication + IsAuthenticated"""
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            user = await aauthenticate(request)
+        except AuthenticationFailed as e:
+            return JsonResponse({'detail': str(e.detail)}, status=401)
+        if user is None:
+            return JsonResponse({'detail': "Informations d'authentification non fournies."}, status=401)
+        request.user = user
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+def _encode_cursor(value, pk):
+    raw = f"{value.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor):
+    try:
+        value, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(value), int(pk)
+    except (binascii.Error, UnicodeError, ValueError):
+        return None
+
+
+def _page_size(request, pagination_class):
+    try:
+        size = int(request.GET.get(pagination_class.page_size_query_param, pagination_class.page_size))
+    except ValueError:
+        return pagination_class.page_size
+    return max(1, min(size, pagination_class.max_page_size))
+
+
+async def apaginate(request, queryset, pagination_class, serialize):
+    """
+    Page keyset (date décroissante, id décroissant) avec l'ordre, la taille de
+    page et le format de réponse ({next, previous, results}) de `pagination_class`.
+    Seul `next` est fourni ; le curseur n'est pas interchangeable avec celui de DRF.
+    """
+    date_field = pagination_class.ordering[0].lstrip('-')
+    queryset = queryset.order_by(*pagination_class.ordering)
+
+    cursor = request.GET.get('cursor')
+    if cursor:
+        position = _decode_cursor(cursor)
+        if position is None:
+            return JsonResponse({'detail': "Curseur invalide."}, status=404)
+        value, pk = position
+        queryset = queryset.filter(
+            Q(**{f'{date_field}__lt': value}) | Q(**{date_field: value, 'pk__lt': pk})
+        )
+
+    size = _page_size(request, pagination_class)
+    rows = [obj async for obj in queryset[:size + 1]]
+    next_url = None
+    if len(rows) > size:
+        rows = rows[:size]
+        last = rows[-1]
+        params = request.GET.copy()
+        params['cursor'] = _encode_cursor(getattr(last, date_field), last.pk)
+        next_url = request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+
+    return JsonResponse({'next': next_url, 'previous': None, 'results': serialize(rows)})
@@ -0,0 +1,97 @@
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.authentication import TokenAuthentication
+
+# Jetons déjà vérifiés : {clé: (expiration, (user, token))}
+_local = OrderedDict()
+_lock = threading.Lock()
+
+
+def _cache_key(key):
+    # Jamais le jeton en clair dans le cache partagé
+    return f"authtoken:{hashlib.sha256(key.encode('utf-8')).hexdigest()}"
+
+
+def _shared_cache():
+    alias = getattr(settings, 'TOKEN_AUTH_CACHE_ALIAS', '')
+    return caches[alias] if alias else None
+
+
+def invalidate_token(key):
+    """À appeler quand un jeton est supprimé ou que son utilisateur change (voir signals.py)"""
+    with _lock:
+        _local.pop(key, None)
+    shared = _shared_cache()
+    if shared is not None:
+        shared.delete(_cache_key(key))
+
+
+def invalidate_user(user_id):
+    """Tous les jetons d'un utilisateur modifié (save() ou update() sans signal)"""
+    from rest_framework.authtoken.models import Token
+
+    for key in Token.objects.filter(user_id=user_id).values_list('key', flat=True):
+        invalidate_token(key)
+
+
+def cache_clear():
+    with _lock:
+        _local.clear()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication sans requête SQL à chaque appel : les jetons valides sont
+    gardés dans un LRU local (TOKEN_AUTH_CACHE_TTL secondes) et, si
+    TOKEN_AUTH_CACHE_ALIAS est défini, dans le cache Django partagé.
+
+    La suppression d'un jeton (logout) et la modification / désactivation d'un
+    utilisateur invalident l'entrée dans ce processus et dans le cache partagé ;
+    les LRU des autres processus expirent au plus tard après TOKEN_AUTH_CACHE_TTL.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = self.cached_credentials(key)
+        if cached is not None:
+            return cached
+
+        shared = _shared_cache()
+        if shared is not None:
+            cached = shared.get(_cache_key(key))
+        if cached is None:
+            # Jeton inconnu ou utilisateur inactif : AuthenticationFailed, rien n'est mis en cache
+            cached = super().authenticate_credentials(key)
+            if shared is not None:
+                shared.set(_cache_key(key), cached, getattr(settings, 'TOKEN_AUTH_SHARED_TTL', 300))
+        self._remember(key, cached, time.monotonic())
+
+        user, token = cached
+        return copy.copy(user), token
+
+    @staticmethod
+    def cached_credentials(key):
+        """(user, token) depuis le LRU local, sans E/S ; None si absent ou expiré"""
+        with _lock:
+            entry = _local.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            _local.move_to_end(key)
+        user, token = entry[1]
+        # Copie : la vue peut modifier request.user sans toucher à l'entrée en cache
+        return copy.copy(user), token
+
+    @staticmethod
+    def _remember(key, cached, now):
+        ttl = getattr(settings, 'TOKEN_AUTH_CACHE_TTL', 30)
+        maxsize = getattr(settings, 'TOKEN_AUTH_CACHE_SIZE', 1024)
+        with _lock:
+            _local[key] = (now + ttl, cached)
+            _local.move_to_end(key)
+            while len(_local) > maxsize:
+                _local.popitem(last=False)
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:49
+
+from django.db import migrations, models
+
+
+PREFIX_COLUMNS = ['username', 'first_name', 'last_name']
+
+
+def create_prefix_indexes(apps, schema_editor):
+    # Recherche par préfixe insensible à la casse (UPPER(col) LIKE 'AB%') :
+    # index fonctionnels avec varchar_pattern_ops, spécifiques à PostgreSQL
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    table = apps.get_model('users', 'User')._meta.db_table
+    for column in PREFIX_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS users_user_{column}_upper_prefix_idx '
+            f'ON {table} (UPPER({column}) varchar_pattern_ops)'
+        )
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in PREFIX_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS users_user_{column}_upper_prefix_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
@@ -12,8 +12,12 @@ class User(AbstractUser):
     user_type = models.CharField(max_length=10, choices=USER_TYPE_CHOICES, default='user')
     bio = models.TextField(blank=True, null=True)
     profile_picture = models.ImageField(upload_to='profile_pictures/', blank=True, null=True)
+    # Variantes WebP/AVIF de profile_picture (générées par le worker rapports)
+    profile_picture_variants = models.JSONField(blank=True, null=True)
     phone_number = models.CharField(max_length=15, blank=True, null=True)
     date_of_birth = models.DateField(blank=True, null=True)
+    # Sert de Last-Modified / ETag pour les listes d'utilisateurs
+    updated_at = models.DateTimeField(auto_now=True)
 
     def save(self, *args, **kwargs):
         # Automatically set user_type to 'admin' for superusers
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model, authenticate
 from django.contrib.auth.password_validation import validate_password
+from apps.rapport.utils.thumbnails import delete_variants, srcset_map
 
 User = get_user_model()
 
@@ -76,14 +77,33 @@ class UserLoginSerializer(serializers.Serializer):
 class UserSerializer(serializers.ModelSerializer):
     is_superuser = serializers.BooleanField(read_only=True)
     is_staff = serializers.BooleanField(read_only=True)
+    profile_picture_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = User
         fields = ('id', 'username', 'email', 'first_name', 'last_name',
-                  'user_type', 'bio', 'profile_picture', 'phone_number',
+                  'user_type', 'bio', 'profile_picture', 'profile_picture_srcset', 'phone_number',
                   'date_of_birth', 'date_joined', 'is_superuser', 'is_staff')
         read_only_fields = ('id', 'date_joined', 'is_superuser', 'is_staff')
 
+    def get_profile_picture_srcset(self, obj):
+        return srcset_map(obj.profile_picture, obj.profile_picture_variants, self.context.get('request'))
+
+    def update(self, instance, validated_data):
+        # Nouvelle photo : les anciennes variantes seront régénérées par le worker
+        if 'profile_picture' in validated_data and instance.profile_picture_variants:
+            delete_variants(instance.profile_picture.storage, instance.profile_picture_variants)
+            instance.profile_picture_variants = None
+        return super().update(instance, validated_data)
+
+
+class UserCompactSerializer(serializers.ModelSerializer):
+    """Représentation minimale pour les sélecteurs / l'autocomplétion"""
+
+    class Meta:
+        model = User
+        fields = ('id', 'username', 'first_name', 'last_name')
+
 
 class ChangePasswordSerializer(serializers.Serializer):
     old_password = serializers.CharField(required=True, write_only=True)
@@ -1,3 +1,113 @@
-from django.test import TestCase
+import io
+import tempfile
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.rapport.jobs import generate_missing_thumbnails
+
+from .authentication import cache_clear
+
+User = get_user_model()
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Le jeton n'est vérifié en base qu'une fois, et plus accepté après logout / désactivation"""
+
+    def setUp(self):
+        cache_clear()
+        self.user = User.objects.create_user('alice', password='secret-pass-123')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+
+    def test_token_is_looked_up_once(self):
+        self.assertEqual(self.client.get('/api/users/profile/').status_code, 200)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get('/api/users/profile/').status_code, 200)
+        self.assertEqual(len(queries), 0)
+
+    def test_logout_revokes_cached_token(self):
+        self.assertEqual(self.client.get('/api/users/profile/').status_code, 200)
+        self.assertEqual(self.client.post('/api/users/logout/').status_code, 200)
+        self.assertEqual(self.client.get('/api/users/profile/').status_code, 401)
+
+    def test_deactivation_revokes_cached_token(self):
+        self.assertEqual(self.client.get('/api/users/profile/').status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get('/api/users/profile/').status_code, 401)
+
+
+class ProfilePictureThumbnailTests(TestCase):
+    """Les variantes générées par le worker invalident l'ETag de la liste et l'utilisateur en cache"""
+
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.override = override_settings(MEDIA_ROOT=self.media.name)
+        self.override.enable()
+        cache_clear()
+
+    def tearDown(self):
+        self.override.disable()
+        self.media.cleanup()
+
+    def test_thumbnails_refresh_list_etag_and_auth_cache(self):
+        buffer = io.BytesIO()
+        Image.new('RGB', (800, 600), 'red').save(buffer, format='JPEG')
+        user = User.objects.create_user('alice', password='secret-pass-123')
+        user.profile_picture = SimpleUploadedFile('alice.jpg', buffer.getvalue(), content_type='image/jpeg')
+        user.save()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+
+        first = client.get('/api/users/list/')
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(client.get('/api/users/profile/').data.get('profile_picture_srcset'), {})
+
+        self.assertEqual(generate_missing_thumbnails(), 1)
+
+        second = client.get('/api/users/list/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 200)
+        self.assertIn('webp', client.get('/api/users/profile/').data['profile_picture_srcset'])
+
+
+class UserListConditionalRequestTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user('alice', first_name='Alice')
+        User.objects.create_user('bob')
+
+    def test_if_none_match_returns_304(self):
+        first = self.client.get('/api/users/list/')
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first['ETag'])
+        second = self.client.get('/api/users/list/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b'')
+        third = self.client.get('/api/users/list/', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(third.status_code, 304)
+
+    def test_etag_changes_when_a_user_is_edited_or_added(self):
+        etag = self.client.get('/api/users/list/')['ETag']
+        self.alice.first_name = 'Alicia'
+        self.alice.save()
+        edited = self.client.get('/api/users/list/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(edited.status_code, 200)
+        self.assertIn('Alicia', [user['first_name'] for user in edited.data])
+
+        User.objects.create_user('carol')
+        added = self.client.get('/api/users/list/', HTTP_IF_NONE_MATCH=edited['ETag'])
+        self.assertEqual(added.status_code, 200)
+        self.assertNotEqual(added['ETag'], edited['ETag'])
+
+    def test_search_etag_depends_on_query(self):
+        alice = self.client.get('/api/users/search/', {'q': 'ali'})
+        bob = self.client.get('/api/users/search/', {'q': 'bo'})
+        self.assertNotEqual(alice['ETag'], bob['ETag'])
+        again = self.client.get('/api/users/search/', {'q': 'ali'}, HTTP_IF_NONE_MATCH=alice['ETag'])
+        self.assertEqual(again.status_code, 304)
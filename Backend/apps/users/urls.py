@@ -5,6 +5,7 @@ from .views import (
     LogoutView,
     UserProfileView,
     UserListView,
+    UserSearchView,
     IsAdminView
 )
 
@@ -16,5 +17,6 @@ urlpatterns = [
     path('logout/', LogoutView.as_view(), name='logout'),
     path('profile/', UserProfileView.as_view(), name='profile'),
     path('list/', UserListView.as_view(), name='user-list'),
+    path('search/', UserSearchView.as_view(), name='user-search'),
     path('is-admin/', IsAdminView.as_view(), name='is-admin'),
 ]
\ No newline at end of file
@@ -1,22 +1,52 @@
+import hashlib
+
 from rest_framework import status, generics, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.authtoken.models import Token
-from rest_framework.authentication import TokenAuthentication
+from .authentication import CachedTokenAuthentication
 from django.contrib.auth import login, logout, get_user_model
+from django.db.models import Count, Max, Q
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from .serializers import (
     UserRegistrationSerializer,
     UserLoginSerializer,
-    UserSerializer
+    UserSerializer,
+    UserCompactSerializer
 )
 
 User = get_user_model()
 
 
+def _list_state(request, queryset):
+    """(nombre, dernière modification) d'une liste d'utilisateurs, calculé une fois par requête"""
+    if not hasattr(request, '_user_list_state'):
+        state = queryset.aggregate(count=Count('id'), last=Max('updated_at'))
+        request._user_list_state = (state['count'], state['last'])
+    return request._user_list_state
+
+
+def user_list_condition(get_queryset):
+    """
+    ETag / Last-Modified pour une vue liste d'utilisateurs : un client qui
+    renvoie If-None-Match / If-Modified-Since reçoit 304 si rien n'a changé.
+    """
+    def etag(request, *args, **kwargs):
+        count, last = _list_state(request, get_queryset(request))
+        key = f"{request.get_full_path()}|{count}|{last.isoformat() if last else ''}"
+        return hashlib.md5(key.encode('utf-8')).hexdigest()
+
+    def last_modified(request, *args, **kwargs):
+        return _list_state(request, get_queryset(request))[1]
+
+    return method_decorator(condition(etag_func=etag, last_modified_func=last_modified), name='get')
+
+
 class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     permission_classes = (permissions.AllowAny,)
-    authentication_classes = (TokenAuthentication,)  # Exclude SessionAuthentication to avoid CSRF requirement
+    authentication_classes = (CachedTokenAuthentication,)  # Exclude SessionAuthentication to avoid CSRF requirement
     serializer_class = UserRegistrationSerializer
 
     def create(self, request, *args, **kwargs):
@@ -35,7 +65,7 @@ class RegisterView(generics.CreateAPIView):
 
 class LoginView(APIView):
     permission_classes = (permissions.AllowAny,)
-    authentication_classes = (TokenAuthentication,)  # Exclude SessionAuthentication to avoid CSRF requirement
+    authentication_classes = (CachedTokenAuthentication,)  # Exclude SessionAuthentication to avoid CSRF requirement
     serializer_class = UserLoginSerializer
 
     def post(self, request):
@@ -56,7 +86,7 @@ class LoginView(APIView):
 
 class LogoutView(APIView):
     permission_classes = (permissions.IsAuthenticated,)
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
 
     def post(self, request):
         try:
@@ -71,13 +101,14 @@ class LogoutView(APIView):
 
 class UserProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = (permissions.IsAuthenticated,)
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     serializer_class = UserSerializer
 
     def get_object(self):
         return self.request.user
 
 
+@user_list_condition(lambda request: User.objects.all())
 class UserListView(generics.ListAPIView):
     # Allow any client to fetch the list of users (used by frontend to populate selectors)
     permission_classes = (permissions.AllowAny,)
@@ -87,9 +118,46 @@ class UserListView(generics.ListAPIView):
     queryset = User.objects.all()
 
 
+def search_users_queryset(request):
+    """Utilisateurs actifs non-admin dont le username / prénom / nom commence par ?q="""
+    queryset = User.objects.filter(is_active=True, is_staff=False, is_superuser=False)
+    q = request.GET.get('q', '').strip()
+    if q:
+        queryset = queryset.filter(
+            Q(username__istartswith=q) | Q(first_name__istartswith=q) | Q(last_name__istartswith=q)
+        )
+    return queryset
+
+
+@user_list_condition(search_users_queryset)
+class UserSearchView(generics.ListAPIView):
+    """
+    Autocomplétion pour choisir un utilisateur : GET ?q=<préfixe>&limit=<n>
+    Champs réduits, au plus SEARCH_MAX_LIMIT résultats.
+    """
+    SEARCH_DEFAULT_LIMIT = 20
+    SEARCH_MAX_LIMIT = 50
+
+    permission_classes = (permissions.AllowAny,)
+    authentication_classes = ()
+    serializer_class = UserCompactSerializer
+
+    def get_queryset(self):
+        try:
+            limit = int(self.request.GET.get('limit', self.SEARCH_DEFAULT_LIMIT))
+        except ValueError:
+            limit = self.SEARCH_DEFAULT_LIMIT
+        limit = max(1, min(limit, self.SEARCH_MAX_LIMIT))
+        return (
+            search_users_queryset(self.request)
+            .only('id', 'username', 'first_name', 'last_name')
+            .order_by('username')[:limit]
+        )
+
+
 class IsAdminView(APIView):
     permission_classes = (permissions.IsAuthenticated,)
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
 
     def get(self, request):
         return Response({
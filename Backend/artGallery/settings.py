@@ -1,5 +1,5 @@
 from pathlib import Path
-from decouple import config
+from decouple import config, Csv
 
 import os
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -34,6 +34,8 @@ INSTALLED_APPS = [
     'apps.users',
     'apps.rapport',
     'apps.reclamation',
+    'apps.notifications',
+    'apps.monitoring',
 
 ]
 
@@ -53,7 +55,7 @@ LOGOUT_REDIRECT_URL = '/'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'apps.users.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -61,7 +63,86 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Token authentication cache (apps/users/authentication.py)
+# TOKEN_AUTH_CACHE_TTL bounds how long another process may still accept a revoked token
+TOKEN_AUTH_CACHE_SIZE = config('TOKEN_AUTH_CACHE_SIZE', default=1024, cast=int)
+TOKEN_AUTH_CACHE_TTL = config('TOKEN_AUTH_CACHE_TTL', default=30, cast=int)
+# TOKEN_AUTH_CACHE_ALIAS: alias in CACHES shared by all workers ('' = local LRU only)
+TOKEN_AUTH_CACHE_ALIAS = config('TOKEN_AUTH_CACHE_ALIAS', default='')
+TOKEN_AUTH_SHARED_TTL = config('TOKEN_AUTH_SHARED_TTL', default=300, cast=int)
+
+# Sentiment analysis cache (apps/reclamation/feelings_cache.py)
+# FEELINGS_CACHE_ALIAS: alias in CACHES shared by all workers ('' = local LRU only)
+FEELINGS_CACHE_SIZE = config('FEELINGS_CACHE_SIZE', default=2048, cast=int)
+FEELINGS_CACHE_ALIAS = config('FEELINGS_CACHE_ALIAS', default='')
+FEELINGS_CACHE_TIMEOUT = config('FEELINGS_CACHE_TIMEOUT', default=86400, cast=int)
+
+# BLIP captioning server (manage.py run_blip_server)
+# When set, web workers send caption requests to this Unix socket instead of loading BLIP themselves
+BLIP_SERVER_SOCKET = config('BLIP_SERVER_SOCKET', default='')
+# Server unreachable: the caption fails (the rapport job is retried later) unless this is set,
+# in which case BLIP is loaded in the calling process (~1 GB per web / rapport worker)
+BLIP_LOCAL_FALLBACK = config('BLIP_LOCAL_FALLBACK', default=False, cast=bool)
+# Micro-batching: requests already queued are captioned together (up to BLIP_BATCH_SIZE per generate() call).
+# Batching only helps when several processes (rapport workers, web workers) share the server;
+# BLIP_BATCH_WAIT_MS > 0 waits that long for more requests, which delays a lone caption by as much.
+BLIP_BATCH_SIZE = config('BLIP_BATCH_SIZE', default=8, cast=int)
+BLIP_BATCH_WAIT_MS = config('BLIP_BATCH_WAIT_MS', default=0, cast=int)
+
+# Rapport generation queue (manage.py run_rapport_worker)
+RAPPORT_JOB_MAX_ATTEMPTS = config('RAPPORT_JOB_MAX_ATTEMPTS', default=3, cast=int)
+RAPPORT_JOB_TIMEOUT = config('RAPPORT_JOB_TIMEOUT', default=600, cast=int)  # seconds before a 'running' job is requeued
+# A failed job waits RAPPORT_JOB_RETRY_DELAY seconds before its next attempt, doubled after each failure
+RAPPORT_JOB_RETRY_DELAY = config('RAPPORT_JOB_RETRY_DELAY', default=30, cast=int)
+RAPPORT_JOB_RETRY_MAX_DELAY = config('RAPPORT_JOB_RETRY_MAX_DELAY', default=3600, cast=int)
+
+# Real-time notifications (apps/notifications, SSE stream)
+NOTIFICATIONS_POLL_INTERVAL = config('NOTIFICATIONS_POLL_INTERVAL', default=1.0, cast=float)  # seconds between event table reads
+NOTIFICATIONS_STREAM_TIMEOUT = config('NOTIFICATIONS_STREAM_TIMEOUT', default=300, cast=int)  # client reconnects with Last-Event-ID
+NOTIFICATIONS_RETENTION = config('NOTIFICATIONS_RETENTION', default=86400, cast=int)  # seconds events are kept
+NOTIFICATIONS_TICKET_TTL = config('NOTIFICATIONS_TICKET_TTL', default=30, cast=int)  # seconds a stream ticket stays valid
+
+# Prometheus metrics (apps/monitoring): /metrics on the web process, answered only to these addresses
+METRICS_ALLOWED_IPS = config('METRICS_ALLOWED_IPS', default='127.0.0.1,::1', cast=Csv())
+# Counters live in each process: with several web workers every scrape would hit a different
+# registry and counters would jump backwards, so /metrics answers 503 unless the web server
+# runs a single worker. WEB_CONCURRENCY is the worker count read by gunicorn and uvicorn:
+# set the worker count only through it, never with -w / --workers. gunicorn.conf.py
+# refuses to start gunicorn when the two disagree; uvicorn has no such hook.
+METRICS_WEB_WORKERS = config('WEB_CONCURRENCY', default=1, cast=int)
+# Port of the worker's own /metrics endpoint (manage.py run_rapport_worker, 0 = disabled)
+METRICS_WORKER_PORT = config('METRICS_WORKER_PORT', default=0, cast=int)
+
+# SQL / CPU profiling per request (apps/monitoring/middleware.py): Server-Timing header + log
+# Off by default; QUERY_PROFILING_SAMPLE_RATE of the requests are logged, plus slow ones and N+1 suspects
+QUERY_PROFILING = config('QUERY_PROFILING', default=False, cast=bool)
+QUERY_PROFILING_SAMPLE_RATE = config('QUERY_PROFILING_SAMPLE_RATE', default=0.01, cast=float)
+QUERY_PROFILING_SLOW_MS = config('QUERY_PROFILING_SLOW_MS', default=500, cast=int)
+
+# On-demand sampling profiler (apps/monitoring/profiler.py): `kill -<PROFILER_SIGNAL> <pid>`
+# or POST /api/monitoring/profile/ writes collapsed stacks (flamegraph.pl, speedscope) to PROFILER_DIR
+PROFILER_SIGNAL = config('PROFILER_SIGNAL', default='SIGUSR2')  # '' = no signal handler
+PROFILER_DIR = config('PROFILER_DIR', default=str(BASE_DIR / 'profiles'))
+PROFILER_DURATION = config('PROFILER_DURATION', default=30, cast=int)  # seconds per profile
+PROFILER_INTERVAL = config('PROFILER_INTERVAL', default=0.01, cast=float)  # seconds between samples
+# Only stacks going through one of these functions are kept ('' = every stack)
+PROFILER_FOCUS = config('PROFILER_FOCUS', default='analyze_feelings,analyze_image', cast=Csv())
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'apps.monitoring': {'handlers': ['console'], 'level': 'INFO'},
+        'apps.rapport': {'handlers': ['console'], 'level': 'WARNING'},
+    },
+}
+
 MIDDLEWARE = [
+    'apps.monitoring.middleware.RequestMetricsMiddleware',
+    'apps.monitoring.middleware.QueryProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -158,6 +239,12 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Chunked rapport uploads (apps/rapport/uploads.py): partial files live here until 'complete'
+RAPPORT_UPLOAD_DIR = config('RAPPORT_UPLOAD_DIR', default=str(MEDIA_ROOT / 'uploads'))
+RAPPORT_UPLOAD_MAX_SIZE = config('RAPPORT_UPLOAD_MAX_SIZE', default=200 * 1024 * 1024, cast=int)
+RAPPORT_UPLOAD_CHUNK_SIZE = config('RAPPORT_UPLOAD_CHUNK_SIZE', default=8 * 1024 * 1024, cast=int)  # max bytes per PUT
+RAPPORT_UPLOAD_EXPIRY = config('RAPPORT_UPLOAD_EXPIRY', default=86400, cast=int)  # seconds before an unfinished upload is purged
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -6,6 +6,8 @@ from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 
+from apps.monitoring.views import metrics
+
 # Swagger configuration
 schema_view = get_schema_view(
     openapi.Info(
@@ -24,6 +26,11 @@ urlpatterns = [
     path('api/users/', include('apps.users.urls')),
     path('api/rapport/', include('apps.rapport.urls')),
     path('api/reclamation/', include('apps.reclamation.urls')),
+    path('api/notifications/', include('apps.notifications.urls')),
+    path('api/monitoring/', include('apps.monitoring.urls')),
+
+    # Prometheus (scraper local uniquement)
+    path('metrics', metrics, name='metrics'),
 
     # Swagger URLs
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
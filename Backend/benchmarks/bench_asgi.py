@@ -0,0 +1,153 @@
+"""
+WSGI vs ASGI throughput with many slow clients on a single process.
+
+    cd Backend
+    python manage.py drf_create_token <username>
+    python -m benchmarks.bench_asgi --token <key> [--clients 200] [--requests 1000] [--slow 0.2]
+
+Servers (each one process, started by the benchmark, skipped if not installed):
+  - wsgi: gunicorn gthread worker (--threads) -> /api/reclamation/received/
+  - asgi: uvicorn                            -> /api/reclamation/async/received/
+
+Each client trickles its request: request line, pause of --slow seconds, then
+headers. A thread-per-request server holds a thread during the pause; the
+event loop does not. Reports requests/s and latency percentiles.
+"""
+import argparse
+import asyncio
+import importlib.util
+import os
+import socket
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVERS = {
+    "wsgi": {
+        "module": "gunicorn",
+        "command": lambda port, threads: [
+            "-m", "gunicorn", "artGallery.wsgi:application", "--bind", f"127.0.0.1:{port}",
+            "--workers", "1", "--worker-class", "gthread", "--threads", str(threads),
+        ],
+        "path": "/api/reclamation/received/",
+    },
+    "asgi": {
+        "module": "uvicorn",
+        "command": lambda port, threads: [
+            "-m", "uvicorn", "artGallery.asgi:application", "--port", str(port),
+            "--workers", "1", "--no-access-log",
+        ],
+        "path": "/api/reclamation/async/received/",
+    },
+}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server did not start on port {port}")
+
+
+async def one_request(port, path, token, slow):
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        writer.write(f"GET {path} HTTP/1.1\r\n".encode())
+        await writer.drain()
+        if slow:
+            await asyncio.sleep(slow)
+        writer.write(
+            f"Host: localhost\r\nAuthorization: Token {token}\r\nConnection: close\r\n\r\n".encode()
+        )
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+    finally:
+        writer.close()
+    status = int(status_line.split()[1]) if status_line else 0
+    return status, time.perf_counter() - start
+
+
+async def load(port, path, token, clients, requests, slow):
+    remaining = iter(range(requests))
+    latencies, errors = [], 0
+
+    async def client():
+        nonlocal errors
+        for _ in remaining:
+            try:
+                status, latency = await one_request(port, path, token, slow)
+            except OSError:
+                status, latency = 0, 0.0
+            if status == 200:
+                latencies.append(latency)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return time.perf_counter() - start, sorted(latencies), errors
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def bench(name, args):
+    server = SERVERS[name]
+    if importlib.util.find_spec(server["module"]) is None:
+        print(f"{name:<5} skipped ({server['module']} not installed)")
+        return
+
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, *server["command"](port, args.threads)],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(port)
+        wall, latencies, errors = asyncio.run(
+            load(port, server["path"], args.token, args.clients, args.requests, args.slow)
+        )
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    print(f"{name:<5} {len(latencies) / wall:>9.1f} {percentile(latencies, 0.5) * 1e3:>9.1f} "
+          f"{percentile(latencies, 0.95) * 1e3:>9.1f} {percentile(latencies, 0.99) * 1e3:>9.1f} {errors:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--token", required=True, help="API token of a user with received reclamations")
+    parser.add_argument("--clients", type=int, default=200, help="concurrent connections")
+    parser.add_argument("--requests", type=int, default=1000, help="total requests per server")
+    parser.add_argument("--slow", type=float, default=0.2, help="seconds each client pauses mid-request")
+    parser.add_argument("--threads", type=int, default=8, help="gthread threads for the WSGI server")
+    parser.add_argument("--only", choices=SERVERS, help="run a single server")
+    args = parser.parse_args()
+
+    print(f"{args.clients} clients, {args.requests} requests, {args.slow:.2f}s pause per request")
+    print(f"{'':<5} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for name in SERVERS:
+        if args.only in (None, name):
+            bench(name, args)
+
+
+if __name__ == "__main__":
+    main()
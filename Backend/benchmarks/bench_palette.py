@@ -0,0 +1,83 @@
+"""
+Palette extraction: fast mode vs full-resolution KMeans (accuracy and time).
+
+    cd Backend
+    python -m benchmarks.bench_palette [image ...]
+
+Without arguments, synthetic "paintings" of several sizes are generated.
+Accuracy columns:
+  - center dist: mean RGB distance between each fast color and its matched full color
+  - quant err:   mean RGB distance of every pixel to its nearest palette color
+                 (same downscaled pixels for both palettes, lower is better)
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw
+from scipy.optimize import linear_sum_assignment
+
+from apps.rapport.utils.image_analysis import extract_colors
+
+SIZES = [(640, 480), (2000, 1500), (6000, 4000)]
+
+
+def synthetic_painting(size, seed=0):
+    rng = np.random.default_rng(seed)
+    image = Image.new("RGB", size, tuple(int(c) for c in rng.integers(0, 255, 3)))
+    draw = ImageDraw.Draw(image)
+    w, h = size
+    for _ in range(40):
+        x0, y0 = rng.integers(0, w), rng.integers(0, h)
+        x1, y1 = x0 + rng.integers(w // 20, w // 3), y0 + rng.integers(h // 20, h // 3)
+        draw.ellipse([x0, y0, x1, y1], fill=tuple(int(c) for c in rng.integers(0, 255, 3)))
+    noise = rng.normal(0, 8, (h, w, 3))
+    return Image.fromarray(np.clip(np.asarray(image) + noise, 0, 255).astype(np.uint8))
+
+
+def quantization_error(image_path, colors):
+    image = Image.open(image_path).convert("RGB")
+    image.thumbnail((512, 512))
+    pixels = np.asarray(image).reshape(-1, 3).astype(float)
+    distances = np.linalg.norm(pixels[:, None, :] - np.asarray(colors, float)[None, :, :], axis=2)
+    return distances.min(axis=1).mean()
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def bench(image_path, label):
+    full, full_time = timed(extract_colors, image_path, fast=False)
+    fast, fast_time = timed(extract_colors, image_path, fast=True)
+
+    cost = np.linalg.norm(fast[:, None, :] - full[None, :, :], axis=2)
+    rows, cols = linear_sum_assignment(cost)
+    center_dist = cost[rows, cols].mean()
+
+    print(f"{label:<22} {full_time:>8.2f}s {fast_time:>8.3f}s {full_time / fast_time:>7.1f}x "
+          f"{center_dist:>12.1f} {quantization_error(image_path, full):>9.1f} "
+          f"{quantization_error(image_path, fast):>9.1f}")
+
+
+def main(paths):
+    print(f"{'image':<22} {'full':>9} {'fast':>9} {'speedup':>8} {'center dist':>12} "
+          f"{'qerr full':>9} {'qerr fast':>9}")
+    if paths:
+        for path in paths:
+            bench(path, os.path.basename(path)[:22])
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in SIZES:
+            path = os.path.join(tmp, f"painting_{size[0]}x{size[1]}.jpg")
+            synthetic_painting(size).save(path, quality=90)
+            bench(path, f"synthetic {size[0]}x{size[1]}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
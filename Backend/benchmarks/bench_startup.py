@@ -0,0 +1,73 @@
+"""
+Start-up cost of the backend, measured with `python -X importtime`.
+
+    cd Backend
+    python -m benchmarks.bench_startup
+
+For each scenario: total import time, slowest top-level imports, and whether
+the heavy ML stack (torch, transformers, sklearn, reportlab) was imported.
+Django scenarios read the same settings/.env as manage.py.
+"""
+import os
+import re
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ("torch", "transformers", "sklearn", "reportlab")
+
+DJANGO_SETUP = (
+    "import os, django; "
+    "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'artGallery.settings'); "
+    "django.setup(); "
+)
+
+SCENARIOS = {
+    "image_analysis import": "import apps.rapport.utils.image_analysis",
+    "django.setup + urls": DJANGO_SETUP + "import artGallery.urls",
+    "django.setup + rapport worker": DJANGO_SETUP + "import apps.rapport.management.commands.run_rapport_worker",
+    "image_analysis warmup": "import apps.rapport.utils.image_analysis as ia; ia.warmup(load_model=False)",
+}
+
+LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def run(code):
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    top_level = []
+    modules = set()
+    for line in proc.stderr.splitlines():
+        m = LINE_RE.match(line)
+        if not m:
+            continue
+        cumulative, indent, name = int(m.group(2)), m.group(3), m.group(4)
+        modules.add(name.split(".")[0])
+        if not indent:
+            top_level.append((cumulative, name))
+    return wall, top_level, modules
+
+
+def main():
+    for label, code in SCENARIOS.items():
+        try:
+            wall, top_level, modules = run(code)
+        except RuntimeError as e:
+            print(f"\n{label}: FAILED ({e})")
+            continue
+        total = sum(cumulative for cumulative, _ in top_level) / 1e6
+        heavy = [name for name in HEAVY_MODULES if name in modules]
+        print(f"\n{label}: wall {wall:.2f}s, imports {total:.2f}s, heavy: {', '.join(heavy) or 'none'}")
+        for cumulative, name in sorted(top_level, reverse=True)[:8]:
+            print(f"  {cumulative / 1e3:>9.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""
+Benchmark suite for the reclamation and rapport hot paths, with stored baselines.
+
+    cd Backend
+    python -m benchmarks.suite                    # compare with benchmarks/baselines.json
+    python -m benchmarks.suite -k feelings        # only cases whose name contains "feelings"
+    python -m benchmarks.suite --save-baseline    # record the current timings as the baseline
+    python -m benchmarks.suite --rows 10000       # skip the 100k-row API cases
+
+Each case is timed `repeat` times (after one warm-up call) and the best run is
+kept, divided by the number of calls per run. A case is a regression when it
+is more than --threshold (default 25%) slower than its baseline and at least
+--min-delta (default 10 µs) slower per call, so timer noise on very fast
+cases cannot fail the gate; the exit status is then 1, so the suite can gate a
+deploy. Cases that produce a file (the PDF report) also record its size, held
+to the same relative threshold.
+
+API cases create a throwaway test database (same engine as settings: SQLite or
+Postgres), bulk-insert the rows, and request the first page and a deep page
+through the Django test client.
+Baselines are machine-specific: record them on the machine that runs the gate.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "artGallery.settings")
+django.setup()
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MIN_DELTA = 10e-6  # seconds per call
+DEFAULT_ROWS = (10_000, 100_000)
+
+CASES = {}
+
+
+def case(name, number=1, repeat=5, size=False):
+    """Register `setup() -> fn`; fn() is the timed call (and returns a byte count if size=True)"""
+    def register(setup):
+        CASES[name] = (setup, number, repeat, size)
+        return setup
+    return register
+
+
+# --- analyze_feelings ---
+SHORT_TEXT = "Merci pour votre aide, je suis très content du résultat."
+LONG_TEXT = (
+    "I would like to report an image on your website that contains an inappropriate or offensive "
+    "message. It makes me feel uncomfortable and I believe it violates your community guidelines. "
+    "Je voudrais signaler un contenu inapproprié qui me rend très mal à l'aise. "
+) * 60
+# Many keyword / pattern prefixes that never complete, plus one very long token
+ADVERSARIAL_TEXT = (
+    "harc menac insul viol hai dég frust colè anxi " * 400
+    + "a" * 20_000
+)
+
+
+def _feelings_case(text):
+    from apps.reclamation.feelings import analyze_feelings
+    return lambda: analyze_feelings(text)
+
+
+case("feelings.short", number=500)(lambda: _feelings_case(SHORT_TEXT))
+case("feelings.long", number=20)(lambda: _feelings_case(LONG_TEXT))
+case("feelings.adversarial", number=5)(lambda: _feelings_case(ADVERSARIAL_TEXT))
+
+
+# --- extract_colors ---
+def _palette_case(size):
+    def setup():
+        from apps.rapport.utils.image_analysis import extract_colors
+        from benchmarks.bench_palette import synthetic_painting
+
+        path = os.path.join(_tmpdir(), f"painting_{size[0]}x{size[1]}.jpg")
+        if not os.path.exists(path):
+            synthetic_painting(size).save(path, quality=90)
+        return lambda: extract_colors(path)
+    return setup
+
+
+for _size in [(640, 480), (2000, 1500), (6000, 4000)]:
+    case(f"palette.{_size[0]}x{_size[1]}", number=3, repeat=10)(_palette_case(_size))
+
+
+# --- Report generation ---
+# The text report alone is a sub-microsecond string format: too small to time
+# reliably, it is covered by the PDF cases below.
+def _pdf_case(size):
+    def setup():
+        import numpy as np
+        from apps.rapport.utils.image_analysis import ImageContext, generate_text_report, write_pdf_report
+        from benchmarks.bench_palette import synthetic_painting
+
+        path = os.path.join(_tmpdir(), f"report_source_{size[0]}x{size[1]}.jpg")
+        synthetic_painting(size).save(path, quality=90)
+        colors = np.array([[10, 20, 30], [200, 100, 50], [0, 0, 0], [255, 255, 255], [90, 90, 90]])
+        text = generate_text_report("a painting of a lighthouse at dusk", colors)
+
+        def run():
+            # Same work as GET rapports/<id>/pdf/: decode the upload, build the PDF in memory
+            output = io.BytesIO()
+            write_pdf_report(output, text, colors, ImageContext(path))
+            return output.tell()
+        return run
+    return setup
+
+
+for _size in [(2000, 1500), (6000, 4000)]:
+    case(f"report.pdf.{_size[0]}x{_size[1]}", number=1, repeat=5, size=True)(_pdf_case(_size))
+
+
+# --- List endpoints ---
+def _api_cases(rows):
+    def first_page(url):
+        def setup():
+            client = _api_client(rows)
+            return lambda: _get(client, url)
+        return setup
+
+    def deep_page(url, pages=20):
+        def setup():
+            client = _api_client(rows)
+            # Cursor of the 20th page: keyset pagination should cost the same as page 1
+            next_url = url
+            for _ in range(pages):
+                next_url = _get(client, next_url)["next"]
+            return lambda: _get(client, next_url)
+        return setup
+
+    label = f"{rows // 1000}k"
+    case(f"api.reclamation_received.{label}", number=20)(first_page("/api/reclamation/received/"))
+    case(f"api.reclamation_received_deep.{label}", number=20)(deep_page("/api/reclamation/received/"))
+    case(f"api.reclamation_sent.{label}", number=20)(first_page("/api/reclamation/sent/"))
+    case(f"api.rapport_list.{label}", number=20)(first_page("/api/rapport/rapports/"))
+    case(f"api.rapport_list_deep.{label}", number=20)(deep_page("/api/rapport/rapports/"))
+
+
+for _rows in DEFAULT_ROWS:
+    _api_cases(_rows)
+
+
+# --- Fixtures ---
+_state = {"tmpdir": None, "db": None, "rows": None, "client": None}
+
+
+def _tmpdir():
+    if _state["tmpdir"] is None:
+        _state["tmpdir"] = tempfile.TemporaryDirectory()
+    return _state["tmpdir"].name
+
+
+def _get(client, url):
+    response = client.get(url)
+    if response.status_code != 200:
+        raise RuntimeError(f"GET {url} -> {response.status_code}")
+    return response.json()
+
+
+def _api_client(rows):
+    """Test database with `rows` reclamations received/sent by one user and `rows` rapports"""
+    if _state["rows"] == rows:
+        return _state["client"]
+
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+    from rest_framework.authtoken.models import Token
+    from rest_framework.test import APIClient
+
+    from apps.rapport.models import Rapport
+    from apps.reclamation.models import Reclamation
+
+    if _state["db"] is None:
+        setup_test_environment()
+        _state["db"] = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+    User = get_user_model()
+    Reclamation.objects.all().delete()
+    Rapport.objects.all().delete()
+    User.objects.all().delete()
+
+    # bulk_create : pas de signaux (agrégats, notifications), seulement les lignes listées
+    owner = User.objects.create_user("bench-owner")
+    others = User.objects.bulk_create([User(username=f"bench-{i}") for i in range(100)])
+    batch = 5000
+    for start in range(0, rows, batch):
+        count = min(batch, rows - start)
+        Reclamation.objects.bulk_create([
+            Reclamation(
+                auteur=others[i % len(others)] if i % 2 else owner,
+                cible=owner if i % 2 else others[i % len(others)],
+                sujet="user",
+                contenu=f"réclamation {start + i}",
+                sentiment_local="Negative",
+                emotions_local={"angry": {"count": 1}},
+            )
+            for i in range(count)
+        ])
+        Rapport.objects.bulk_create([
+            Rapport(user=owner, name=f"rapport {start + i}", type="analyse",
+                    picture=f"rapports/images/bench_{start + i}.jpg", result="x" * 2000, status="done")
+            for i in range(count)
+        ])
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=owner).key}")
+    _state["rows"], _state["client"] = rows, client
+    return client
+
+
+def _teardown():
+    if _state["db"] is not None:
+        from django.db import connection
+        connection.creation.destroy_test_db(_state["db"], verbosity=0)
+    if _state["tmpdir"] is not None:
+        _state["tmpdir"].cleanup()
+
+
+# --- Runner ---
+def measure(setup, number, repeat):
+    """Best time per call, and the value returned by the last call"""
+    fn = setup()
+    fn()  # warm-up (imports, caches, first query)
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            result = fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best, result
+
+
+def load_baseline():
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def format_size(size):
+    return f"{size / 1024:.0f} KiB" if size >= 1024 else f"{size} B"
+
+
+def format_time(seconds):
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} µs"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="pattern", default="", help="only run cases whose name contains this")
+    parser.add_argument("--rows", default=",".join(map(str, DEFAULT_ROWS)),
+                        help="row counts for the API cases (comma separated, subset of 10000,100000)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA,
+                        help="smallest slowdown per call, in seconds, that can count as a regression")
+    parser.add_argument("--save-baseline", action="store_true", help="write the timings to baselines.json")
+    args = parser.parse_args()
+
+    labels = {f"{int(rows) // 1000}k" for rows in args.rows.split(",") if rows}
+    selected = [
+        name for name in CASES
+        if args.pattern in name and (not name.startswith("api.") or name.rsplit(".", 1)[1] in labels)
+    ]
+
+    stored = load_baseline()
+    baseline, baseline_sizes = stored.get("results", {}), stored.get("sizes", {})
+    results, sizes, regressions = {}, {}, []
+
+    def report(name, value, reference, fmt, floor=0):
+        if not reference:
+            print(f"{name:<36} {fmt(value):>11} {'-':>11} {'-':>7}")
+            return
+        ratio = value / reference
+        flag = "  REGRESSION" if ratio > 1 + args.threshold and value - reference > floor else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:<36} {fmt(value):>11} {fmt(reference):>11} {ratio:>6.2f}x{flag}")
+
+    print(f"{'case':<36} {'time':>11} {'baseline':>11} {'ratio':>7}")
+    try:
+        for name in selected:
+            setup, number, repeat, size = CASES[name]
+            seconds, result = measure(setup, number, repeat)
+            results[name] = seconds
+            report(name, seconds, baseline.get(name), format_time, floor=args.min_delta)
+            if size:
+                sizes[name] = result
+                report(f"{name} (size)", result, baseline_sizes.get(name), format_size)
+    finally:
+        _teardown()
+
+    if args.save_baseline:
+        stored.setdefault("results", {}).update(results)
+        stored.setdefault("sizes", {}).update(sizes)
+        stored["machine"] = f"{platform.machine()} {platform.processor() or ''}".strip()
+        stored["python"] = platform.python_version()
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaseline saved to {BASELINE_PATH}")
+        return 0
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%} "
+              f"(and {format_time(args.min_delta)} per call): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
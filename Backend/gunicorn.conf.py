@@ -0,0 +1,19 @@
+# gunicorn.conf.py : lu automatiquement par gunicorn lancé depuis Backend/
+# (gunicorn artGallery.wsgi:application).
+import os
+import sys
+
+# /metrics (apps/monitoring) n'est valable qu'avec un seul worker et compte les workers
+# grâce à WEB_CONCURRENCY (METRICS_WEB_WORKERS) : le nombre de workers doit venir de
+# cette variable, pas de -w / --workers.
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+
+
+def on_starting(server):
+    expected = int(os.environ.get('WEB_CONCURRENCY', 1))
+    if server.cfg.workers != expected:
+        sys.exit(
+            f"gunicorn : {server.cfg.workers} workers demandés mais WEB_CONCURRENCY={expected}. "
+            "Fixer le nombre de workers avec WEB_CONCURRENCY (et non -w) pour que /metrics "
+            "sache s'il peut exposer les compteurs de ce processus."
+        )
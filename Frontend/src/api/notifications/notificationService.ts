@@ -0,0 +1,94 @@
+import axios from '../axios';
+import type { Rapport } from '../../types';
+
+const TOKEN_KEY = 'auth_token';
+const STREAM_URL = '/api/notifications/stream/';
+const TICKET_URL = '/api/notifications/stream/ticket/';
+const RECONNECT_DELAY = 3000;
+
+export interface RapportEvent {
+    id: number;
+    name: string;
+    status: Rapport['status'];
+}
+
+export interface ReclamationEvent {
+    id: number;
+    auteur: string;
+    sujet: 'system' | 'user';
+    sentiment_local?: string | null;
+    date_creation: string;
+}
+
+interface NotificationHandlers {
+    onRapport?: (event: RapportEvent) => void;
+    onReclamation?: (event: ReclamationEvent) => void;
+    // true while events are being received; false when the stream is down or unavailable
+    onLiveChange?: (live: boolean) => void;
+}
+
+// Server-sent events for the logged-in user; returns a function that closes the stream.
+// EventSource cannot set headers: each connection first POSTs for a short-lived,
+// single-use ticket, so the API token never appears in a URL or an access log.
+// A ticket cannot be reused, so reconnections are handled here (with the last
+// event id) instead of by the browser. The server answers 503 when it does not
+// run under ASGI: no retries then, callers fall back to polling (onLiveChange).
+export const subscribeNotifications = (handlers: NotificationHandlers): (() => void) => {
+    if (!localStorage.getItem(TOKEN_KEY) || typeof EventSource === 'undefined') {
+        return () => {};
+    }
+
+    let source: EventSource | null = null;
+    let retry: ReturnType<typeof setTimeout> | undefined;
+    let lastEventId = '';
+    let closed = false;
+
+    const handle = <T>(handler?: (event: T) => void) => (e: Event) => {
+        const message = e as MessageEvent;
+        lastEventId = message.lastEventId || lastEventId;
+        handler?.(JSON.parse(message.data));
+    };
+
+    const reconnect = () => {
+        // Logged out (or token rejected): stop instead of retrying forever
+        if (!closed && localStorage.getItem(TOKEN_KEY)) {
+            retry = setTimeout(connect, RECONNECT_DELAY);
+        }
+    };
+
+    const connect = async () => {
+        let ticket: string;
+        try {
+            ticket = (await axios.post<{ ticket: string }>(TICKET_URL)).data.ticket;
+        } catch (err: any) {
+            handlers.onLiveChange?.(false);
+            if (err?.response?.status !== 503) {
+                reconnect();
+            }
+            return;
+        }
+        if (closed) {
+            return;
+        }
+        const params = new URLSearchParams({ ticket });
+        if (lastEventId) {
+            params.set('last_event_id', lastEventId);
+        }
+        source = new EventSource(`${axios.defaults.baseURL}${STREAM_URL}?${params}`);
+        source.addEventListener('rapport', handle(handlers.onRapport));
+        source.addEventListener('reclamation', handle(handlers.onReclamation));
+        source.onopen = () => handlers.onLiveChange?.(true);
+        source.onerror = () => {
+            handlers.onLiveChange?.(false);
+            source?.close();
+            reconnect();
+        };
+    };
+
+    connect();
+    return () => {
+        closed = true;
+        clearTimeout(retry);
+        source?.close();
+    };
+};
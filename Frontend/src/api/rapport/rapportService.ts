@@ -1,12 +1,18 @@
 import axios from '../axios';
-import type { Rapport } from '../../types';
+import type { CursorPage, Rapport } from '../../types';
 
 // Backend router registers the viewset under `/api/rapport/rapports/`
 const API_URL = '/api/rapport/rapports/';
+const UPLOAD_URL = '/api/rapport/uploads/';
+
+// Files above this size go through the chunked, resumable upload API
+export const CHUNKED_UPLOAD_THRESHOLD = 10 * 1024 * 1024;
+const MAX_CHUNK_RETRIES = 3;
 
 export const rapportService = {
-    getAllRapports: async (): Promise<Rapport[]> => {
-        const response = await axios.get(API_URL);
+    // List entries omit `result`; pass the `next` URL of a page to load the following one
+    getAllRapports: async (cursor?: string | null): Promise<CursorPage<Rapport>> => {
+        const response = await axios.get(cursor || API_URL);
         return response.data;
     },
 
@@ -34,6 +40,46 @@ export const rapportService = {
         return response.data;
     },
 
+    // init -> PUT chunks (Content-Range) -> complete; a failed chunk resumes from the server offset
+    createRapportChunked: async (
+        file: File,
+        fields: { name: string; type: string },
+        onProgress?: (sent: number, total: number) => void,
+    ): Promise<Rapport> => {
+        const init = await axios.post(UPLOAD_URL, { filename: file.name, size: file.size });
+        const { id, chunk_size: chunkSize } = init.data;
+        let offset: number = init.data.offset;
+        let retries = 0;
+
+        while (offset < file.size) {
+            const end = Math.min(offset + chunkSize, file.size);
+            try {
+                const response = await axios.put(`${UPLOAD_URL}${id}/`, file.slice(offset, end), {
+                    headers: {
+                        'Content-Type': 'application/octet-stream',
+                        'Content-Range': `bytes ${offset}-${end - 1}/${file.size}`,
+                    },
+                });
+                offset = response.data.offset;
+                retries = 0;
+                onProgress?.(offset, file.size);
+            } catch (e) {
+                if (++retries > MAX_CHUNK_RETRIES) throw e;
+                const status = await axios.get(`${UPLOAD_URL}${id}/`);
+                offset = status.data.offset;
+            }
+        }
+
+        const response = await axios.post(`${UPLOAD_URL}${id}/complete/`, fields);
+        return response.data;
+    },
+
+    // PDF built on demand by the backend (downsampled preview, nothing stored)
+    downloadRapportPdf: async (id: number): Promise<Blob> => {
+        const response = await axios.get(`${API_URL}${id}/pdf/`, { responseType: 'blob' });
+        return response.data;
+    },
+
     deleteRapport: async (id: number): Promise<void> => {
         await axios.delete(`${API_URL}${id}/`);
     },
@@ -1,6 +1,6 @@
 // api/reclamation/reclamationService.ts
 import axios from '../axios';
-import type { Reclamation } from '../../types';
+import type { CursorPage, Reclamation } from '../../types';
 
 const API_URL = '/api/reclamation/';
 
@@ -11,9 +11,10 @@ export interface CreateReclamationData {
 }
 
 export const reclamationService = {
-    getAllReclamations: async (): Promise<Reclamation[]> => {
+    // Pass the `next` URL of the previous page to load the following one
+    getAllReclamations: async (cursor?: string | null): Promise<CursorPage<Reclamation>> => {
         const token = localStorage.getItem('auth_token');
-        const response = await axios.get(API_URL, token ? { headers: { Authorization: `Token ${token}` } } : undefined);
+        const response = await axios.get(cursor || API_URL, token ? { headers: { Authorization: `Token ${token}` } } : undefined);
         return response.data;
     },
 
@@ -38,15 +39,17 @@ export const reclamationService = {
         await axios.delete(`${API_URL}${id}/`);
     },
 
-    getReceivedReclamations: async (): Promise<Reclamation[]> => {
+    // Pass the `next` URL of the previous page to load the following one
+    getReceivedReclamations: async (cursor?: string | null): Promise<CursorPage<Reclamation>> => {
         const token = localStorage.getItem('auth_token');
-        const response = await axios.get(`${API_URL}received/`, token ? { headers: { Authorization: `Token ${token}` } } : undefined);
+        const response = await axios.get(cursor || `${API_URL}received/`, token ? { headers: { Authorization: `Token ${token}` } } : undefined);
         return response.data;
     },
 
-    getSentReclamations: async (): Promise<Reclamation[]> => {
+    // Pass the `next` URL of the previous page to load the following one
+    getSentReclamations: async (cursor?: string | null): Promise<CursorPage<Reclamation>> => {
         const token = localStorage.getItem('auth_token');
-        const response = await axios.get(`${API_URL}sent/`, token ? { headers: { Authorization: `Token ${token}` } } : undefined);
+        const response = await axios.get(cursor || `${API_URL}sent/`, token ? { headers: { Authorization: `Token ${token}` } } : undefined);
         return response.data;
     },
 };
\ No newline at end of file
@@ -9,6 +9,12 @@ export const userService = {
         return response.data;
     },
 
+    // Prefix search (username / first name / last name) returning a compact user list
+    searchUsers: async (query: string, limit = 20): Promise<User[]> => {
+        const response = await axios.get(`${API_URL}search/`, { params: { q: query, limit } });
+        return response.data;
+    },
+
     getCurrentUser: async (): Promise<User> => {
         const response = await axios.get(`${API_URL}profile/`);
         return response.data;
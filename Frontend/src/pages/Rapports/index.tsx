@@ -1,20 +1,24 @@
 // pages/Rapports/RapportsPage.tsx (suite)
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import type { Rapport } from '../../types';
-import { rapportService } from '../../api/rapport/rapportService';
+import { CHUNKED_UPLOAD_THRESHOLD, rapportService } from '../../api/rapport/rapportService';
 import { userService } from '../../api/users/userService';
+import { subscribeNotifications } from '../../api/notifications/notificationService';
 import { useAuth } from '../../context/AuthContext';
 import PageLayout from '../../component/Layout/PageLayout';
 import Modal from '../../component/Modal/Modal';
 
 const RapportsPage = () => {
     const [rapports, setRapports] = useState<Rapport[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
     const [selectedFile, setSelectedFile] = useState<File | null>(null);
     const [editingId, setEditingId] = useState<number | null>(null);
     const [pendingReportId, setPendingReportId] = useState<number | null>(null);
     const [pendingMessage, setPendingMessage] = useState<string | null>(null);
+    const pendingReportRef = useRef<number | null>(null);
+    const streamLiveRef = useRef(false);
     const [selectedRapport, setSelectedRapport] = useState<Rapport | null>(null);
     const [isAdmin, setIsAdmin] = useState(false);
     const { user, loading: authLoading } = useAuth();
@@ -48,11 +52,68 @@ const RapportsPage = () => {
         }
     }, [authLoading, user]);
 
+    useEffect(() => {
+        pendingReportRef.current = pendingReportId;
+    }, [pendingReportId]);
+
+    // Status changes are pushed by the server instead of polling each rapport
+    useEffect(() => {
+        if (authLoading || !user) return;
+        return subscribeNotifications({
+            onLiveChange: (live) => {
+                streamLiveRef.current = live;
+            },
+            onRapport: (event) => {
+                setRapports(prev => prev.map(r => (r.id === event.id ? { ...r, status: event.status } : r)));
+                if (event.id !== pendingReportRef.current) return;
+                if (event.status === 'done') {
+                    setPendingReportId(null);
+                    setPendingMessage(null);
+                    loadRapports();
+                } else if (event.status === 'failed') {
+                    setPendingReportId(null);
+                    setPendingMessage('La génération du rapport a échoué.');
+                }
+            },
+        });
+    }, [authLoading, user]);
+
+    // Fallback while the event stream is down or unavailable (server not running under ASGI)
+    useEffect(() => {
+        if (pendingReportId === null) return;
+        const start = Date.now();
+        const poll = setInterval(async () => {
+            if (Date.now() - start > 120000) {
+                clearInterval(poll);
+                setPendingMessage('La génération prend trop de temps. Le rapport restera en attente.');
+                return;
+            }
+            if (streamLiveRef.current) return;
+            try {
+                const refreshed = await rapportService.getRapport(pendingReportId);
+                if (refreshed && refreshed.result) {
+                    clearInterval(poll);
+                    setPendingReportId(null);
+                    setPendingMessage(null);
+                    await loadRapports();
+                } else if (refreshed && refreshed.status === 'failed') {
+                    clearInterval(poll);
+                    setPendingReportId(null);
+                    setPendingMessage('La génération du rapport a échoué.');
+                }
+            } catch (e) {
+                console.error('Polling error', e);
+            }
+        }, 1500);
+        return () => clearInterval(poll);
+    }, [pendingReportId]);
+
     const loadRapports = async () => {
         setLoading(true);
         try {
-            const data = await rapportService.getAllRapports();
-            setRapports(data);
+            const page = await rapportService.getAllRapports();
+            setRapports(page.results);
+            setNextCursor(page.next);
             setError(null);
         } catch (err) {
             setError('Erreur lors du chargement des rapports');
@@ -62,6 +123,28 @@ const RapportsPage = () => {
         }
     };
 
+    const loadMoreRapports = async () => {
+        if (!nextCursor) return;
+        try {
+            const page = await rapportService.getAllRapports(nextCursor);
+            setRapports(prev => [...prev, ...page.results]);
+            setNextCursor(page.next);
+        } catch (err) {
+            setError('Erreur lors du chargement des rapports');
+            console.error(err);
+        }
+    };
+
+    // The list does not include the report text: fetch the full rapport when opening it
+    const openRapport = async (rapport: Rapport) => {
+        setSelectedRapport(rapport);
+        try {
+            setSelectedRapport(await rapportService.getRapport(rapport.id));
+        } catch (err) {
+            console.error(err);
+        }
+    };
+
     const handleSubmit = async (e: React.FormEvent) => {
         e.preventDefault();
         if (!editingId && !selectedFile) {
@@ -81,27 +164,12 @@ const RapportsPage = () => {
                 await rapportService.updateRapport(editingId, submitFormData);
                 setEditingId(null);
             } else {
-                const created = await rapportService.createRapport(submitFormData);
+                const created = selectedFile && selectedFile.size > CHUNKED_UPLOAD_THRESHOLD
+                    ? await rapportService.createRapportChunked(selectedFile, formData)
+                    : await rapportService.createRapport(submitFormData);
                 if (created && !created.result) {
                     setPendingReportId(created.id);
                     setPendingMessage('Génération du rapport en cours — cela peut prendre quelques secondes...');
-                    const start = Date.now();
-                    const poll = setInterval(async () => {
-                        try {
-                            const refreshed = await rapportService.getRapport(created.id);
-                            if (refreshed && refreshed.result) {
-                                clearInterval(poll);
-                                setPendingReportId(null);
-                                setPendingMessage(null);
-                                await loadRapports();
-                            } else if (Date.now() - start > 120000) {
-                                clearInterval(poll);
-                                setPendingMessage('La génération prend trop de temps. Le rapport restera en attente.');
-                            }
-                        } catch (e) {
-                            console.error('Polling error', e);
-                        }
-                    }, 1500);
                 }
             }
             setFormData({ name: '', type: 'descriptif' });
@@ -129,6 +197,21 @@ const RapportsPage = () => {
         }
     };
 
+    const handleDownloadPdf = async (rapport: Rapport) => {
+        try {
+            const blob = await rapportService.downloadRapportPdf(rapport.id);
+            const url = URL.createObjectURL(blob);
+            const link = document.createElement('a');
+            link.href = url;
+            link.download = `rapport_${rapport.id}.pdf`;
+            link.click();
+            URL.revokeObjectURL(url);
+        } catch (err) {
+            setError('Erreur lors du téléchargement du PDF');
+            console.error(err);
+        }
+    };
+
     const handleEdit = (rapport: Rapport) => {
         setEditingId(rapport.id);
         setFormData({ name: rapport.name, type: rapport.type as any });
@@ -264,19 +347,28 @@ const RapportsPage = () => {
                                                 background: '#f8f9fa', 
                                                 cursor: 'pointer' 
                                             }}
-                                            onClick={() => setSelectedRapport(rapport)}
+                                            onClick={() => openRapport(rapport)}
                                         >
-                                            <img 
-                                                src={rapport.picture} 
-                                                alt={rapport.name} 
-                                                style={{ maxHeight: '100%', width: 'auto' }} 
-                                            />
+                                            <picture>
+                                                {rapport.picture_srcset?.avif && (
+                                                    <source type="image/avif" srcSet={rapport.picture_srcset.avif} sizes="(max-width: 768px) 100vw, 33vw" />
+                                                )}
+                                                {rapport.picture_srcset?.webp && (
+                                                    <source type="image/webp" srcSet={rapport.picture_srcset.webp} sizes="(max-width: 768px) 100vw, 33vw" />
+                                                )}
+                                                <img 
+                                                    src={rapport.picture} 
+                                                    alt={rapport.name} 
+                                                    loading="lazy"
+                                                    style={{ maxHeight: '100%', width: 'auto' }} 
+                                                />
+                                            </picture>
                                         </div>
                                         <div className="card-body d-flex flex-column">
                                             <h5 
                                                 className="card-title mb-1" 
                                                 style={{ cursor: 'pointer' }}
-                                                onClick={() => setSelectedRapport(rapport)}
+                                                onClick={() => openRapport(rapport)}
                                             >
                                                 {rapport.name}
                                             </h5>
@@ -295,8 +387,10 @@ const RapportsPage = () => {
                                                 </p>
                                             )}
                                             <p className="card-text mb-2" style={{ fontSize: '0.875rem' }}>
-                                                {rapport.result ? (
+                                                {rapport.status === 'done' ? (
                                                     <span className="text-success">✓ Rapport généré</span>
+                                                ) : rapport.status === 'failed' ? (
+                                                    <span className="text-danger">✗ Échec de la génération</span>
                                                 ) : (
                                                     <span className="text-warning">⏳ En attente...</span>
                                                 )}
@@ -333,6 +427,13 @@ const RapportsPage = () => {
                             ))}
                         </div>
                     )}
+                    {!loading && nextCursor && (
+                        <div className="text-center mt-3">
+                            <button onClick={loadMoreRapports} className="btn btn-outline-secondary btn-sm">
+                                Charger plus
+                            </button>
+                        </div>
+                    )}
                 </div>
             </div>
 
@@ -427,6 +528,15 @@ const RapportsPage = () => {
                         </div>
 
                         <div className="mt-4">
+                            {selectedRapport.status === 'done' && (
+                                <button
+                                    onClick={() => handleDownloadPdf(selectedRapport)}
+                                    className="btn btn-primary mr-2"
+                                    style={{ marginRight: '10px' }}
+                                >
+                                    Télécharger le PDF
+                                </button>
+                            )}
                             <button
                                 onClick={() => {
                                     handleEdit(selectedRapport);
@@ -3,17 +3,20 @@ import { useState, useEffect } from 'react';
 import type { Reclamation, User } from '../../types';
 import { reclamationService } from '../../api/reclamation/reclamationService';
 import { userService } from '../../api/users/userService';
+import { subscribeNotifications } from '../../api/notifications/notificationService';
 import { useAuth } from '../../context/AuthContext';
 import PageLayout from '../../component/Layout/PageLayout';
 import Modal from '../../component/Modal/Modal';
 
 const ReclamationsPage = () => {
     const [reclamations, setReclamations] = useState<Reclamation[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
     const [activeTab, setActiveTab] = useState<'received' | 'sent' | 'all'>('received');
     const [isAdmin, setIsAdmin] = useState(false);
     const [users, setUsers] = useState<User[]>([]);
+    const [userQuery, setUserQuery] = useState('');
     const [selectedReclamation, setSelectedReclamation] = useState<Reclamation | null>(null);
     const { user, loading: authLoading } = useAuth();
 
@@ -49,17 +52,18 @@ const ReclamationsPage = () => {
     }, [authLoading, user]);
 
     useEffect(() => {
+        // The search endpoint already excludes staff / superusers
         const loadUsers = async () => {
             try {
-                const usersList = await userService.getAllUsers();
-                const filtered = usersList.filter(u => !(u.is_superuser === true || u.is_staff === true || u.username === 'admin'));
-                setUsers(filtered);
+                const usersList = await userService.searchUsers(userQuery);
+                setUsers(usersList.filter(u => u.username !== 'admin'));
             } catch (err) {
                 console.error('Failed to load users list', err);
             }
         };
-        loadUsers();
-    }, []);
+        const timer = setTimeout(loadUsers, 250);
+        return () => clearTimeout(timer);
+    }, [userQuery]);
 
     useEffect(() => {
         if (authLoading) return;
@@ -67,18 +71,31 @@ const ReclamationsPage = () => {
         loadReclamations();
     }, [activeTab, authLoading, user, isAdmin]);
 
+    // New reclamations received are pushed by the server: refresh the received tab
+    useEffect(() => {
+        if (authLoading || !user || activeTab !== 'received') return;
+        return subscribeNotifications({
+            onReclamation: () => {
+                loadReclamations();
+            },
+        });
+    }, [activeTab, authLoading, user]);
+
+    const fetchReclamationsPage = (cursor?: string | null) => {
+        if (isAdmin && activeTab === 'all') {
+            return reclamationService.getAllReclamations(cursor);
+        } else if (activeTab === 'received') {
+            return reclamationService.getReceivedReclamations(cursor);
+        }
+        return reclamationService.getSentReclamations(cursor);
+    };
+
     const loadReclamations = async () => {
         setLoading(true);
         try {
-            let data;
-            if (isAdmin && activeTab === 'all') {
-                data = await reclamationService.getAllReclamations();
-            } else if (activeTab === 'received') {
-                data = await reclamationService.getReceivedReclamations();
-            } else {
-                data = await reclamationService.getSentReclamations();
-            }
-            setReclamations(data);
+            const page = await fetchReclamationsPage();
+            setReclamations(page.results);
+            setNextCursor(page.next);
             setError(null);
         } catch (err: any) {
             const errorMsg = err?.response?.data?.detail || 'Erreur lors du chargement des réclamations';
@@ -89,6 +106,18 @@ const ReclamationsPage = () => {
         }
     };
 
+    const loadMoreReclamations = async () => {
+        if (!nextCursor) return;
+        try {
+            const page = await fetchReclamationsPage(nextCursor);
+            setReclamations(prev => [...prev, ...page.results]);
+            setNextCursor(page.next);
+        } catch (err) {
+            setError('Erreur lors du chargement des réclamations');
+            console.error(err);
+        }
+    };
+
     const handleSubmit = async (e: React.FormEvent) => {
         e.preventDefault();
         try {
@@ -249,6 +278,13 @@ const ReclamationsPage = () => {
                         {formData.sujet === 'user' && (
                             <div className="form-group">
                                 <label>Sélectionner l'utilisateur</label>
+                                <input
+                                    type="text"
+                                    className="form-control mb-2"
+                                    value={userQuery}
+                                    onChange={(e) => setUserQuery(e.target.value)}
+                                    placeholder="Rechercher un utilisateur..."
+                                />
                                 <select
                                     className="form-control"
                                     value={formData.cible_id || ''}
@@ -479,6 +515,13 @@ const ReclamationsPage = () => {
                                     ))}
                                 </tbody>
                             </table>
+                            {nextCursor && (
+                                <div className="text-center">
+                                    <button onClick={loadMoreReclamations} className="btn btn-outline-secondary btn-sm">
+                                        Charger plus
+                                    </button>
+                                </div>
+                            )}
                         </div>
                     )}
                 </div>
@@ -14,7 +14,10 @@ export interface Rapport {
     name: string;
     type: 'descriptif' | 'analyse' | 'evaluation';
     picture: string;
-    result: string;
+    // { avif?: 'url 320w, ...', webp?: '...' } — empty until the worker generated them
+    picture_srcset?: Partial<Record<'avif' | 'webp', string>>;
+    result?: string;  // only returned by the detail endpoint
+    status: 'pending' | 'running' | 'done' | 'failed';
     created_at: string;
 }
 
@@ -29,6 +32,13 @@ export interface Reclamation {
     date_creation: string;
 }
 
+// Paginated list returned by cursor-paginated endpoints
+export interface CursorPage<T> {
+    next: string | null;
+    previous: string | null;
+    results: T[];
+}
+
 export interface PhotoWallItem {
     id: number;
     src: string;